@@ -0,0 +1,82 @@
+"""Donation workbook import for a full roster.
+
+    python3 -m benchmarks.bench_donation_import [--players 50] [--former 600] [--repeat 20]
+
+`batch` is `import_donation_entries` (one id lookup, one executemany, one
+transaction); `row by row` is the previous per-row upsert kept here as the
+reference point.
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.support import measure, print_timing
+from hcr2.db import connection as db_connection
+from hcr2.db.migrations import apply_migrations
+from hcr2.services import sheets as sheet_service
+
+
+def seed_players(db_path: Path, *, active: int, former: int) -> list[int]:
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO players (id, name, alias, garage_power, active, team) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (pid, f"Player {pid}", f"p{pid}", 10000 + pid, 1 if pid <= active else 0, "PLTE")
+                for pid in range(1, active + former + 1)
+            ],
+        )
+    return list(range(1, active + 1))
+
+
+def import_row_by_row(db_path: Path, date_str: str, entries: list[tuple[int, int]]) -> int:
+    added = 0
+    with db_connection.connect_path(db_path) as conn:
+        for player_id, total in entries:
+            try:
+                conn.execute(sheet_service.DONATION_UPSERT_SQL, (player_id, date_str, total))
+                added += 1
+            except sqlite3.Error:
+                pass
+    return added
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--former", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "hcr2.db"
+        apply_migrations(db_path)
+        roster = seed_players(db_path, active=args.players, former=args.former)
+        # Two typos in the sheet, as in a real week.
+        entries = [(pid, 1000 * pid) for pid in roster] + [(99999, 5000), (99998, 7000)]
+
+        counter = iter(range(1_000_000))
+
+        def fresh_date() -> str:
+            # A new date per run, so every run inserts instead of updating the last one.
+            n = next(counter)
+            return f"{2000 + n // 336}-{1 + n // 28 % 12:02d}-{1 + n % 28:02d}"
+
+        print_timing(
+            f"batch, {len(entries)} rows",
+            measure(lambda: sheet_service.import_donation_entries(db_path, fresh_date(), entries), repeat=args.repeat),
+            unit="import",
+        )
+        print_timing(
+            f"row by row, {len(entries)} rows",
+            measure(lambda: import_row_by_row(db_path, fresh_date(), entries), repeat=args.repeat),
+            unit="import",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+"""Frame extraction on a generated standings-like recording.
+
+    python3 -m benchmarks.bench_frames [--seconds 60] [--jobs 4] [--repeat 3]
+
+The video is made by ffmpeg itself: a tall test pattern scrolled through a phone-sized
+window for most of the clip, then held still, like a standings screen read to the
+end. Needs an ffmpeg binary (see `video frames`); nothing is downloaded.
+
+`fps` is the fixed-rate sampling `video frames` does by default, `scene` the
+`--mode scene` selection; the frame count is what the reading step has to look at.
+For each mode:
+
+- `jpeg files`: every sampled frame written as a JPEG, then read back and decoded
+  again to hash it - the pipeline before frames were streamed
+- `stream`: frames piped uncompressed out of ffmpeg and hashed as they arrive
+  (no JPEGs at all - what stitching, crop detection and `video frames` without
+  `--jpeg` consume)
+- `stream + jpeg`: the same, plus encoding the kept frames, as `video frames --jpeg` does
+- `stream + jpeg, N jobs`: that split into N time segments decoded side by side
+  (`--jobs`); the frame count should match the single run
+- `rerun`: `video frames` again with the same settings, answered from `frames.json`
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.support import measure, print_timing
+from hcr2.models.video import PullOutcome
+from hcr2.services import frames as frame_service
+from hcr2.services import videos as video_service
+
+WINDOW = (720, 1280)
+PAGE_HEIGHT = 4000
+SCROLL_SPEED = 150  # px per second
+
+
+def make_video(executable: str, target: Path, *, seconds: int) -> Path:
+    """A still test pattern scrolled upwards until its end, then held."""
+    still = target.with_suffix(".png")
+    width, height = WINDOW
+    subprocess.run(
+        [executable, "-hide_banner", "-loglevel", "error", "-y", "-f", "lavfi",
+         "-i", f"testsrc2=s={width}x{PAGE_HEIGHT}", "-frames:v", "1", str(still)],
+        check=True,
+    )
+    last = PAGE_HEIGHT - height
+    subprocess.run(
+        [executable, "-hide_banner", "-loglevel", "error", "-y", "-loop", "1", "-i", str(still),
+         "-vf", f"crop={width}:{height}:0:'min(t*{SCROLL_SPEED},{last})',format=yuv420p",
+         "-t", str(seconds), "-r", "30", str(target)],
+        check=True,
+    )
+    return target
+
+
+def jpeg_files(executable: str, video: Path, out_dir: Path, *, max_distance: int, **options) -> int:
+    """Write every frame, then decode the files again to hash them."""
+    for stale in out_dir.glob(video_service.FRAME_GLOB):
+        stale.unlink()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    command = video_service.build_ffmpeg_command(video, out_dir, executable=executable, **options)
+    subprocess.run(command, check=True)
+    decode = subprocess.run(
+        [executable, "-hide_banner", "-loglevel", "error", "-i", str(out_dir / video_service.FRAME_PATTERN),
+         "-pix_fmt", "rgb24", "-f", "image2pipe", "-c:v", "ppm", "-"],
+        check=True,
+        capture_output=True,
+    )
+    frames = frame_service.read_pnm_frames(io.BytesIO(decode.stdout))
+    return len(list(frame_service.drop_near_duplicates(frames, frame_service.frame_hash, max_distance)))
+
+
+def stream(executable: str, video: Path, out_dir: Path, *, max_distance: int, **options) -> int:
+    """Hash frames straight off the pipe; nothing is written."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    run = video_service.open_frame_stream(video, executable=executable, pix_fmt="rgb24", log_dir=out_dir, **options)
+    frames = frame_service.read_pnm_frames(run.stdout)
+    kept = len(list(frame_service.drop_near_duplicates(frames, frame_service.frame_hash, max_distance)))
+    code, detail = run.finish()
+    assert code == 0, detail
+    return kept
+
+
+def stream_and_encode(
+    executable: str, video: Path, out_dir: Path, *, max_distance: int, jobs: int = 1, reuse: bool = False, **options
+) -> int:
+    """What `video frames --jpeg` does: stream, drop, encode the rest. Without the manifest
+    of the previous run, so every run extracts; with it, a run is a cache hit."""
+    if not reuse:
+        (out_dir / frame_service.MANIFEST_NAME).unlink(missing_ok=True)
+    pull = PullOutcome(status="CACHED", local_path=video)
+    outcome = video_service._cut_frames(
+        pull,
+        out_dir,
+        video_type="standings",
+        executable=executable,
+        fps=options.get("fps", video_service.DEFAULT_FPS),
+        width=video_service.DEFAULT_WIDTH,
+        crop=None,
+        start=None,
+        duration=None,
+        mode=options["mode"],
+        threshold=options.get("threshold", video_service.DEFAULT_SCENE_THRESHOLD),
+        dedupe=max_distance,
+        jobs=jobs,
+        keep_images=True,
+        spawner=None,
+    )
+    assert outcome.status == ("CACHED" if reuse else "OK"), outcome
+    return outcome.frame_count
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--fps", type=float, default=video_service.DEFAULT_FPS)
+    parser.add_argument("--threshold", type=float, default=video_service.DEFAULT_SCENE_THRESHOLD)
+    parser.add_argument("--dedupe", type=int, default=frame_service.DEFAULT_DEDUPE_DISTANCE)
+    parser.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    executable = video_service.resolve_ffmpeg()
+    if executable is None:
+        print("ffmpeg not found - set HCR2_FFMPEG or install imageio-ffmpeg", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        video = make_video(executable, workdir / "standings.mp4", seconds=args.seconds)
+        print(f"{args.seconds} s at {WINDOW[0]}x{WINDOW[1]}, scrolling {SCROLL_SPEED} px/s then still")
+
+        modes = {
+            "fps": dict(mode="fps", fps=args.fps),
+            "scene": dict(mode="scene", threshold=args.threshold),
+        }
+        pipelines = {"jpeg files": jpeg_files, "stream": stream, "stream + jpeg": stream_and_encode}
+        for label, options in modes.items():
+            for name, pipeline in pipelines.items():
+                out_dir = workdir / label / name.replace(" ", "")
+
+                def extract():
+                    return pipeline(executable, video, out_dir, max_distance=args.dedupe, **options)
+
+                print_timing(f"{name}, {label}", measure(extract, repeat=args.repeat), unit="video")
+                print(f"{'':<44} {extract():9d} frames kept")
+
+            if args.jobs > 1:
+                out_dir = workdir / label / "jobs"
+
+                def extract_parallel():
+                    return stream_and_encode(
+                        executable, video, out_dir, max_distance=args.dedupe, jobs=args.jobs, **options
+                    )
+
+                print_timing(
+                    f"stream + jpeg, {args.jobs} jobs, {label}", measure(extract_parallel, repeat=args.repeat), unit="video"
+                )
+                print(f"{'':<44} {extract_parallel():9d} frames kept")
+
+            out_dir = workdir / label / "stream+jpeg"
+
+            def rerun():
+                return stream_and_encode(executable, video, out_dir, max_distance=args.dedupe, reuse=True, **options)
+
+            print_timing(f"rerun, {label}", measure(rerun, repeat=args.repeat), unit="video")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
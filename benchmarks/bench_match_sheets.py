@@ -0,0 +1,58 @@
+"""Generation time per match sheet.
+
+    python3 -m benchmarks.bench_match_sheets [--players 50] [--repeat 50]
+
+`build` is the in-memory workbook from the cached template, `build+save` adds
+the .xlsx serialisation that every export pays before the upload.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+
+from openpyxl import load_workbook
+
+from benchmarks.support import measure, print_timing
+from hcr2.exporters import excel as excel_exporter
+
+
+def _players(count: int) -> list[tuple[int, str, str | None, str | None]]:
+    return [
+        (pid, f"Player {pid}", "2026-06-01" if pid % 7 == 0 else None, "2026-06-14" if pid % 7 == 0 else None)
+        for pid in range(1, count + 1)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[25, 50])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    match = (627, "2026-06-07", 62, "Fast Opponents", "Team Cup")
+
+    def absent(_day, away_from, _away_until):
+        return away_from is not None
+
+    def load_template_uncached():
+        load_workbook(filename=excel_exporter.MATCH_SHEET_TEMPLATE)
+
+    print_timing("template load (once per process)", measure(load_template_uncached, repeat=5))
+
+    for count in args.players:
+        players = _players(count)
+
+        def build():
+            return excel_exporter.build_match_sheet_workbook(match, players, is_absent_on=absent)
+
+        def build_and_save():
+            build().save(io.BytesIO())
+
+        print_timing(f"build, {count} players", measure(build, repeat=args.repeat), unit="sheet")
+        print_timing(f"build+save, {count} players", measure(build_and_save, repeat=args.repeat), unit="sheet")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
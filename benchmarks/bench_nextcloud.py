@@ -0,0 +1,186 @@
+"""Nextcloud workflows end to end against the in-process WebDAV stand-in.
+
+    python3 -m benchmarks.bench_nextcloud [--latency 0.005] [--video-mb 16] [--repeat 10]
+
+Every workflow runs through the real HTTP client against `tests/webdav.py`, with
+`--latency` seconds added to each request to stand in for the home network:
+
+- `sheet export`: `export_match_sheet` - read the match, build and save the workbook,
+  upload it (the remote copy is removed before each run, so every run uploads)
+- `donation import`: `import_donations_workbook` - download, read, import, delete
+- `video pull`: `pull_video` - list the season folder, download the recording
+  (the local copy is removed before each run)
+
+`one-shot` is a client with a new connection per request and no download or
+listing caches, as the code was before the pooled session; `pooled` is the client the CLI builds, with a
+fresh set of caches per benchmark. Requests and TCP connections are per run.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+import requests
+
+from benchmarks.support import measure, print_timing
+from hcr2.db import connection as db_connection
+from hcr2.db.migrations import apply_migrations
+from hcr2.exporters import excel as excel_exporter
+from hcr2.integrations import nextcloud
+from hcr2.integrations.nextcloud_cache import ContentCache, ListingCache, RemoteDirCache
+from hcr2.services import sheets as sheet_service
+from hcr2.services import videos as video_service
+from tests.webdav import WebDavStandIn
+
+MATCH_ID = 627
+SEASON = 62
+
+
+class OneShotClient(nextcloud.WebDavClient):
+    """A new connection for every request, as with the old module-level `requests.*` calls."""
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        self.stats.record(method)
+        return requests.request(method, url, auth=self.auth, **kwargs)
+
+
+def seed_database(db_path: Path, *, players: int) -> None:
+    apply_migrations(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO players (id, name, alias, garage_power, active, team) VALUES (?, ?, ?, ?, ?, ?)",
+            [(pid, f"Player {pid}", f"p{pid}", 10000 + pid, 1, "PLTE") for pid in range(1, players + 1)],
+        )
+        conn.execute("INSERT INTO season (number, name, start, division) VALUES (?, 'Jun 26', '2026-06-01', 'CC')", (SEASON,))
+        conn.execute(
+            "INSERT INTO teamevent (id, name, iso_year, iso_week, tracks, max_score_per_track) "
+            "VALUES (1, 'Teamcup', 2026, 23, 4, 15000)"
+        )
+        conn.execute(
+            "INSERT INTO match (id, teamevent_id, season_number, start, opponent) VALUES (?, 1, ?, '2026-06-07', 'Rivals')",
+            (MATCH_ID, SEASON),
+        )
+
+
+def donations_workbook(players: int, workdir: Path) -> bytes:
+    workbook = excel_exporter.build_donations_workbook(
+        [(pid, f"Player {pid}", 1000 * pid) for pid in range(1, players + 1)], "2026-06-07"
+    )
+    for row in range(4, players + 4):
+        workbook.active.cell(row=row, column=3, value=row)
+    path = excel_exporter.save_workbook(workbook, workdir / "donations-source.xlsx")
+    return path.read_bytes()
+
+
+def run_workflows(
+    label: str,
+    dav: WebDavStandIn,
+    make_client: Callable[[], nextcloud.WebDavClient],
+    *,
+    db_path: Path,
+    workbook: bytes,
+    repeat: int,
+) -> None:
+    video_remote = f"{video_service.season_folder(SEASON)}/{MATCH_ID}.mp4"
+    donations_remote = sheet_service.DONATIONS_REMOTE_PATH.as_posix()
+
+    def export_sheet():
+        dav.files.pop(f"{sheet_service.NEXTCLOUD_BASE.as_posix()}/Team-Event/S{SEASON}/{sheet_file}", None)
+        outcome = sheet_service.export_match_sheet(
+            db_path,
+            MATCH_ID,
+            output_path=Path("out"),
+            workbook_builder=excel_exporter.build_match_sheet_workbook,
+            workbook_saver=excel_exporter.save_workbook,
+            absent_checker=lambda *_: False,
+        )
+        assert outcome.status == "EXPORTED", outcome
+
+    def import_donations():
+        dav.add_file(donations_remote, workbook)
+        outcome = sheet_service.import_donations_workbook(
+            db_path, workbook_reader=excel_exporter.read_donations_workbook
+        )
+        assert outcome.status == "IMPORTED", outcome
+
+    def pull_video():
+        for leftover in video_service.local_dir(MATCH_ID).glob("*"):
+            leftover.unlink()
+        outcome = video_service.pull_video(MATCH_ID)
+        assert outcome.status == "OK", outcome
+        assert outcome.local_path.stat().st_size == len(dav.files[video_remote])
+
+    match = sheet_service.get_match_export_data(db_path, MATCH_ID).match
+    sheet_file = sheet_service.match_sheet_filename(MATCH_ID, match[4], match[3])
+
+    for name, workflow in (("sheet export", export_sheet), ("donation import", import_donations), ("video pull", pull_video)):
+        client = make_client()
+        previous = nextcloud.set_client(client)
+        try:
+            dav.requests.clear()
+            dav.connections = 0
+            timings = measure(workflow, repeat=repeat)
+            runs = repeat + 1
+            print_timing(f"{name}, {label}", timings, unit="run")
+            print(
+                f"{'':<44} {len(dav.requests) / runs:9.1f} requests/run "
+                f"{dav.connections / runs:9.1f} connections/run"
+            )
+        finally:
+            nextcloud.set_client(previous)
+            client.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--video-mb", type=int, default=16)
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    started_in = Path.cwd()
+    with tempfile.TemporaryDirectory() as tmpdir, WebDavStandIn(latency=args.latency) as dav:
+        workdir = Path(tmpdir)
+        # The services keep their scratch files under tmp/ of the working directory.
+        os.chdir(workdir)
+        try:
+            db_path = workdir / "hcr2.db"
+            seed_database(db_path, players=args.players)
+            db_connection.DB_PATH = db_path
+            workbook = donations_workbook(args.players, workdir)
+            dav.add_file(
+                f"{video_service.season_folder(SEASON)}/{MATCH_ID}.mp4",
+                os.urandom(1024 * 1024) * args.video_mb,
+            )
+
+            def one_shot() -> nextcloud.WebDavClient:
+                return OneShotClient(url_template=dav.url_template, auth=dav.auth)
+
+            def pooled() -> nextcloud.WebDavClient:
+                caches = Path(tempfile.mkdtemp(dir=workdir))
+                return nextcloud.WebDavClient(
+                    url_template=dav.url_template,
+                    auth=dav.auth,
+                    dir_cache=RemoteDirCache(),
+                    content_cache=ContentCache(caches),
+                    listing_cache=ListingCache(path=caches / "listings.json"),
+                )
+
+            print(f"latency {args.latency * 1000:.1f} ms/request, video {args.video_mb} MB, {args.players} players")
+            common = dict(db_path=db_path, workbook=workbook, repeat=args.repeat)
+            run_workflows("one-shot", dav, one_shot, **common)
+            run_workflows("pooled", dav, pooled, **common)
+        finally:
+            os.chdir(started_in)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
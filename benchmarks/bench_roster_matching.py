@@ -0,0 +1,183 @@
+"""Team screen matching against a large player history.
+
+    python3 -m benchmarks.bench_roster_matching [--players 5000] [--active 50] [--repeat 5]
+
+The screen holds `--active` rows: most are active members, some with a changed
+garage power or a name the reader spelled a little differently, a few renamed
+beyond recognition and a few new names - the rows that need candidates out of the
+whole history. For the matching and candidate step:
+
+- `pairwise`: every reading against every player with SequenceMatcher, normalizing
+  both names per comparison and listing all players again per unknown name - the
+  matcher before the name index, kept here as the reference point
+- `indexed`: `NameIndex` for the active list and for everyone, built once
+
+Both have to produce the same matches and candidate lists; the script stops if
+they do not. `build_plan` is the whole plan, database reads included.
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import random
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.support import measure, print_timing
+from hcr2.db import connection as db_connection
+from hcr2.db.migrations import apply_migrations
+from hcr2.models.roster import RosterCandidate, RosterReading, RosterVideo
+from hcr2.repositories import players as player_repo
+from hcr2.services import rosters as roster_service
+from hcr2.services.videos import normalize_team_name
+
+SYLLABLES = ["ka", "lo", "mi", "ra", "zu", "bel", "fox", "ny", "star", "lady", "dri", "ve", "x", "qu", "een", "to"]
+
+
+def player_name(rng: random.Random) -> str:
+    name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    name = name.capitalize() if rng.random() < 0.6 else name.upper()
+    if rng.random() < 0.4:
+        name += str(rng.randint(1, 999))
+    if rng.random() < 0.2:
+        name = rng.choice(["PL|", "xX", "The"]) + name
+    return name
+
+
+def seed(db_path: Path, *, players: int, active: int, rng: random.Random) -> None:
+    names: set[str] = set()
+    while len(names) < players:
+        names.add(player_name(rng))
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO players (id, name, alias, garage_power, active, team) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (pid, name, None, rng.randint(8000, 30000), 1 if pid <= active else 0, "PLTE" if pid <= active else "")
+                for pid, name in enumerate(sorted(names), start=1)
+            ],
+        )
+
+
+def screen(active: list, rng: random.Random) -> list[RosterReading]:
+    readings = []
+    for player in active[:-6]:
+        name = player.name
+        if rng.random() < 0.2:
+            # A misread letter.
+            spot = rng.randrange(len(name))
+            name = name[:spot] + rng.choice("ilo01") + name[spot + 1:]
+        readings.append(RosterReading(name=name, garage_power=player.garage_power + rng.randint(0, 300)))
+    for player in active[-6:-3]:
+        readings.append(RosterReading(name=player_name(rng), garage_power=player.garage_power + 100))
+    for _ in range(3):
+        readings.append(RosterReading(name=player_name(rng), garage_power=rng.randint(8000, 30000)))
+    return readings
+
+
+# -------------------- The matcher before the index --------------------
+
+def pairwise_similarity(left: str, right: str) -> float:
+    left_key, right_key = normalize_team_name(left), normalize_team_name(right)
+    if not left_key or not right_key:
+        return 0.0
+    if left_key == right_key:
+        return 1.0
+    return difflib.SequenceMatcher(None, left_key, right_key).ratio()
+
+
+def pairwise_candidate_score(reading_name: str, player_name: str) -> float:
+    similarity = pairwise_similarity(reading_name, player_name)
+    shorter, longer = sorted((normalize_team_name(reading_name), normalize_team_name(player_name)), key=len)
+    if len(shorter) >= roster_service.CONTAINMENT_MIN_STEM and shorter and shorter in longer:
+        return max(similarity, roster_service.CONTAINMENT_SCORE)
+    return similarity
+
+
+def pairwise_match(reading: RosterReading, players):
+    scored = [(pairwise_similarity(reading.name, player.name), player) for player in players]
+    exact = [player for score, player in scored if score == 1.0]
+    if len(exact) == 1:
+        return exact[0], "EXACT"
+    if len(exact) > 1:
+        return None, "AMBIGUOUS"
+    close = [(score, player) for score, player in scored if score >= roster_service.NAME_MATCH_SIMILARITY]
+    if len(close) == 1:
+        return close[0][1], "FUZZY"
+    return None, "AMBIGUOUS" if close else "NONE"
+
+
+def pairwise_candidates(reading: RosterReading) -> list[RosterCandidate]:
+    scored = []
+    for player in player_repo.list_players(sort_by="name"):
+        similarity = pairwise_candidate_score(reading.name, player.name)
+        close_gp = (
+            reading.garage_power > 0
+            and player.garage_power > 0
+            and abs(player.garage_power - reading.garage_power)
+            <= reading.garage_power * roster_service.GP_CANDIDATE_WINDOW
+        )
+        if similarity < roster_service.CANDIDATE_MIN_SIMILARITY and not close_gp:
+            continue
+        scored.append(RosterCandidate(
+            player_id=player.id, name=player.name, team=player.team, active=player.active,
+            garage_power=player.garage_power, similarity=similarity,
+        ))
+    scored.sort(key=lambda c: (-c.similarity, abs(c.garage_power - reading.garage_power)))
+    return scored[:roster_service.CANDIDATE_LIMIT]
+
+
+def pairwise(readings: list[RosterReading], active: list):
+    matches = [pairwise_match(reading, active) for reading in readings]
+    unknown = [reading for reading, (player, _) in zip(readings, matches) if player is None]
+    return [(player.id if player else None, how) for player, how in matches], [pairwise_candidates(r) for r in unknown]
+
+
+def indexed(readings: list[RosterReading], active: list):
+    # The cache would otherwise carry the names over from the previous run.
+    roster_service._name_key.cache_clear()
+    active_index = roster_service.NameIndex(active)
+    matches = [roster_service.match_reading(reading, active_index) for reading in readings]
+    unknown = [reading for reading, (player, _) in zip(readings, matches) if player is None]
+    everyone = roster_service.NameIndex(player_repo.list_players(sort_by="name"))
+    return (
+        [(player.id if player else None, how) for player, how in matches],
+        [roster_service.find_candidates(reading, index=everyone) for reading in unknown],
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=5000)
+    parser.add_argument("--active", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    rng = random.Random(47)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "hcr2.db"
+        apply_migrations(db_path)
+        seed(db_path, players=args.players, active=args.active, rng=rng)
+        with mock.patch.object(db_connection, "DB_PATH", db_path):
+            active = player_repo.list_players(active_only=True, team_filter="PLTE", sort_by="name")
+            readings = screen(active, rng)
+            reference = pairwise(readings, active)
+            if indexed(readings, active) != reference:
+                print("indexed matching differs from the pairwise reference", file=sys.stderr)
+                return 1
+            unknown = len(reference[1])
+            print(f"{len(readings)} rows against {args.players} players, {unknown} without a match")
+
+            print_timing("pairwise", measure(lambda: pairwise(readings, active), repeat=args.repeat), unit="screen")
+            print_timing("indexed", measure(lambda: indexed(readings, active), repeat=args.repeat), unit="screen")
+            video = RosterVideo(players=readings, team="Power-Ladys", member_count=len(readings))
+            print_timing(
+                "build_plan", measure(lambda: roster_service.build_plan(video), repeat=args.repeat), unit="screen"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
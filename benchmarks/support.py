@@ -0,0 +1,30 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks are plain scripts, not tests: they are not collected by
+`python3 -m unittest discover` and print timings instead of asserting them.
+Run one with `python3 -m benchmarks.<name>`.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Callable
+
+
+def measure(func: Callable[[], object], *, repeat: int, warmup: int = 1) -> list[float]:
+    """Wall-clock seconds per call, after `warmup` untimed calls."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def print_timing(label: str, timings: list[float], *, per: int = 1, unit: str = "call") -> None:
+    """Median and best of the runs, divided by `per` items processed in each run."""
+    median = statistics.median(timings) / per * 1000
+    best = min(timings) / per * 1000
+    print(f"{label:<44} {median:9.2f} ms/{unit} median  {best:9.2f} ms/{unit} best  ({len(timings)} runs)")
@@ -6,9 +6,14 @@ import textwrap
 import sys
 import subprocess
 import shlex  # für .p++ mit Anführungszeichen
+import sqlite3
+from collections import Counter, OrderedDict
+from pathlib import Path
+from time import monotonic
 from typing import Optional
 from secrets_config import CONFIG, NEXTCLOUD_AUTH
 from version import get_version, get_history
+from hcr2.db.connection import DB_PATH
 
 from discord.ext import tasks  # Scheduler
 from zoneinfo import ZoneInfo   # Zeitzone Europe/Berlin
@@ -123,8 +128,204 @@ def run_hcr2_sync(args):
     return CliResult(result.stdout, ok=result.returncode == 0)
 
 async def run_hcr2(args):
+    """run_hcr2_sync off the event loop. Read-only calls are answered from
+    `response_cache` while the data is unchanged, and identical ones running at
+    the same time share one run (`in_flight`); any other call empties the cache."""
+    key = cache_key(args)
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, run_hcr2_sync, args)
+
+    if not is_read_only(key):
+        result = await loop.run_in_executor(None, run_hcr2_sync, args)
+        response_cache.invalidate("write")
+        # Whoever asks from now on must not join a run that started before the write.
+        in_flight.forget()
+        return result
+
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+    generation = response_cache.generation
+
+    async def compute():
+        result = await loop.run_in_executor(None, run_hcr2_sync, args)
+        if result is not None:
+            response_cache.put(key, result, generation)
+        return result
+
+    return await in_flight.run(key, compute)
+
+# ===================== Antwort-Cache für Lese-Aufrufe =======================
+
+# hcr2 calls that only read, by their leading words. Anything else counts as a
+# write, and the cache is emptied once it has run.
+READ_ONLY_CALLS = (
+    ("player", "show"),
+    ("player", "grep"),
+    ("player", "list-active"),
+    ("player", "list-leader"),
+    ("player", "list-absent"),
+    ("stats", "perf"),
+    ("stats", "score"),
+    ("stats", "points"),
+    ("stats", "te"),
+    ("stats", "battle"),
+    ("stats", "absent"),
+    ("stats", "player"),
+    ("distance", "list"),
+    ("distance", "weeks"),
+    ("distance", "show"),
+    ("donations", "under"),
+    ("match", "list"),
+    ("match", "show"),
+    ("matchscore", "list-short"),
+    ("teamevent", "list"),
+    ("teamevent", "show"),
+    ("season", "list"),
+    ("vehicle", "list"),
+)
+CACHE_TTL = 5 * 60           # Sekunden - Sicherheitsnetz hinter dem Invalidieren
+CACHE_MAX_ENTRIES = 256
+
+
+def cache_key(args) -> tuple[str, ...]:
+    """The argv as the cache compares it: each word stripped, inner spaces collapsed."""
+    return tuple(" ".join(str(arg).split()) for arg in args)
+
+
+def is_read_only(key: tuple[str, ...]) -> bool:
+    return any(key[:len(prefix)] == prefix for prefix in READ_ONLY_CALLS)
+
+
+class ResponseCache:
+    """Answers of read-only hcr2 calls, kept until the data behind them may have changed.
+
+    Emptied when a writing call has run (`invalidate`), when the database was
+    changed from outside - an import, a cron job - and for each answer after `ttl`
+    seconds regardless. "Changed from outside" is SQLite's `PRAGMA data_version`,
+    which moves with every commit made by another connection, plus the file's
+    mtime and size for a database that was replaced as a whole.
+    """
+
+    def __init__(self, db_path, *, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES, clock=monotonic):
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: OrderedDict[tuple[str, ...], tuple[float, CliResult]] = OrderedDict()
+        # Bumped on every invalidation; an answer computed across one is not kept.
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations: Counter[str] = Counter()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fingerprint = None
+
+    def get(self, key: tuple[str, ...]) -> Optional[CliResult]:
+        self._check_database()
+        entry = self.entries.get(key)
+        if entry is not None and self.clock() - entry[0] > self.ttl:
+            del self.entries[key]
+            self.expired += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple[str, ...], result: CliResult, generation: int) -> None:
+        """Keeps `result`, unless the cache was invalidated while it was computed."""
+        if generation != self.generation:
+            return
+        self.entries[key] = (self.clock(), result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, reason: str) -> int:
+        """Drops every answer; returns how many there were."""
+        dropped = len(self.entries)
+        self.entries.clear()
+        self.generation += 1
+        self.invalidations[reason] += 1
+        return dropped
+
+    def describe(self) -> str:
+        asked = self.hits + self.misses
+        rate = f"{self.hits * 100 // asked}%" if asked else "-"
+        return "\n".join([
+            f"{'Answers':<15}: {len(self.entries)} / {self.max_entries}",
+            f"{'Hits / misses':<15}: {self.hits} / {self.misses} ({rate} hits)",
+            f"{'Expired':<15}: {self.expired} (after {self.ttl:g} s)",
+            f"{'Emptied by':<15}: {self.invalidations['write']} writes, "
+            f"{self.invalidations['database']} database changes, {self.invalidations['clear']} .cache clear",
+        ])
+
+    def _check_database(self) -> None:
+        fingerprint = self._read_fingerprint()
+        if fingerprint != self._fingerprint:
+            if self._fingerprint is not None:
+                self.invalidate("database")
+            self._fingerprint = fingerprint
+
+    def _read_fingerprint(self):
+        try:
+            stat = self.db_path.stat()
+        except OSError:
+            return None
+        try:
+            if self._conn is None:
+                # data_version counts the commits of *other* connections, so this
+                # one has to stay open between calls.
+                self._conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            self._conn = None
+            version = None
+        return (stat.st_mtime_ns, stat.st_size, version)
+
+
+class InFlight:
+    """Identical read-only calls made while one of them runs wait for that run
+    instead of starting their own, and all get the same CliResult.
+
+    Only for reads: two identical writes - `.xa` toggles the absent flag - have to
+    run twice.
+    """
+
+    def __init__(self):
+        self.running: dict[tuple[str, ...], asyncio.Future] = {}
+        self.started = 0
+        self.joined = 0
+
+    async def run(self, key: tuple[str, ...], compute):
+        future = self.running.get(key)
+        if future is None:
+            future = asyncio.ensure_future(compute())
+            self.running[key] = future
+            self.started += 1
+            future.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.joined += 1
+        # shield: a caller that is cancelled leaves the run to the others.
+        return await asyncio.shield(future)
+
+    def forget(self) -> None:
+        """Later calls start a run of their own; those waiting keep theirs."""
+        self.running.clear()
+
+    def describe(self) -> str:
+        return f"{'Shared runs':<15}: {self.joined} calls joined a running one ({self.started} runs started)"
+
+    def _finished(self, key: tuple[str, ...], future: asyncio.Future) -> None:
+        if self.running.get(key) is future:
+            del self.running[key]
+
+
+response_cache = ResponseCache(DB_PATH)
+in_flight = InFlight()
 
 # ===================== 2-Spalten-Help-Builder ===============================
 
@@ -547,6 +748,7 @@ async def send_admin_help(channel):
         name="Sheets",
         value=help_field([
             (".c <matchid>", "Create match sheet"),
+            (".cs <season>", "Create all match sheets of a season"),
             (".i <matchid>", "Import match sheet"),
             (".pe", "Export player sheet"),
             (".pi", "Import player sheet"),
@@ -559,6 +761,7 @@ async def send_admin_help(channel):
             (".v", "List vehicles"),
             (".d", "Donation index below 100"),
             (".version", "Show bot version"),
+            (".cache [stats|clear]", "Cached answers of read commands"),
             (".ph .th .sh .mh .xh", "Detailed admin helps"),
         ]),
         inline=False,
@@ -784,6 +987,18 @@ async def on_message(message):
         await post_birthdays_now()
         return
 
+    # .cache [stats|clear]  → Antwort-Cache der Lese-Aufrufe
+    if cmd == ".cache":
+        sub = args[0].lower() if args else "stats"
+        if sub == "stats":
+            await send_codeblock(message.channel, response_cache.describe() + "\n" + in_flight.describe())
+        elif sub == "clear":
+            dropped = response_cache.invalidate("clear")
+            await send_success(message.channel, "Cache cleared", f"{dropped} cached answers dropped.")
+        else:
+            await send_usage(message.channel, ".cache [stats|clear]")
+        return
+
     # ================== NEUE ADMIN-KOMMANDOS ==================
 
     if cmd == ".pl":
@@ -1113,6 +1328,21 @@ async def on_message(message):
             await message.channel.send("❌ Error during sheet creation.")
         return
 
+    # --- Sheet create for a whole season ---
+    if cmd == ".cs" and len(args) == 1 and args[0].isdigit():
+        output = await run_hcr2(["sheet", "create-season", args[0]])
+        if output:
+            color = 0x2ecc71 if output.ok else 0xe74c3c
+            # Embed descriptions stop at 4096 characters; the totals line is the last one.
+            desc = output.strip()
+            if len(desc) > 4000:
+                desc = "…\n" + desc[-3990:]
+            embed = discord.Embed(title=f"📄 Season {args[0]} sheets", description=desc, color=color)
+            await message.channel.send(embed=embed)
+        else:
+            await message.channel.send("❌ Error during sheet creation.")
+        return
+
     # --- Sheet import ---
     if cmd == ".i" and len(args) == 1 and args[0].isdigit():
         output = await run_hcr2(["sheet", "import", args[0]])
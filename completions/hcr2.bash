@@ -30,8 +30,8 @@ _hcr2_entity_commands()
         match) echo "add edit show list delete" ;;
         matchscore) echo "add list list-short delete edit" ;;
         stats) echo "perf avg alias rank te te-user scatter bdayplot battle absent player score points" ;;
-        sheet) echo "create import player donations" ;;
-        video) echo "list pull frames roster apply player chest" ;;
+        sheet) echo "create create-season import player donations" ;;
+        video) echo "list pull frames stitch worker jobs roster apply player chest" ;;
         distance) echo "list show weeks add delete" ;;
         donations) echo "add delete edit show stats under list" ;;
     esac
@@ -76,12 +76,18 @@ _hcr2_flags()
         stats:perf) echo "--active" ;;
         stats:score|stats:points) echo "--skip --no-skip" ;;
 
-        video:list|video:roster) echo "--match" ;;
-        video:pull) echo "--match --file" ;;
-        video:frames) echo "--match --file --fps --width --crop --start --duration" ;;
+        sheet:create-season) echo "--season" ;;
+
+        video:list) echo "--match --refresh" ;;
+        video:worker) echo "--workers --refresh --retry" ;;
+        video:jobs) echo "--all" ;;
+        video:roster) echo "--match" ;;
+        video:pull) echo "--match --file --refresh" ;;
+        video:frames) echo "--match --file --refresh --fps --width --crop --start --duration --mode --threshold --dedupe --jobs" ;;
+        video:stitch) echo "--match --file --refresh --fps --width --crop --start --duration" ;;
         video:apply) echo "--match --file --dry-run --force" ;;
-        video:player) echo "--file --fps --width --crop --start --duration --dry-run --force" ;;
-        video:chest) echo "--year --week --file --fps --width --crop --start --duration --dry-run --force" ;;
+        video:player) echo "--file --refresh --fps --width --crop --start --duration --mode --threshold --dedupe --jobs --dry-run --force" ;;
+        video:chest) echo "--year --week --file --refresh --fps --width --crop --start --duration --mode --threshold --dedupe --jobs --dry-run --force" ;;
 
         distance:list) echo "--year --week" ;;
         distance:show) echo "--player --num" ;;
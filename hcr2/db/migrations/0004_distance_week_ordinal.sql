@@ -0,0 +1,20 @@
+-- A running week number for `distance`, so "the previous week" is one less across
+-- New Year too. `year * 100 + week` jumps from 202552 to 202601, and the ranking's
+-- rolling average used to compare those numbers directly.
+--
+-- The ordinal counts weeks since Monday 2000-01-03: ISO week 1 starts on the
+-- Monday of the week holding 4 January. The repository writes the same value
+-- from Python (`week_ordinal`) on every upsert; this backfills existing rows.
+ALTER TABLE distance ADD COLUMN week_ordinal INTEGER;
+
+UPDATE distance
+SET week_ordinal = CAST(
+    (
+        julianday(printf('%04d-01-04', year))
+        - ((CAST(strftime('%w', printf('%04d-01-04', year)) AS INTEGER) + 6) % 7)
+        + (week - 1) * 7
+        - julianday('2000-01-03')
+    ) / 7 AS INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_distance_player_ordinal ON distance(player_id, week_ordinal);
@@ -0,0 +1,36 @@
+-- Recordings found on Nextcloud and how far the video pipeline got with each.
+--
+-- One row per thing a recording is for: a match (`job_key` = the match id), a
+-- chest week (`2026-W34`) or the team screen (`team`). A replaced upload - another
+-- size or ETag under the same key - sends the row back to 'queued'.
+--
+-- `stage` is the last step that finished, so a worker that is stopped halfway picks
+-- the job up where it was: pulled -> extracted by `video worker`, read when the
+-- readings file is next to the frames, applied by `video apply` and friends.
+-- `claimed_at` keeps two workers off the same job; a claim older than the worker's
+-- timeout is taken to be left over from one that died.
+--
+-- No foreign key to match: the queue is bookkeeping, not result data, and must
+-- not stand in the way of deleting a match.
+CREATE TABLE IF NOT EXISTS video_job (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL CHECK(kind IN ('standings', 'chest', 'team')),
+    job_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    remote_path TEXT NOT NULL,
+    size INTEGER,
+    etag TEXT,
+    match_id INTEGER,
+    year INTEGER,
+    week INTEGER,
+    stage TEXT NOT NULL DEFAULT 'queued'
+        CHECK(stage IN ('queued', 'pulled', 'extracted', 'read', 'applied')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    claimed_at TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (kind, job_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_video_job_stage ON video_job(stage);
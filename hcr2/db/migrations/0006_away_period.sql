@@ -0,0 +1,30 @@
+-- Every away window a player ever had, not just the current one.
+--
+-- `players.away_from` / `away_until` hold a single window that `player away`
+-- overwrites and `player back` clears, so an old match re-imported later was
+-- judged against whatever the player had set today. `set_away` / `clear_away`
+-- now also write here: a new window cuts short the one still running, and
+-- coming back ends it at that moment. The columns on `players` stay as the
+-- current window for the listings.
+--
+-- Same text format and local time as the `players` columns (see
+-- hcr2/timestamps.py). A NULL end is open, as it is on `players`.
+--
+-- ON DELETE CASCADE: the windows describe the player, not results, and go with them.
+CREATE TABLE IF NOT EXISTS away_period (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_id INTEGER NOT NULL,
+    away_from TEXT,
+    away_until TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    CHECK (away_from IS NOT NULL OR away_until IS NOT NULL),
+    FOREIGN KEY (player_id) REFERENCES players(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_away_period_player ON away_period(player_id, away_from, away_until);
+
+-- The windows set so far are the only history there is.
+INSERT INTO away_period (player_id, away_from, away_until)
+    SELECT id, away_from, away_until
+    FROM players
+    WHERE away_from IS NOT NULL OR away_until IS NOT NULL;
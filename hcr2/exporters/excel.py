@@ -1,18 +1,31 @@
 from __future__ import annotations
 
+from copy import copy
+from dataclasses import dataclass
 from datetime import date, datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+import re
+from typing import Any, Callable
 
 from openpyxl import load_workbook
 from openpyxl import Workbook
-from openpyxl.styles import Alignment
+from openpyxl.cell import Cell
 from openpyxl.styles import Font
 from openpyxl.utils import get_column_letter
 
 from hcr2.services.sheets import parse_k_amount, to_k
 
 
+# Layout lives in the template; regenerate it with scripts/build_match_sheet_template.py.
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+MATCH_SHEET_TEMPLATE = TEMPLATE_DIR / "match_sheet.xlsx"
+MATCH_SHEET_FIRST_PLAYER_ROW = 4
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
 def save_workbook(workbook: Workbook, path: Path) -> Path:
     path.parent.mkdir(parents=True, exist_ok=True)
     workbook.save(path)
@@ -85,63 +98,137 @@ def build_donations_workbook(rows: list[tuple[int, str, int]], today: str) -> Wo
     return wb
 
 
-def build_match_sheet_workbook(
-    match: tuple[int, str, int, str, str],
-    players: list[tuple[int, str, str | None, str | None]],
-    *,
-    is_absent_on,
-) -> Workbook:
-    match_id, match_date_str, season, opponent, event = match
+@dataclass(frozen=True)
+class SheetTemplate:
+    """A workbook layout read once from a shipped .xlsx.
+
+    `cells` are the static cells with their placeholders, `row` the prototype data
+    row that is repeated per record. Styles are kept as objects and applied to the
+    new workbook, values containing ``{name}`` are filled with `str.format`.
+    """
+
+    title: str
+    cells: tuple[tuple[int, int, Any, Any], ...]
+    row: tuple[tuple[Any, Any], ...]
+    widths: tuple[tuple[str, float], ...]
+
+
+@lru_cache(maxsize=None)
+def load_sheet_template(path: Path, data_row: int) -> SheetTemplate:
+    """Parsed once per process; every later export only fills cells."""
+    ws = load_workbook(filename=path).active
+    shared: dict[Any, Any] = {}
+
+    def alignment_of(cell):
+        # Equal alignments share one object, which openpyxl's style list then finds
+        # by identity instead of comparing it field by field for every cell.
+        if not cell.has_style:
+            return None
+        alignment = copy(cell.alignment)
+        return shared.setdefault(alignment, alignment)
+
+    cells = []
+    for row in ws.iter_rows(min_row=1, max_row=data_row - 1):
+        for cell in row:
+            if cell.value is None and not cell.has_style:
+                continue
+            cells.append((cell.row, cell.column, cell.value, alignment_of(cell)))
+
+    prototype = next(ws.iter_rows(min_row=data_row, max_row=data_row), ())
+    data = tuple((cell.value, alignment_of(cell)) for cell in prototype)
+    widths = tuple((key, dim.width) for key, dim in ws.column_dimensions.items() if dim.width)
+    return SheetTemplate(title=ws.title, cells=tuple(cells), row=data, widths=widths)
 
+
+def _fill(value, fields: dict[str, Any]):
+    """A cell that is nothing but ``{name}`` keeps the field's type (ids stay numbers)."""
+    if _is_placeholder(value):
+        return _filler(value)(fields)
+    return "" if value is None else value
+
+
+def _new_sheet_from_template(template: SheetTemplate, fields: dict[str, Any]) -> Workbook:
     wb = Workbook()
     ws = wb.active
-    ws.title = "Match Info"
+    ws.title = template.title
+    for row, column, value, alignment in template.cells:
+        cell = ws.cell(row=row, column=column, value=_fill(value, fields) if value is not None else None)
+        if alignment is not None:
+            cell.alignment = alignment
+    for key, width in template.widths:
+        ws.column_dimensions[key].width = width
+    return wb
 
-    ws.append([f"Match ID: {match_id}", f"Date: {match_date_str}", f"Season: {season}", f"Opponent: {opponent}", f"Event: {event}"])
 
-    ws.insert_rows(2, amount=1)
-    ws["A2"] = "Result"
-    ws["B2"] = "Power Ladies -->"
-    ws["C2"] = ""
-    ws["D2"] = ""
-    ws["E2"] = f"<-- {opponent}"
+def _append_template_rows(ws, template: SheetTemplate, rows: list[dict[str, Any]]) -> None:
+    """The template styles a data column with nothing but an alignment, so every cell
+    of the column is given that one Alignment; openpyxl registers it only once.
 
-    ws.append(["MatchID", "PlayerID", "Player", "Score", "Points", "Absent", "Checkin", "Notes"])
+    The prototype row is worked out once: constant cells are copied as they are and
+    only the placeholders are filled per record. A styled cell is handed to `append`
+    ready-made rather than looked up again afterwards.
+    """
+    prototype = [None if _is_placeholder(value) else _fill(value, {}) for value, _ in template.row]
+    filled = [(index, _filler(value)) for index, (value, _) in enumerate(template.row) if _is_placeholder(value)]
+    styled = [(index, alignment) for index, (_, alignment) in enumerate(template.row) if alignment is not None]
+    for fields in rows:
+        values = prototype.copy()
+        for index, fill in filled:
+            values[index] = fill(fields)
+        for index, alignment in styled:
+            cell = Cell(ws, value=values[index])
+            cell.alignment = alignment
+            values[index] = cell
+        ws.append(values)
 
-    for row in ws.iter_rows(min_row=3, max_row=3, min_col=1, max_col=7):
-        for cell in row:
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    ws.column_dimensions["A"].width = 15
-    ws.column_dimensions["B"].width = 20
-    ws.column_dimensions["C"].width = 26
-    ws.column_dimensions["D"].width = 20
-    ws.column_dimensions["E"].width = 20
-    ws.column_dimensions["F"].width = 8
-    ws.column_dimensions["G"].width = 9
-    ws.column_dimensions["H"].width = 130
-
-    ws["H3"] = (
-        "H1: Did not drive: enter Score=0 and Points=0.\n"
-        "H2: Set Absent to true when a player is excused (vacation etc.).\n"
-        "H3: Set Checkin to true when a player logged into the match but did not drive.\n"
-        "H4: If a player left the team but is still listed, delete the row.\n"
-        "H5: If a player is missing, add them with the correct ID.\n"
-        "H6: If a missing player has not been created yet, enter 'a' for add in column B instead of the ID. The player is created during import.\n"
-        "H7: Enter the match results in cell C2 (Ladies) and D2 (opponent).\n"
-        "H8: Column C (Player) may be corrected when someone changed their name; the new name is stored during import. Leave it as it is otherwise, and never use it for notes — use column H."
-    )
-    ws["H3"].alignment = Alignment(wrap_text=True, vertical="top")
 
-    for pid, name, away_from, away_until in players:
-        absent_flag = is_absent_on(match_date_str, away_from, away_until)
-        ws.append([match_id, pid, name, "", "", "true" if absent_flag else "false", "", ""])
+def _is_placeholder(value) -> bool:
+    return isinstance(value, str) and "{" in value
+
+
+@lru_cache(maxsize=None)
+def _filler(value: str) -> Callable[[dict[str, Any]], Any]:
+    """How a placeholder cell is filled, parsed once per template value."""
+    whole = _PLACEHOLDER_RE.fullmatch(value)
+    if whole:
+        return itemgetter(whole.group(1))
+    return lambda fields: value.format(**fields)
 
-    align_center = Alignment(horizontal="center", vertical="center")
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=2):
-        for cell in row:
-            cell.alignment = align_center
 
+def build_match_sheet_workbook(
+    match: tuple[int, str, int, str, str],
+    players: list[tuple[int, str, str | None, str | None]],
+    *,
+    is_absent_on,
+) -> Workbook:
+    match_id, match_date_str, season, opponent, event = match
+    template = load_sheet_template(MATCH_SHEET_TEMPLATE, MATCH_SHEET_FIRST_PLAYER_ROW)
+
+    wb = _new_sheet_from_template(
+        template,
+        {
+            "match_id": match_id,
+            "date": match_date_str,
+            "season": season,
+            "opponent": opponent,
+            "event": event,
+            "score_ladys": "",
+            "score_opponent": "",
+        },
+    )
+    _append_template_rows(
+        wb.active,
+        template,
+        [
+            {
+                "match_id": match_id,
+                "player_id": pid,
+                "player": name,
+                "absent": "true" if is_absent_on(match_date_str, away_from, away_until) else "false",
+            }
+            for pid, name, away_from, away_until in players
+        ],
+    )
     return wb
 
 
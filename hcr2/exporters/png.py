@@ -0,0 +1,40 @@
+"""PNG files without an imaging library: 8-bit gray or RGB rows, deflated by zlib."""
+from __future__ import annotations
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable
+
+# Colour type per channel count: 0 = grayscale, 2 = truecolour.
+COLOUR_TYPES = {1: 0, 3: 2}
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def png_bytes(width: int, rows: Iterable[bytes], *, channels: int = 3, level: int = 6) -> bytes:
+    """The image made of `rows` (each `width * channels` bytes, top to bottom).
+
+    Every row is stored unfiltered (filter type 0); the screens this is used for are
+    mostly flat areas and text, which deflate well without filtering.
+    """
+    compressor = zlib.compressobj(level)
+    data = []
+    height = 0
+    for row in rows:
+        if len(row) != width * channels:
+            raise ValueError(f"row {height} has {len(row)} bytes, expected {width * channels}")
+        data.append(compressor.compress(b"\x00" + row))
+        height += 1
+    data.append(compressor.flush())
+    header = struct.pack(">IIBBBBB", width, height, 8, COLOUR_TYPES[channels], 0, 0, 0)
+    return SIGNATURE + _chunk(b"IHDR", header) + _chunk(b"IDAT", b"".join(data)) + _chunk(b"IEND", b"")
+
+
+def write_png(path: Path, width: int, rows: Iterable[bytes], *, channels: int = 3) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(png_bytes(width, rows, channels=channels))
+    return path
+
+
+def _chunk(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
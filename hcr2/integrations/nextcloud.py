@@ -1,16 +1,33 @@
 from __future__ import annotations
 
+import atexit
+import hashlib
+import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from email.utils import parsedate_to_datetime
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import unquote
 from xml.etree import ElementTree
 
 import requests
-
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from hcr2.integrations.nextcloud_cache import (
+    PROFILE_ENV,
+    ContentCache,
+    ListingCache,
+    RemoteDirCache,
+    RequestStats,
+    parent_of,
+    sha256_of,
+)
 from secrets_config import NEXTCLOUD_AUTH
 
 
@@ -35,10 +52,41 @@ def remote_path(*parts) -> str:
 
 DAV_NS = "{DAV:}"
 
+# (connect, read) seconds. Without a read timeout one hung request blocks a bot
+# executor thread for good. HCR2_NEXTCLOUD_TIMEOUT overrides both: "10" or "5,120".
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 60.0
+TIMEOUT_ENV = "HCR2_NEXTCLOUD_TIMEOUT"
+
+# Transient server errors (Nextcloud behind a restarting Apache, a locked file) are
+# retried with exponential backoff. PUT is left out: its body is an open file that
+# urllib3 cannot rewind, so a replay would upload nothing.
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (500, 502, 503, 504)
+RETRY_METHODS = frozenset({"HEAD", "GET", "PROPFIND", "MKCOL", "DELETE"})
+
+# Matches the season export's upload threads with room to spare.
+POOL_SIZE = 8
+
+# Videos are streamed to disk in pieces of this size instead of held in memory.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Files above this size are uploaded with Nextcloud's chunked upload (v2): the pieces
+# go to an upload folder under /remote.php/dav/uploads/<user>/ and a MOVE assembles
+# them. A dropped connection then costs one chunk, and the next run sends only the
+# chunks the server has not confirmed. Nextcloud wants at least 5 MB per chunk.
+CHUNKED_UPLOAD_THRESHOLD = 32 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+UPLOAD_WORKERS = 2
+
+# (bytes done, bytes expected or None when the server does not say)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
 PROPFIND_BODY = (
     '<?xml version="1.0" encoding="utf-8"?>'
     '<d:propfind xmlns:d="DAV:"><d:prop>'
-    "<d:getlastmodified/><d:getcontentlength/><d:resourcetype/>"
+    "<d:getlastmodified/><d:getcontentlength/><d:resourcetype/><d:getetag/>"
     "</d:prop></d:propfind>"
 )
 
@@ -52,6 +100,7 @@ class RemoteEntry:
     size: int
     last_modified: Optional[datetime]
     is_dir: bool
+    etag: Optional[str] = None
 
 
 def _report(what: str, error: Exception | None) -> None:
@@ -70,6 +119,504 @@ def remote_url(remote_path) -> str:
     return NEXTCLOUD_URL.format(user=user, path=str(remote_path).lstrip("/"))
 
 
+def configured_timeout() -> tuple[float, float]:
+    raw = os.environ.get(TIMEOUT_ENV, "").strip()
+    if not raw:
+        return CONNECT_TIMEOUT, READ_TIMEOUT
+    try:
+        values = [float(part) for part in raw.split(",")]
+    except ValueError:
+        return CONNECT_TIMEOUT, READ_TIMEOUT
+    if len(values) == 1:
+        return values[0], values[0]
+    return values[0], values[1]
+
+
+class WebDavClient:
+    """One keep-alive `requests.Session` for every call to Nextcloud.
+
+    The module-level functions below delegate to a shared instance, so an upload
+    with its HEAD and MKCOL chain, or a season export's dozen uploads, reuse the same
+    pooled connections instead of a TCP handshake and authentication per request.
+    URL template and account default to the module settings at call time.
+    """
+
+    def __init__(
+        self,
+        *,
+        url_template: str | None = None,
+        auth: tuple[str, str] | None = None,
+        timeout: tuple[float, float] | None = None,
+        retries: int = RETRY_TOTAL,
+        backoff: float = RETRY_BACKOFF,
+        pool_size: int = POOL_SIZE,
+        dir_cache: RemoteDirCache | None = None,
+        content_cache: ContentCache | None = None,
+        listing_cache: ListingCache | None = None,
+        chunk_threshold: int = CHUNKED_UPLOAD_THRESHOLD,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        upload_workers: int = UPLOAD_WORKERS,
+    ) -> None:
+        self._url_template = url_template
+        self._auth = auth
+        self.timeout = timeout or configured_timeout()
+        self.retries = retries
+        self.backoff = backoff
+        self.chunk_threshold = chunk_threshold
+        self.chunk_size = chunk_size
+        self.upload_workers = max(1, upload_workers)
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.dirs = dir_cache if dir_cache is not None else RemoteDirCache()
+        self.contents = content_cache
+        self.listings = listing_cache
+        self.stats = RequestStats()
+        # Set once the server refuses Depth infinity or answers it with Depth 1.
+        self.depth_infinity_refused = False
+
+    @property
+    def auth(self) -> tuple[str, str]:
+        return self._auth or NEXTCLOUD_AUTH
+
+    @property
+    def url_template(self) -> str:
+        return self._url_template or NEXTCLOUD_URL
+
+    def url(self, remote_path) -> str:
+        user, _ = self.auth
+        return self.url_template.format(user=user, path=str(remote_path).lstrip("/"))
+
+    def upload_url(self, upload_path) -> str:
+        """URL below the account's chunked-upload root, the sibling of the files root."""
+        user, _ = self.auth
+        uploads = self.url_template.replace("/dav/files/", "/dav/uploads/")
+        return uploads.format(user=user, path=str(upload_path).lstrip("/"))
+
+    def request(self, method: str, remote_path, **kwargs) -> requests.Response:
+        return self._send(method, self.url(remote_path), **kwargs)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        self.stats.record(method)
+        return self.session.request(method, url, auth=self.auth, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def upload_file(self, local_path, remote_path, *, overwrite: bool = False) -> tuple[Optional[str], bool]:
+        remote_path = str(remote_path).lstrip("/")
+        url = self.url(remote_path)
+
+        try:
+            head = self.request("HEAD", remote_path)
+            exists = head.status_code == 200
+        except requests.RequestException as e:
+            _report(f"HEAD failed for {remote_path}", e)
+            exists = False
+
+        if exists:
+            self.dirs.add(parent_of(remote_path))
+            if not overwrite:
+                return url, False
+
+        self.ensure_remote_dirs(remote_path)
+
+        if os.path.getsize(local_path) > self.chunk_threshold:
+            if not self.upload_chunked(local_path, remote_path):
+                return None, False
+            self._forget_listing(parent_of(remote_path))
+            return url, not exists
+
+        with open(local_path, "rb") as f:
+            res = self.request("PUT", remote_path, data=f)
+
+        if res.status_code == 409:
+            # The cache believed in a folder someone removed: forget it and retry once.
+            self.dirs.discard(parent_of(remote_path))
+            self.ensure_remote_dirs(remote_path)
+            with open(local_path, "rb") as f:
+                res = self.request("PUT", remote_path, data=f)
+
+        if res.status_code in (200, 201, 204):
+            self._forget_listing(parent_of(remote_path))
+            return url, not exists
+        return None, False
+
+    def upload_chunked(self, local_path, remote_path) -> bool:
+        """Nextcloud chunked upload (v2): MKCOL an upload folder, PUT the chunks, MOVE `.file`.
+
+        The upload folder is named after the destination and the local file's size and
+        mtime, so running the same upload again finds the folder of the attempt that
+        failed; its chunks are listed and only the missing or short ones are sent.
+        Chunks go out `upload_workers` at a time. The parent folders must exist; the
+        MOVE replaces an existing file.
+        """
+        remote_path = str(remote_path).strip("/")
+        size = os.path.getsize(local_path)
+        transfer = transfer_id(local_path, remote_path)
+        target = {"Destination": self.url(remote_path), "OC-Total-Length": str(size)}
+
+        try:
+            response = self._send("MKCOL", self.upload_url(transfer), headers=target)
+        except requests.RequestException as e:
+            _report(f"MKCOL of the upload folder failed for {remote_path}", e)
+            return False
+        if response.status_code == 201:
+            confirmed: dict[str, int] = {}
+        elif response.status_code == 405:
+            # Left by an earlier attempt: keep what arrived.
+            confirmed = self._confirmed_chunks(transfer)
+        else:
+            _report(f"MKCOL of the upload folder returned HTTP {response.status_code} for {remote_path}", None)
+            return False
+
+        pieces = [
+            (number, offset, min(self.chunk_size, size - offset))
+            for number, offset in enumerate(range(0, size, self.chunk_size), start=1)
+        ]
+        todo = [piece for piece in pieces if confirmed.get(chunk_name(piece[0])) != piece[2]]
+        self.stats.record_saved("PUT", len(pieces) - len(todo))
+
+        def send(piece: tuple[int, int, int]) -> bool:
+            return self._put_chunk(local_path, transfer, target, *piece)
+
+        with ThreadPoolExecutor(max_workers=self.upload_workers) as pool:
+            sent = list(pool.map(send, todo))
+        if not all(sent):
+            _report(f"{sent.count(False)} of {len(pieces)} chunk(s) not uploaded for {remote_path}", None)
+            return False
+
+        try:
+            response = self._send(
+                "MOVE",
+                self.upload_url(f"{transfer}/.file"),
+                headers={**target, "Overwrite": "T"},
+            )
+        except requests.RequestException as e:
+            _report(f"MOVE of the chunks failed for {remote_path}", e)
+            return False
+        if response.status_code in (201, 204):
+            return True
+        _report(f"MOVE of the chunks returned HTTP {response.status_code} for {remote_path}", None)
+        return False
+
+    def _put_chunk(self, local_path, transfer: str, target: dict[str, str], number: int, offset: int, length: int) -> bool:
+        # The chunk is in memory, so unlike a whole-file PUT it can be sent again.
+        with open(local_path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        url = self.upload_url(f"{transfer}/{chunk_name(number)}")
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            try:
+                response = self._send("PUT", url, data=data, headers=target)
+            except requests.RequestException:
+                continue
+            if response.status_code in (201, 204):
+                return True
+            if response.status_code not in RETRY_STATUSES:
+                return False
+        return False
+
+    def _confirmed_chunks(self, transfer: str) -> dict[str, int]:
+        """Chunk name -> size of what the server already holds for `transfer`."""
+        url = self.upload_url(transfer)
+        try:
+            response = self._send(
+                "PROPFIND",
+                url,
+                headers={"Depth": "1", "Content-Type": "application/xml"},
+                data=PROPFIND_BODY.encode("utf-8"),
+            )
+        except requests.RequestException as e:
+            _report("PROPFIND of the upload folder failed", e)
+            return {}
+        if response.status_code != 207:
+            return {}
+        prefix = self.upload_url("").split("://", 1)[-1].split("/", 1)[-1]
+        try:
+            entries = _parse_propfind(response.content, base=transfer, prefix=prefix)
+        except ElementTree.ParseError:
+            return {}
+        return {entry.name: entry.size for entry in entries if not entry.is_dir}
+
+    def delete_file(self, remote_path) -> bool:
+        try:
+            r = self.request("DELETE", remote_path)
+        except requests.RequestException as e:
+            _report(f"DELETE failed for {remote_path}", e)
+            return False
+        if r.status_code in (200, 204):
+            self._forget_listing(parent_of(str(remote_path)))
+            return True
+        return False
+
+    def download_file(
+        self,
+        remote_path,
+        local_path: Path,
+        *,
+        expected_size: int | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> Optional[Path]:
+        """Stream to `<name>.part` next to the target and rename it into place when complete.
+
+        Memory stays at one chunk however large the recording is. A `.part` left over
+        by an interrupted run is continued with a Range request instead of starting
+        again; with `expected_size` (the PROPFIND size) a short or overlong result is
+        rejected rather than handed to ffmpeg. The ETag the `.part` was started with is
+        kept next to it and sent as If-Range: a file replaced in the meantime comes
+        back whole (200) instead of being spliced onto the old bytes. A `.part` with
+        neither an ETag nor an expected size cannot be checked and is started again.
+
+        With a content cache, a file downloaded before is revalidated with its ETag
+        (If-None-Match): unchanged, the server answers 304 and the cached copy is used.
+        """
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        remote_path = str(remote_path).strip("/")
+        partial = partial_path(local_path)
+        offset = partial.stat().st_size if partial.exists() else 0
+        resume_etag = _read_partial_etag(local_path) if offset else None
+        if offset and ((expected_size and offset > expected_size) or (resume_etag is None and not expected_size)):
+            _drop_partial(local_path)
+            offset = 0
+
+        headers = {"Cache-Control": "no-cache"}
+        cached = self.contents.lookup(remote_path) if self.contents is not None and not offset else None
+        if cached is not None:
+            headers["If-None-Match"] = cached.etag
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            if resume_etag is not None:
+                headers["If-Range"] = resume_etag
+        try:
+            response = self.request("GET", remote_path, headers=headers, stream=True)
+        except requests.RequestException as e:
+            _report(f"GET failed for {remote_path}", e)
+            return None
+
+        try:
+            if cached is not None and response.status_code == 304:
+                materialized = self.contents.materialize(cached, local_path)
+                if materialized is not None:
+                    self.stats.record_not_modified(cached.size)
+                    return materialized
+                # The blob was damaged and is forgotten; this time without If-None-Match.
+                response.close()
+                return self.download_file(remote_path, local_path, expected_size=expected_size, progress=progress)
+            if offset and response.status_code == 416 and expected_size == offset:
+                finished = self._finish_download(partial, local_path, remote_path, expected_size)
+                partial_etag_path(local_path).unlink(missing_ok=True)
+                return finished
+            same_file = resume_etag is None or response.headers.get("ETag") == resume_etag
+            if response.status_code == 206 and offset and _range_start(response) == offset and same_file:
+                mode = "ab"
+            elif response.status_code == 200:
+                # No range support, a replaced file, or nothing to resume: from the beginning.
+                mode, offset = "wb", 0
+            elif response.status_code == 206 and offset and not same_file:
+                # The server ignored If-Range; the remaining bytes belong to another file.
+                response.close()
+                _drop_partial(local_path)
+                return self.download_file(
+                    remote_path, local_path, expected_size=expected_size, progress=progress
+                )
+            else:
+                if response.status_code == 416:
+                    _drop_partial(local_path)
+                _report(f"GET returned HTTP {response.status_code} for {remote_path}", None)
+                return None
+
+            total = expected_size or _content_total(response, offset)
+            done = offset
+            etag = response.headers.get("ETag")
+            digest = sha256_of(partial) if mode == "ab" else hashlib.sha256()
+            if mode == "wb":
+                _write_partial_etag(local_path, etag)
+            try:
+                with open(partial, mode) as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        done += len(chunk)
+                        if progress is not None:
+                            progress(done, total)
+            except requests.RequestException as e:
+                # The .part stays: the next pull continues from here.
+                _report(f"GET interrupted for {remote_path}", e)
+                return None
+        finally:
+            response.close()
+
+        finished = self._finish_download(partial, local_path, remote_path, expected_size)
+        if finished is not None or not partial.exists():
+            partial_etag_path(local_path).unlink(missing_ok=True)
+        if finished is not None and etag and self.contents is not None:
+            self.contents.store(remote_path, etag, finished, digest.hexdigest())
+        return finished
+
+    @staticmethod
+    def _finish_download(partial: Path, local_path: Path, remote_path, expected_size: int | None) -> Optional[Path]:
+        size = partial.stat().st_size if partial.exists() else 0
+        if expected_size and size != expected_size:
+            _report(f"GET delivered {size} of {expected_size} bytes for {remote_path}", None)
+            if size > expected_size:
+                partial.unlink()
+            return None
+        if size == 0:
+            partial.unlink(missing_ok=True)
+            return None
+        os.replace(partial, local_path)
+        return local_path
+
+    def list_directory(self, remote_path, *, refresh: bool = False) -> list[RemoteEntry]:
+        """Depth-1 listing, from the listing cache while it is fresh.
+
+        On a miss below NEXTCLOUD_BASE the whole tree is indexed in one request, so
+        the next lookups - other seasons, the team and chest folders - are free.
+        Without Depth infinity (see `index_tree`) a miss costs one Depth-1 request.
+        `refresh` skips the cache and replaces its entry.
+        """
+        remote_path = str(remote_path).strip("/")
+        if self.listings is not None and not refresh:
+            cached = self.listings.get(remote_path)
+            if cached is not None:
+                self.stats.record_saved("PROPFIND")
+                return [entry_from_dict(item) for item in cached]
+            base = NEXTCLOUD_BASE.as_posix()
+            if remote_path == base or remote_path.startswith(f"{base}/"):
+                self.index_tree(base)
+                cached = self.listings.get(remote_path)
+                if cached is not None:
+                    return [entry_from_dict(item) for item in cached]
+
+        entries = self._propfind(remote_path, depth="1")
+        if entries is None:
+            return []
+        if self.listings is not None:
+            self.listings.put(remote_path, [entry_to_dict(entry) for entry in entries])
+        return entries
+
+    def index_tree(self, root: str | None = None) -> bool:
+        """One recursive PROPFIND of `root` (default: NEXTCLOUD_BASE) into the listing cache.
+
+        Servers that refuse Depth infinity, or quietly answer it with Depth 1 as
+        sabre/dav does unless told otherwise, are not walked folder by folder - that
+        would cost a request per folder after every TTL. The refusal is remembered,
+        a Depth-1 answer is kept for `root` alone, and False sends the caller back to
+        a single Depth-1 PROPFIND of the folder it wanted.
+        """
+        if self.listings is None or self.depth_infinity_refused:
+            return False
+        root = (root or NEXTCLOUD_BASE.as_posix()).strip("/")
+        entries = self._propfind(root, depth="infinity", quiet=True)
+        if entries is None:
+            self.depth_infinity_refused = True
+            return False
+
+        listed_below = {parent_of(entry.path) for entry in entries}
+        undescribed = [entry for entry in entries if entry.is_dir and entry.path not in listed_below]
+        if undescribed and all(parent_of(entry.path) == root for entry in entries):
+            self.depth_infinity_refused = True
+            self.listings.put(root, [entry_to_dict(entry) for entry in entries])
+            return False
+
+        self.listings.put_tree(root, [entry_to_dict(entry) for entry in entries])
+        return True
+
+    def _propfind(self, remote_path: str, *, depth: str, quiet: bool = False) -> list[RemoteEntry] | None:
+        try:
+            response = self.request(
+                "PROPFIND",
+                remote_path,
+                headers={"Depth": depth, "Content-Type": "application/xml"},
+                data=PROPFIND_BODY.encode("utf-8"),
+            )
+        except requests.RequestException as e:
+            _report(f"PROPFIND failed for {remote_path}", e)
+            return None
+
+        if response.status_code != 207:
+            if not quiet:
+                _report(f"PROPFIND returned HTTP {response.status_code} for {remote_path}", None)
+            return None
+
+        try:
+            entries = _parse_propfind(response.content, base=remote_path, prefix=self._root_prefix())
+        except ElementTree.ParseError as e:
+            _report(f"PROPFIND returned unparsable XML for {remote_path}", e)
+            return None
+
+        self.dirs.add(remote_path, *(entry.path for entry in entries if entry.is_dir))
+        return entries
+
+    def _forget_listing(self, remote_dir: str) -> None:
+        if self.listings is not None:
+            self.listings.invalidate(remote_dir)
+
+    def ensure_remote_dirs(self, remote_path: str) -> None:
+        """MKCOL the parent folders of `remote_path` that are not known to exist.
+
+        Only the part below the deepest known folder is created - usually nothing,
+        since an upload lands in the same season folder as the one before.
+        """
+        parent = parent_of(remote_path)
+        todo = self.dirs.missing(parent)
+        self.stats.record_saved("MKCOL", len(parent.split("/")) - len(todo) if parent else 0)
+        for remote_dir in todo:
+            response = self.request("MKCOL", remote_dir)
+            # 405: already there. Anything else is left to the PUT to report.
+            if response.status_code in (201, 405):
+                self.dirs.add(remote_dir)
+
+    def _root_prefix(self) -> str:
+        url = self.url("")
+        return url.split("://", 1)[-1].split("/", 1)[-1]
+
+
+_client: WebDavClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> WebDavClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WebDavClient(
+                dir_cache=RemoteDirCache.from_environment(),
+                content_cache=ContentCache.from_environment(),
+                listing_cache=ListingCache.from_environment(),
+            )
+            if os.environ.get(PROFILE_ENV):
+                atexit.register(_print_profile, _client)
+        return _client
+
+
+def _print_profile(client: WebDavClient) -> None:
+    print(client.stats.summary(), file=sys.stderr)
+
+
+def set_client(client: WebDavClient | None) -> WebDavClient | None:
+    """Swap the shared client (tests, benchmarks); returns the previous one."""
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    return previous
+
+
 def upload_file(local_path, remote_path, *, overwrite: bool = False) -> tuple[Optional[str], bool]:
     """
     Upload to Nextcloud.
@@ -77,97 +624,126 @@ def upload_file(local_path, remote_path, *, overwrite: bool = False) -> tuple[Op
     - overwrite=True: overwrite an existing file.
     Returns (url, created), where created is True only for a new file.
     """
-    user, password = NEXTCLOUD_AUTH
-    remote_path = str(remote_path).lstrip("/")
-    url = remote_url(remote_path)
+    return get_client().upload_file(local_path, remote_path, overwrite=overwrite)
 
-    try:
-        head = requests.head(url, auth=(user, password))
-        exists = head.status_code == 200
-    except requests.RequestException as e:
-        _report(f"HEAD failed for {remote_path}", e)
-        exists = False
 
-    if exists and not overwrite:
-        return url, False
+def delete_file(remote_path) -> bool:
+    return get_client().delete_file(remote_path)
+
 
-    _ensure_remote_dirs(remote_path)
+def download_file(
+    remote_path,
+    local_path: Path,
+    *,
+    expected_size: int | None = None,
+    progress: ProgressCallback | None = None,
+) -> Optional[Path]:
+    return get_client().download_file(remote_path, local_path, expected_size=expected_size, progress=progress)
 
-    with open(local_path, "rb") as f:
-        res = requests.put(url, auth=(user, password), data=f)
 
-    if res.status_code in (200, 201, 204):
-        return url, not exists
-    return None, False
+def cached_etag(remote_path) -> str | None:
+    """ETag of the copy the shared client last downloaded, if the content cache has it."""
+    contents = get_client().contents
+    return contents.etag_for(str(remote_path)) if contents is not None else None
 
 
-def delete_file(remote_path) -> bool:
-    user, password = NEXTCLOUD_AUTH
-    try:
-        r = requests.delete(remote_url(remote_path), auth=(user, password))
-    except requests.RequestException as e:
-        _report(f"DELETE failed for {remote_path}", e)
-        return False
-    return r.status_code in (200, 204)
+def etags_match(first: str | None, second: str | None) -> bool:
+    """PROPFIND and GET may quote an ETag differently or mark it weak; compare the value."""
+    def bare(etag: str) -> str:
+        return etag.strip().removeprefix("W/").strip('"')
+
+    return first is not None and second is not None and bare(first) == bare(second)
+
+
+def transfer_id(local_path, remote_path) -> str:
+    """Name of the chunked-upload folder: the same file to the same place gets the same one."""
+    stat = os.stat(local_path)
+    key = f"{str(remote_path).strip('/')}\0{stat.st_size}\0{stat.st_mtime_ns}"
+    return "hcr2-" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
 
+def chunk_name(number: int) -> str:
+    """Chunks are numbered from 1 (at most 10000); zero-padded so they sort either way."""
+    return f"{number:05d}"
 
-def download_file(remote_path, local_path: Path) -> Optional[Path]:
-    local_path.parent.mkdir(parents=True, exist_ok=True)
-    user, password = NEXTCLOUD_AUTH
+
+def partial_path(local_path: Path) -> Path:
+    return local_path.with_name(f"{local_path.name}.part")
+
+
+def partial_etag_path(local_path: Path) -> Path:
+    """The ETag of the file a `.part` was started from, for If-Range on resume."""
+    return local_path.with_name(f"{local_path.name}.part.etag")
+
+
+def _read_partial_etag(local_path: Path) -> str | None:
     try:
-        response = requests.get(
-            remote_url(remote_path),
-            auth=(user, password),
-            headers={"Cache-Control": "no-cache"},
-        )
-    except requests.RequestException as e:
-        _report(f"GET failed for {remote_path}", e)
+        return partial_etag_path(local_path).read_text(encoding="utf-8").strip() or None
+    except OSError:
         return None
 
-    if response.status_code != 200:
-        _report(f"GET returned HTTP {response.status_code} for {remote_path}", None)
-        return None
 
-    local_path.write_bytes(response.content)
-    return local_path if local_path.exists() and local_path.stat().st_size > 0 else None
+def _write_partial_etag(local_path: Path, etag: str | None) -> None:
+    # If-Range only takes a strong validator; without one the resume relies on the size.
+    path = partial_etag_path(local_path)
+    if etag and not etag.startswith("W/"):
+        path.write_text(etag, encoding="utf-8")
+    else:
+        path.unlink(missing_ok=True)
 
 
-def list_directory(remote_path) -> list[RemoteEntry]:
-    """List one remote collection (Depth 1). The collection itself is not returned."""
-    user, password = NEXTCLOUD_AUTH
-    remote_path = str(remote_path).strip("/")
+def _drop_partial(local_path: Path) -> None:
+    partial_path(local_path).unlink(missing_ok=True)
+    partial_etag_path(local_path).unlink(missing_ok=True)
+
+
+def _range_start(response: requests.Response) -> int | None:
+    """Start offset of a 206 answer: `Content-Range: bytes 1000-1999/2000`."""
+    raw = response.headers.get("Content-Range", "")
     try:
-        response = requests.request(
-            "PROPFIND",
-            remote_url(remote_path),
-            auth=(user, password),
-            headers={"Depth": "1", "Content-Type": "application/xml"},
-            data=PROPFIND_BODY.encode("utf-8"),
-        )
-    except requests.RequestException as e:
-        _report(f"PROPFIND failed for {remote_path}", e)
-        return []
+        return int(raw.split(" ", 1)[1].split("-", 1)[0])
+    except (IndexError, ValueError):
+        return None
 
-    if response.status_code != 207:
-        _report(f"PROPFIND returned HTTP {response.status_code} for {remote_path}", None)
-        return []
 
+def _content_total(response: requests.Response, offset: int) -> int | None:
     try:
-        return _parse_propfind(response.content, base=remote_path)
-    except ElementTree.ParseError as e:
-        _report(f"PROPFIND returned unparsable XML for {remote_path}", e)
-        return []
+        return offset + int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
 
 
-def _dav_root_prefix() -> str:
-    user, _ = NEXTCLOUD_AUTH
-    url = NEXTCLOUD_URL.format(user=user, path="")
-    return url.split("://", 1)[-1].split("/", 1)[-1]
+def list_directory(remote_path, *, refresh: bool = False) -> list[RemoteEntry]:
+    """List one remote collection (Depth 1). The collection itself is not returned."""
+    return get_client().list_directory(remote_path, refresh=refresh)
+
+
+def entry_to_dict(entry: RemoteEntry) -> dict:
+    return {
+        "name": entry.name,
+        "path": entry.path,
+        "size": entry.size,
+        "last_modified": entry.last_modified.isoformat() if entry.last_modified else None,
+        "is_dir": entry.is_dir,
+        "etag": entry.etag,
+    }
+
 
+def entry_from_dict(item: dict) -> RemoteEntry:
+    last_modified = item.get("last_modified")
+    return RemoteEntry(
+        name=item["name"],
+        path=item["path"],
+        size=int(item.get("size") or 0),
+        last_modified=datetime.fromisoformat(last_modified) if last_modified else None,
+        is_dir=bool(item.get("is_dir")),
+        etag=item.get("etag"),
+    )
 
-def _parse_propfind(payload: bytes, *, base: str) -> list[RemoteEntry]:
+
+def _parse_propfind(payload: bytes, *, base: str, prefix: str) -> list[RemoteEntry]:
     root = ElementTree.fromstring(payload)
-    prefix = _dav_root_prefix().strip("/")
+    prefix = prefix.strip("/")
     entries: list[RemoteEntry] = []
 
     for response in root.findall(f"{DAV_NS}response"):
@@ -188,6 +764,7 @@ def _parse_propfind(payload: bytes, *, base: str) -> list[RemoteEntry]:
                 size=_read_size(prop),
                 last_modified=_read_last_modified(prop),
                 is_dir=is_dir,
+                etag=(prop.findtext(f"{DAV_NS}getetag") or None) if prop is not None else None,
             )
         )
 
@@ -224,11 +801,3 @@ def _read_last_modified(prop) -> Optional[datetime]:
 def match_sheet_remote_path(season: int, filename: str) -> Path:
     return NEXTCLOUD_BASE / season_subpath(season) / filename
 
-
-def _ensure_remote_dirs(remote_path: str) -> None:
-    user, password = NEXTCLOUD_AUTH
-    current_path = ""
-    for part in remote_path.split("/")[:-1]:
-        current_path += f"/{part}"
-        requests.request("MKCOL", remote_url(current_path.lstrip("/")), auth=(user, password))
-
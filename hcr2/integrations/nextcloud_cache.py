@@ -0,0 +1,469 @@
+"""Local knowledge about the Nextcloud tree and its files, to save WebDAV round trips.
+
+Nothing here talks to the server: `nextcloud.WebDavClient` feeds these caches from
+the answers it already got and asks them before sending a request.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+
+# Collections are practically never deleted on the shared drive, but a day bounds
+# how long a removed folder can be believed in. A wrong belief costs one failed
+# PUT, after which the upload forgets the folder and creates it again.
+DIR_CACHE_TTL = 24 * 60 * 60
+DIR_CACHE_ENV = "HCR2_NEXTCLOUD_DIR_CACHE"   # optional JSON file shared between runs
+
+PROFILE_ENV = "HCR2_NEXTCLOUD_PROFILE"
+
+# Folder listings. Short, because a recording uploaded from a phone has to show up
+# in the next command; the video commands retry with --refresh when a file is not
+# there. The file lets consecutive CLI runs share one listing.
+LISTING_TTL = 60
+LISTING_TTL_ENV = "HCR2_NEXTCLOUD_LISTING_TTL"     # seconds, 0 disables the cache
+
+# Downloaded files by content, so an unchanged file costs one 304 and no transfer.
+CONTENT_CACHE_DIR = Path("tmp") / "nextcloud-cache"
+CONTENT_CACHE_ENV = "HCR2_NEXTCLOUD_CACHE_DIR"      # "off" disables the cache
+CONTENT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+CONTENT_CACHE_MAX_ENV = "HCR2_NEXTCLOUD_CACHE_MB"
+
+
+def parent_of(remote_path: str) -> str:
+    remote_path = remote_path.strip("/")
+    return remote_path.rsplit("/", 1)[0] if "/" in remote_path else ""
+
+
+class RemoteDirCache:
+    """Remote collections known to exist, each with the time it was last confirmed.
+
+    Fed by MKCOL answers (created, or already there), successful PROPFINDs and HEADs
+    of files. With `path` set the entries survive the process, which is what makes
+    the CLI - one process per command - profit too.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DIR_CACHE_TTL,
+        path: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._seen: dict[str, float] = {"": float("inf")}
+        if path is not None:
+            self._load()
+
+    @classmethod
+    def from_environment(cls) -> "RemoteDirCache":
+        raw = os.environ.get(DIR_CACHE_ENV, "").strip()
+        return cls(path=Path(raw) if raw else None)
+
+    def known(self, remote_dir: str) -> bool:
+        remote_dir = remote_dir.strip("/")
+        with self._lock:
+            seen = self._seen.get(remote_dir)
+            return seen is not None and self._clock() - seen < self.ttl
+
+    def add(self, *remote_dirs: str) -> None:
+        now = self._clock()
+        with self._lock:
+            for remote_dir in remote_dirs:
+                remote_dir = remote_dir.strip("/")
+                # A collection implies its ancestors.
+                while remote_dir:
+                    self._seen[remote_dir] = now
+                    remote_dir = parent_of(remote_dir)
+        self._save()
+
+    def discard(self, remote_dir: str) -> None:
+        remote_dir = remote_dir.strip("/")
+        if not remote_dir:
+            return
+        with self._lock:
+            for known in [d for d in self._seen if d == remote_dir or d.startswith(f"{remote_dir}/")]:
+                del self._seen[known]
+        self._save()
+
+    def missing(self, remote_dir: str) -> list[str]:
+        """The collections from the deepest known ancestor down, shallowest first."""
+        todo: list[str] = []
+        remote_dir = remote_dir.strip("/")
+        while remote_dir and not self.known(remote_dir):
+            todo.append(remote_dir)
+            remote_dir = parent_of(remote_dir)
+        return list(reversed(todo))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._seen = {"": float("inf")}
+        self._save()
+
+    def _load(self) -> None:
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict):
+            self._seen.update({str(k): float(v) for k, v in payload.items() if isinstance(v, (int, float))})
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            payload = {k: v for k, v in self._seen.items() if k}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError:
+            # A cache that cannot be written only costs the MKCOLs it would have saved.
+            pass
+
+
+class ListingCache:
+    """Depth-1 listings per remote folder, as plain dicts (see `nextcloud.entry_to_dict`).
+
+    `put_tree` files one recursive listing under every folder it contains, which is
+    how a single PROPFIND of the whole Power-Ladys-Scores tree answers the season,
+    team and chest lookups of the commands that follow it.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = LISTING_TTL,
+        path: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._listings: dict[str, tuple[float, list[dict]]] = {}
+        if path is not None:
+            self._load()
+
+    @classmethod
+    def from_environment(cls) -> "ListingCache | None":
+        try:
+            ttl = float(os.environ.get(LISTING_TTL_ENV, LISTING_TTL))
+        except ValueError:
+            ttl = LISTING_TTL
+        if ttl <= 0:
+            return None
+        contents = os.environ.get(CONTENT_CACHE_ENV, "").strip()
+        folder = Path(contents) if contents and contents.lower() != "off" else CONTENT_CACHE_DIR
+        return cls(ttl=ttl, path=folder / "listings.json")
+
+    def get(self, remote_dir: str) -> list[dict] | None:
+        remote_dir = remote_dir.strip("/")
+        with self._lock:
+            if self.path is not None:
+                self._load_locked()
+            cached = self._listings.get(remote_dir)
+        if cached is None or self._clock() - cached[0] >= self.ttl:
+            return None
+        return cached[1]
+
+    def put(self, remote_dir: str, entries: list[dict]) -> None:
+        with self._lock:
+            self._listings[remote_dir.strip("/")] = (self._clock(), entries)
+        self._save()
+
+    def put_tree(self, root: str, entries: list[dict]) -> None:
+        root = root.strip("/")
+        now = self._clock()
+        folders: dict[str, list[dict]] = {root: []}
+        folders.update({entry["path"]: [] for entry in entries if entry["is_dir"]})
+        for entry in entries:
+            parent = parent_of(entry["path"])
+            if parent in folders:
+                folders[parent].append(entry)
+        with self._lock:
+            self._listings.update({folder: (now, listed) for folder, listed in folders.items()})
+        self._save()
+
+    def invalidate(self, remote_dir: str) -> None:
+        remote_dir = remote_dir.strip("/")
+        with self._lock:
+            if self.path is not None:
+                self._load_locked()
+            self._listings.pop(remote_dir, None)
+        self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+        self._save()
+
+    def _load(self) -> None:
+        with self._lock:
+            self._load_locked()
+
+    def _load_locked(self) -> None:
+        # Another process (the bot creating a sheet) may have invalidated a folder.
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict):
+            self._listings = {
+                folder: (float(item[0]), list(item[1]))
+                for folder, item in payload.items()
+                if isinstance(item, list) and len(item) == 2
+            }
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            payload = {folder: [stamp, listed] for folder, (stamp, listed) in self._listings.items()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+
+class RequestStats:
+    """Requests sent per method, and requests a cache made unnecessary."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.sent: Counter[str] = Counter()
+        self.saved: Counter[str] = Counter()
+        self.bytes_not_transferred = 0
+
+    def record(self, method: str) -> None:
+        with self._lock:
+            self.sent[method] += 1
+
+    def record_saved(self, method: str, count: int = 1) -> None:
+        if count <= 0:
+            return
+        with self._lock:
+            self.saved[method] += count
+
+    def record_not_modified(self, size: int) -> None:
+        with self._lock:
+            self.bytes_not_transferred += size
+
+    def summary(self) -> str:
+        with self._lock:
+            sent = ", ".join(f"{method} {count}" for method, count in sorted(self.sent.items()))
+            saved = ", ".join(f"{method} {count}" for method, count in sorted(self.saved.items()))
+            total_sent, total_saved = sum(self.sent.values()), sum(self.saved.values())
+        line = f"nextcloud: {total_sent} request(s)" + (f" ({sent})" if sent else "")
+        line += f", {total_saved} saved by caches" + (f" ({saved})" if saved else "")
+        if self.bytes_not_transferred:
+            line += f", {self.bytes_not_transferred / (1024 * 1024):.1f} MB served from the local cache"
+        return line
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    remote_path: str
+    etag: str
+    sha256: str
+    size: int
+    blob: Path
+
+
+class ContentCache:
+    """Local copies of remote files, keyed by remote path and ETag.
+
+    Blobs are stored once per content (`blobs/<sha256>`) and copied to where the
+    caller wants the file. Not linked: callers save over their working copy
+    (openpyxl does, in place), and a shared inode would take the blob along. A
+    blob is checked against its SHA-256 while it is copied out, so a damaged one
+    is dropped instead of served. `index.json` maps each remote path to the ETag
+    and blob it was last downloaded as; the least recently used blobs go once the
+    total passes `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_bytes: int = CONTENT_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls) -> "ContentCache | None":
+        raw = os.environ.get(CONTENT_CACHE_ENV, "").strip()
+        if raw.lower() == "off":
+            return None
+        try:
+            max_bytes = int(os.environ[CONTENT_CACHE_MAX_ENV]) * 1024 * 1024
+        except (KeyError, ValueError):
+            max_bytes = CONTENT_CACHE_MAX_BYTES
+        return cls(Path(raw) if raw else CONTENT_CACHE_DIR, max_bytes=max_bytes)
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256
+
+    def lookup(self, remote_path: str) -> CachedFile | None:
+        remote_path = remote_path.strip("/")
+        with self._lock:
+            entry = self._read_index().get(remote_path)
+        if not entry:
+            return None
+        blob = self.blob_path(entry["sha256"])
+        if not blob.exists():
+            return None
+        return CachedFile(remote_path, entry["etag"], entry["sha256"], int(entry["size"]), blob)
+
+    def etag_for(self, remote_path: str) -> str | None:
+        cached = self.lookup(remote_path)
+        return cached.etag if cached else None
+
+    def materialize(self, cached: CachedFile, target: Path) -> Path | None:
+        """Put the cached content at `target` (after a 304) and mark it as used.
+
+        None when the blob no longer matches its SHA-256; the entry is forgotten,
+        so the caller's next request fetches the file whole.
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = target.with_name(f"{target.name}.{os.getpid()}.cache")
+        try:
+            intact = _copy_verified(cached.blob, staging, cached.sha256)
+        except OSError:
+            staging.unlink(missing_ok=True)
+            return None
+        if not intact:
+            staging.unlink(missing_ok=True)
+            self.forget(cached.remote_path)
+            return None
+        staging.replace(target)
+        self._touch(cached.remote_path)
+        return target
+
+    def forget(self, remote_path: str) -> None:
+        """Drops the entry and its blob, unless another path still holds the same content."""
+        remote_path = remote_path.strip("/")
+        with self._lock:
+            index = self._read_index()
+            entry = index.pop(remote_path, None)
+            if entry is None:
+                return
+            if not any(other["sha256"] == entry["sha256"] for other in index.values()):
+                self.blob_path(entry["sha256"]).unlink(missing_ok=True)
+            try:
+                self._write_index(index)
+            except OSError:
+                pass
+
+    def store(self, remote_path: str, etag: str, source: Path, sha256: str) -> None:
+        """Remember `source` (just downloaded, still in place) as `remote_path` at `etag`."""
+        remote_path = remote_path.strip("/")
+        blob = self.blob_path(sha256)
+        try:
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                staging = blob.with_name(f"{sha256}.{os.getpid()}.tmp")
+                shutil.copyfile(source, staging)
+                staging.replace(blob)
+            with self._lock:
+                index = self._read_index()
+                index[remote_path] = {
+                    "etag": etag,
+                    "sha256": sha256,
+                    "size": blob.stat().st_size,
+                    "used": self._clock(),
+                }
+                self._evict(index)
+                self._write_index(index)
+        except OSError:
+            # Caching is an optimisation; the download itself already succeeded.
+            pass
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(size for size, _ in self._blob_usage(self._read_index()).values())
+
+    def _touch(self, remote_path: str) -> None:
+        with self._lock:
+            index = self._read_index()
+            if remote_path in index:
+                index[remote_path]["used"] = self._clock()
+                try:
+                    self._write_index(index)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _blob_usage(index: dict) -> dict[str, tuple[int, float]]:
+        usage: dict[str, tuple[int, float]] = {}
+        for entry in index.values():
+            size, used = usage.get(entry["sha256"], (int(entry["size"]), 0.0))
+            usage[entry["sha256"]] = (size, max(used, float(entry["used"])))
+        return usage
+
+    def _evict(self, index: dict) -> None:
+        usage = self._blob_usage(index)
+        total = sum(size for size, _ in usage.values())
+        # Oldest first; the blob just stored is the newest and goes last, if at all.
+        for sha256, (size, _used) in sorted(usage.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            self.blob_path(sha256).unlink(missing_ok=True)
+            for remote_path in [path for path, entry in index.items() if entry["sha256"] == sha256]:
+                del index[remote_path]
+            total -= size
+
+    def _read_index(self) -> dict:
+        try:
+            payload = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return payload if isinstance(payload, dict) else {}
+
+    def _write_index(self, index: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.index_path.with_name(f"index.{os.getpid()}.tmp")
+        staging.write_text(json.dumps(index, indent=1, sort_keys=True), encoding="utf-8")
+        staging.replace(self.index_path)
+
+
+def sha256_of(path: Path, *, chunk_size: int = 1024 * 1024) -> "hashlib._Hash":
+    """A running hash over an existing file, to continue over appended chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest
+
+
+def _copy_verified(source: Path, target: Path, sha256: str, *, chunk_size: int = 1024 * 1024) -> bool:
+    """Copies `source` to `target` in one read, hashing on the way; False on a mismatch."""
+    digest = hashlib.sha256()
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        for chunk in iter(lambda: src.read(chunk_size), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    return digest.hexdigest() == sha256
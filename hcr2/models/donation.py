@@ -8,6 +8,8 @@ class DonationEntry:
     id: int | None
     date: str
     total: int
+    # Increase over the previous snapshot when the query already computed it.
+    delta: int | None = None
 
 
 @dataclass(frozen=True)
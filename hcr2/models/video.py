@@ -13,6 +13,7 @@ class VideoCandidate:
     remote_path: str
     size: int
     last_modified: datetime | None
+    etag: str | None = None
 
 
 @dataclass(frozen=True)
@@ -73,6 +74,35 @@ class PullOutcome:
     season: int | None = None
 
 
+@dataclass(frozen=True)
+class VideoInfo:
+    """What ffmpeg reports about a recording; None where it could not tell."""
+
+    duration: float | None
+    width: int | None
+    height: int | None
+
+
+@dataclass(frozen=True)
+class VideoFrame:
+    """One decoded frame, row by row: 8-bit gray (channels=1) or RGB (channels=3)."""
+
+    index: int
+    width: int
+    height: int
+    channels: int
+    pixels: bytes
+
+
+@dataclass(frozen=True)
+class FrameRecord:
+    """One kept frame as listed in frames.json; `file` is None when no JPEGs were written."""
+
+    file: str | None
+    time: float | None = None
+    hash: int | None = None
+
+
 @dataclass(frozen=True)
 class FramesOutcome:
     status: str
@@ -80,6 +110,30 @@ class FramesOutcome:
     frame_count: int = 0
     pull: PullOutcome | None = None
     detail: str = ""
+    mode: str = "fps"
+    dropped: int = 0
+    jobs: int = 1
+    crop: str | None = None
+    # "saved" or "detected" for a crop found by --crop auto, "undetected" when none was found.
+    crop_note: str = ""
+    # Whether the frames were written as JPEGs (--jpeg) or only listed in frames.json.
+    images: bool = False
+
+
+@dataclass(frozen=True)
+class StitchOutcome:
+    status: str
+    out_dir: Path | None = None
+    tiles: list[Path] = field(default_factory=list)
+    height: int = 0
+    frames: int = 0
+    # Frames that showed nothing new, and frames that did not line up with the one before.
+    skipped: int = 0
+    breaks: int = 0
+    pull: PullOutcome | None = None
+    detail: str = ""
+    crop: str | None = None
+    crop_note: str = ""
 
 
 @dataclass(frozen=True)
@@ -94,3 +148,44 @@ class ApplyOutcome:
     changed: int = 0
     failed: int = 0
     score_updated: bool = False
+
+
+@dataclass(frozen=True)
+class VideoJob:
+    """One recording in the `video_job` queue and the last pipeline stage it finished."""
+
+    id: int
+    kind: str
+    key: str
+    name: str
+    remote_path: str
+    stage: str
+    size: int | None = None
+    etag: str | None = None
+    match_id: int | None = None
+    year: int | None = None
+    week: int | None = None
+    attempts: int = 0
+    error: str | None = None
+    updated_at: str | None = None
+
+
+@dataclass(frozen=True)
+class JobRun:
+    """What one worker pass did with a job: the stage it reached and whether it got stuck."""
+
+    job: VideoJob
+    stage: str
+    status: str
+    detail: str = ""
+    frames: int = 0
+
+
+@dataclass(frozen=True)
+class WorkerOutcome:
+    status: str
+    # Recordings that were new to the queue or replaced since they were queued.
+    queued: int = 0
+    # Video files no match, week or team screen could be found for.
+    unmatched: list[str] = field(default_factory=list)
+    runs: list[JobRun] = field(default_factory=list)
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from hcr2.services.sheets import DonationImportResult, MatchSheetApplyResult, PlayerImportResult
+from hcr2.services.sheets import (
+    DonationImportResult,
+    MatchSheetApplyResult,
+    PlayerImportResult,
+    SeasonSheetsExportOutcome,
+)
 
 
 def print_exported_workbook(label: str, web_url: str, created: bool) -> None:
@@ -11,6 +16,39 @@ def print_match_sheet_link_created(markdown_link: str, created: bool) -> None:
     print(f"✅ {markdown_link} ({'Created' if created else 'Already existed'})")
 
 
+SEASON_SHEET_STATUS = {
+    "CREATED": "Created",
+    "EXISTS": "Already existed",
+    "UPLOAD_FAILED": "Upload failed",
+}
+
+
+def print_season_sheets_result(outcome: SeasonSheetsExportOutcome) -> None:
+    """One line per file, then the totals - a failed upload must not hide in a count."""
+    web_url = outcome.web_url or ""
+    for item in outcome.files:
+        label = SEASON_SHEET_STATUS.get(item.status, item.status)
+        prefix = "❌" if item.status == "UPLOAD_FAILED" else "✅"
+        error = f": {item.error}" if item.error else ""
+        print(f"{prefix} [{item.filename}]({web_url}) ({label}{error})")
+
+    created = sum(1 for item in outcome.files if item.status == "CREATED")
+    existed = sum(1 for item in outcome.files if item.status == "EXISTS")
+    failed = sum(1 for item in outcome.files if item.status == "UPLOAD_FAILED")
+    print(
+        f"Season {outcome.season}: {len(outcome.files)} sheet(s), "
+        f"{created} created, {existed} already existed, {failed} failed"
+    )
+
+
+def print_no_season_matches(season: int) -> None:
+    print(f"❌ No matches found for season {season}.")
+
+
+def print_invalid_season() -> None:
+    print("❌ Season must be an integer.")
+
+
 def print_match_import_result(filename: str, web_url: str, result: MatchSheetApplyResult) -> None:
     status = "Changed" if result.changed > 0 else "Unchanged"
     score_status = "Score updated" if result.score_updated else "Score update failed"
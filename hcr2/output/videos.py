@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import sys
+from collections.abc import Callable, Sequence
 
 from hcr2.models.video import (
     ApplyOutcome,
     FramesOutcome,
+    JobRun,
     PullOutcome,
     ReviewNote,
     RosterPlayer,
+    StitchOutcome,
     VideoCandidate,
+    VideoJob,
+    WorkerOutcome,
 )
 from hcr2.output.tables import print_table
 from hcr2.services.videos import matches_match_id
@@ -44,6 +49,30 @@ def print_download_failed(name: str) -> None:
     print(f"❌ Download of '{name}' failed")
 
 
+def download_progress(stream=None) -> Callable[[int, int | None], None] | None:
+    """A percentage line redrawn in place, for an interactive terminal only.
+
+    When stderr is not a TTY (the bot runs the CLI and forwards stderr) it returns
+    None, so nothing is printed and no callback overhead is paid.
+    """
+    stream = stream or sys.stderr
+    if not stream.isatty():
+        return None
+    shown = {"percent": -1}
+
+    def report(done: int, total: int | None) -> None:
+        percent = int(done * 100 / total) if total else None
+        if percent is not None and percent == shown["percent"]:
+            return
+        shown["percent"] = percent if percent is not None else -1
+        amount = f"{_mb(done)} / {_mb(total)}" if total else _mb(done)
+        prefix = f"{percent:3d}% " if percent is not None else ""
+        end = "\n" if total and done >= total else ""
+        print(f"\r⬇️  {prefix}{amount}", end=end, file=stream, flush=True)
+
+    return report
+
+
 def print_candidates(candidates: Sequence[VideoCandidate]) -> None:
     if not candidates:
         return
@@ -94,7 +123,39 @@ def print_frames_outcome(outcome: FramesOutcome) -> None:
     if outcome.status == "NO_FRAMES":
         print(f"❌ ffmpeg produced no frames in {outcome.frame_dir}")
         return
-    print(f"✅ {outcome.frame_count} frames → {outcome.frame_dir}")
+    mode = " (one per scene change)" if outcome.mode == "scene" else ""
+    dropped = f", {outcome.dropped} near-duplicates dropped" if outcome.dropped else ""
+    jobs = f", {outcome.jobs} segments in parallel" if outcome.jobs > 1 else ""
+    cached = " (unchanged since the last run)" if outcome.status == "CACHED" else ""
+    print(f"✅ {outcome.frame_count} frames{mode}{dropped}{jobs} → {outcome.frame_dir}{cached}")
+    if not outcome.images:
+        print("   Listed in frames.json only; --jpeg writes them as images to read.")
+    _print_crop(outcome)
+
+
+def print_stitch_outcome(outcome: StitchOutcome) -> None:
+    if outcome.status in ("FFMPEG_MISSING", "FFMPEG_FAILED", "NO_FRAMES"):
+        print_frames_outcome(FramesOutcome(status=outcome.status, frame_dir=outcome.out_dir, detail=outcome.detail))
+        return
+    tiles = "1 image" if len(outcome.tiles) == 1 else f"{len(outcome.tiles)} images"
+    print(f"✅ {outcome.height} px of list from {outcome.frames} frames in {tiles} → {outcome.out_dir}")
+    for tile in outcome.tiles:
+        print(f"   {tile.name}")
+    _print_crop(outcome)
+    if outcome.breaks:
+        print(
+            f"⚠️  {outcome.breaks} frames did not line up with the one before and were added whole - "
+            "rows around them may appear twice (try a higher --fps)"
+        )
+
+
+def _print_crop(outcome: FramesOutcome | StitchOutcome) -> None:
+    if outcome.crop_note == "detected":
+        print(f"   cropped to the list region {outcome.crop} (detected, reused for the next videos of this kind)")
+    elif outcome.crop_note == "saved":
+        print(f"   cropped to the saved list region {outcome.crop} (--crop auto finds it again, --crop none skips it)")
+    elif outcome.crop_note == "undetected":
+        print("⚠️  no scrolling list region found - the frames are not cropped")
 
 
 def print_roster(match_id: int | None, roster: Sequence[RosterPlayer]) -> None:
@@ -196,6 +257,73 @@ def print_entry_table(outcome: ApplyOutcome) -> None:
     )
 
 
+def job_target(job: VideoJob) -> str:
+    if job.kind == "standings":
+        return f"match {job.match_id}"
+    if job.kind == "chest":
+        return f"chest {job.key}"
+    return "team screen"
+
+
+def job_next_step(job: VideoJob) -> str:
+    """What the job waits for, as the command that does it."""
+    if job.stage in ("queued", "pulled"):
+        return "video worker"
+    if job.stage == "extracted":
+        return "read the frames"
+    if job.stage == "read":
+        if job.kind == "standings":
+            return f"video apply --match {job.match_id}"
+        if job.kind == "chest":
+            return f"video chest apply --year {job.year} --week {job.week}"
+        return "video player apply"
+    return ""
+
+
+def print_jobs(jobs: Sequence[VideoJob]) -> None:
+    if not jobs:
+        print("No video jobs - `video worker` looks for new recordings.")
+        return
+    print_table(
+        headers=[f"{'ID':>4}", f"{'For':<16}", f"{'Video':<28}", f"{'Stage':<9}", "Next"],
+        rows=[
+            [
+                f"{job.id:>4}",
+                f"{job_target(job):<16}",
+                f"{job.name:<28}",
+                f"{job.stage:<9}",
+                f"⚠️  {job.error} (tried {job.attempts}x)" if job.error else job_next_step(job),
+            ]
+            for job in jobs
+        ],
+        width=80,
+    )
+
+
+def print_worker_outcome(outcome: WorkerOutcome) -> None:
+    if outcome.status == "FFMPEG_MISSING":
+        print(f"❌ ffmpeg not found - {FFMPEG_HINT}")
+        return
+    if outcome.queued:
+        print(f"🔎 {outcome.queued} new or replaced recording(s) queued")
+    if outcome.unmatched:
+        print(f"ℹ️  Not tied to a match, week or the team screen: {', '.join(outcome.unmatched)}")
+    if not outcome.runs:
+        print("Nothing to do - every job is extracted or waits for --retry (see `video jobs`).")
+        return
+    for run in outcome.runs:
+        print_job_run(run)
+
+
+def print_job_run(run: JobRun) -> None:
+    target = f"#{run.job.id} {job_target(run.job)} ({run.job.name})"
+    if run.status != "OK":
+        print(f"❌ {target}: stuck at {run.stage} - {run.detail}")
+        return
+    frames = f", {run.frames} frames" if run.frames else ""
+    print(f"✅ {target}: {run.stage}{frames}")
+
+
 def _mb(size: int) -> str:
     if not size:
         return "-"
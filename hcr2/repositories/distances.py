@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
+
 from hcr2.db.connection import connect_db, connect_dict_db
 from hcr2.models.distance import (
     DistanceEntry,
@@ -14,17 +16,33 @@ from hcr2.models.distance import (
 # missed week, short enough to still describe the current form.
 AVERAGE_WINDOW = 8
 
+# Monday of ISO week 1 in 2000; migration 0004 counts from the same day.
+_ORDINAL_EPOCH = date(2000, 1, 3)
+
+UPSERT_SQL = """
+    INSERT INTO distance (player_id, year, week, km, week_ordinal)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(player_id, year, week) DO UPDATE SET km = excluded.km, week_ordinal = excluded.week_ordinal
+"""
+
+
+def week_ordinal(year: int, week: int) -> int:
+    """Weeks since 2000-01-03, continuous across year ends (2025-W52 + 1 == 2026-W01)."""
+    january_4 = date(year, 1, 4)
+    monday = january_4 - timedelta(days=january_4.weekday()) + timedelta(weeks=week - 1)
+    return (monday - _ORDINAL_EPOCH).days // 7
+
 
 def upsert(player_id: int, *, year: int, week: int, km: int) -> None:
     with connect_db() as conn:
-        conn.execute(
-            """
-            INSERT INTO distance (player_id, year, week, km)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(player_id, year, week) DO UPDATE SET km = excluded.km
-            """,
-            (player_id, year, week, km),
-        )
+        conn.execute(UPSERT_SQL, (player_id, year, week, km, week_ordinal(year, week)))
+
+
+def upsert_week(year: int, week: int, rows: list[tuple[int, int]]) -> None:
+    """Stores a whole week of (player_id, km) in one transaction - all rows or none."""
+    ordinal = week_ordinal(year, week)
+    with connect_db() as conn:
+        conn.executemany(UPSERT_SQL, [(player_id, year, week, km, ordinal) for player_id, km in rows])
 
 
 def delete_entry(entry_id: int) -> int:
@@ -47,21 +65,31 @@ def latest_week() -> tuple[int, int] | None:
 
 
 def ranking(year: int, week: int) -> list[DistanceRankRow]:
+    """The week's rows, each with the player's average over their last entries up to it.
+
+    The frame counts rows, not calendar weeks - the same "last AVERAGE_WINDOW entries"
+    the profile shows - and is ordered by `week_ordinal`, so it runs across New Year.
+    """
     with connect_dict_db() as conn:
         rows = conn.execute(
-            """
-            SELECT d.player_id, p.name, d.km,
-                   (SELECT AVG(h.km) FROM distance h
-                     WHERE h.player_id = d.player_id
-                       AND (h.year * 100 + h.week) <= (d.year * 100 + d.week)
-                       AND (h.year * 100 + h.week) > (d.year * 100 + d.week) - ?) AS average,
-                   (SELECT COUNT(*) FROM distance h WHERE h.player_id = d.player_id) AS weeks
-            FROM distance d
-            JOIN players p ON p.id = d.player_id
-            WHERE d.year = ? AND d.week = ?
-            ORDER BY d.km DESC, p.name COLLATE NOCASE
+            f"""
+            WITH windowed AS (
+                SELECT player_id, year, week, km,
+                       AVG(km) OVER (
+                           PARTITION BY player_id ORDER BY week_ordinal
+                           ROWS {AVERAGE_WINDOW - 1} PRECEDING
+                       ) AS average,
+                       COUNT(*) OVER (PARTITION BY player_id) AS weeks
+                FROM distance
+                WHERE player_id IN (SELECT player_id FROM distance WHERE year = ? AND week = ?)
+            )
+            SELECT w.player_id, p.name, w.km, w.average, w.weeks
+            FROM windowed w
+            JOIN players p ON p.id = w.player_id
+            WHERE w.year = ? AND w.week = ?
+            ORDER BY w.km DESC, p.name COLLATE NOCASE
             """,
-            (AVERAGE_WINDOW, year, week),
+            (year, week, year, week),
         ).fetchall()
 
     return [
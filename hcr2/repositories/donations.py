@@ -73,18 +73,30 @@ def list_active_players() -> list[tuple[int, str]]:
         return cur.fetchall()
 
 
-def list_player_totals(player_id: int) -> list[DonationEntry]:
+def list_active_player_totals() -> dict[int, list[DonationEntry]]:
+    """Every snapshot of every active player with its increase, in one statement."""
     with connect_db() as conn:
         cur = conn.cursor()
         cur.execute(
             """
-            SELECT date, total FROM donation
-            WHERE player_id = ?
-            ORDER BY date ASC
-            """,
-            (player_id,),
+            SELECT
+                d.player_id,
+                d.date,
+                d.total,
+                COALESCE(
+                    d.total - LAG(d.total) OVER (PARTITION BY d.player_id ORDER BY d.date),
+                    0
+                ) AS delta
+            FROM donation d
+            JOIN players p ON p.id = d.player_id
+            WHERE p.active = 1
+            ORDER BY d.player_id, d.date
+            """
         )
-        return [DonationEntry(id=None, date=row[0], total=row[1]) for row in cur.fetchall()]
+        totals: dict[int, list[DonationEntry]] = {}
+        for player_id, date, total, delta in cur.fetchall():
+            totals.setdefault(player_id, []).append(DonationEntry(id=None, date=date, total=total, delta=delta))
+        return totals
 
 
 def get_latest_donation_date() -> str | None:
@@ -95,49 +107,42 @@ def get_latest_donation_date() -> str | None:
         return row[0] if row and row[0] is not None else None
 
 
-def list_active_plte_players() -> list[tuple[int, str]]:
-    with connect_db() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT id, name FROM players "
-            "WHERE active = 1 AND team = 'PLTE' "
-            "ORDER BY id"
-        )
-        return cur.fetchall()
-
+def list_donation_index_inputs(start_date: str, cutoff_date: str) -> list[tuple[int, str, int, int]]:
+    """(player_id, name, matches, latest_total) for every active PLTE player.
 
-def count_player_matches_between(player_id: int, start_date: str, cutoff_date: str) -> int:
+    Matches are counted between both dates, the total is the last snapshot on or
+    before the cutoff; players without either get 0.
+    """
     with connect_db() as conn:
         cur = conn.cursor()
         cur.execute(
             """
-            SELECT COUNT(DISTINCT m.id)
-            FROM match m
-            JOIN matchscore ms ON ms.match_id = m.id
-            WHERE ms.player_id = ?
-              AND DATE(m.start) >= DATE(?)
-              AND DATE(m.start) <= DATE(?)
+            WITH match_counts AS (
+                SELECT ms.player_id, COUNT(DISTINCT m.id) AS matches
+                FROM match m
+                JOIN matchscore ms ON ms.match_id = m.id
+                WHERE DATE(m.start) >= DATE(?)
+                  AND DATE(m.start) <= DATE(?)
+                GROUP BY ms.player_id
+            ),
+            latest AS (
+                SELECT
+                    player_id,
+                    total,
+                    ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY date DESC) AS rn
+                FROM donation
+                WHERE date <= ?
+            )
+            SELECT p.id, p.name, COALESCE(mc.matches, 0), COALESCE(l.total, 0)
+            FROM players p
+            LEFT JOIN match_counts mc ON mc.player_id = p.id
+            LEFT JOIN latest l ON l.player_id = p.id AND l.rn = 1
+            WHERE p.active = 1 AND p.team = 'PLTE'
+            ORDER BY p.id
             """,
-            (player_id, start_date, cutoff_date),
+            (start_date, cutoff_date, cutoff_date),
         )
-        row = cur.fetchone()
-        return row[0] if row and row[0] is not None else 0
-
-
-def get_player_latest_total(player_id: int, cutoff_date: str) -> int:
-    with connect_db() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT total FROM donation
-            WHERE player_id = ?
-              AND date <= ?
-            ORDER BY date DESC LIMIT 1
-            """,
-            (player_id, cutoff_date),
-        )
-        row = cur.fetchone()
-        return int(row[0]) if row and row[0] is not None else 0
+        return [(row[0], row[1], int(row[2]), int(row[3])) for row in cur.fetchall()]
 
 
 def list_donation_dates() -> list[DonationDateSummary]:
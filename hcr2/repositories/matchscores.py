@@ -20,12 +20,33 @@ def get_match_start(match_id: int) -> str | None:
         return row[0] if row else None
 
 
-def get_player_away_window(player_id: int) -> tuple[str | None, str | None] | None:
+def absent_flags_for_match(match_id: int, player_ids: list[int]) -> dict[int, int]:
+    """1 for each player with an `away_period` covering the match day, else 0.
+
+    One join for the whole roster. The windows are compared as text against the
+    match day, `away_from` before the next day and `away_until` from the day on,
+    which is the day-wise rule of `is_absent_on` and lets the (player_id,
+    away_from, away_until) index narrow the rows. No match or a start that is not
+    a date: nobody is absent.
+    """
+    unique_ids = sorted(set(player_ids))
+    if not unique_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in unique_ids)
     with connect_db() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT away_from, away_until FROM players WHERE id = ?", (player_id,))
-        row = cur.fetchone()
-        return (row[0], row[1]) if row else None
+        rows = conn.execute(
+            f"""
+            SELECT DISTINCT ap.player_id
+            FROM match m
+            JOIN away_period ap ON ap.player_id IN ({placeholders})
+            WHERE m.id = ?
+              AND (ap.away_from IS NULL OR ap.away_from < date(m.start, '+1 day'))
+              AND (ap.away_until IS NULL OR ap.away_until >= date(m.start))
+            """,
+            (*unique_ids, match_id),
+        ).fetchall()
+    absent = {row[0] for row in rows}
+    return {player_id: 1 if player_id in absent else 0 for player_id in unique_ids}
 
 
 def fetch_score_by_id(score_id: int) -> MatchScoreDetail | None:
@@ -150,6 +171,52 @@ def recent_scores(player_id: int, *, exclude_match_id: int, limit: int = 5) -> l
         return [int(row[0]) for row in cur.fetchall()]
 
 
+def recent_scores_by_player(
+    player_ids: list[int], *, exclude_match_id: int, limit: int = 5
+) -> dict[int, list[int]]:
+    """`recent_scores` for a whole roster in one query; players without a score are left out."""
+    unique_ids = sorted(set(player_ids))
+    if not unique_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in unique_ids)
+    with connect_db() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT player_id, score
+            FROM (
+                SELECT
+                    s.player_id,
+                    s.score,
+                    ROW_NUMBER() OVER (PARTITION BY s.player_id ORDER BY m.start DESC) AS position
+                FROM matchscore s
+                JOIN match m ON s.match_id = m.id
+                WHERE s.player_id IN ({placeholders}) AND s.match_id <> ? AND s.score > 0
+            )
+            WHERE position <= ?
+            ORDER BY player_id, position
+            """,
+            (*unique_ids, exclude_match_id, limit),
+        ).fetchall()
+    scores: dict[int, list[int]] = {}
+    for player_id, score in rows:
+        scores.setdefault(player_id, []).append(int(score))
+    return scores
+
+
+def players_who_have_driven(player_ids: list[int]) -> set[int]:
+    """`has_ever_driven` for a whole roster in one query."""
+    unique_ids = sorted(set(player_ids))
+    if not unique_ids:
+        return set()
+    placeholders = ", ".join("?" for _ in unique_ids)
+    with connect_db() as conn:
+        rows = conn.execute(
+            f"SELECT DISTINCT player_id FROM matchscore WHERE player_id IN ({placeholders}) AND score > 0",
+            unique_ids,
+        ).fetchall()
+    return {row[0] for row in rows}
+
+
 def has_ever_driven(player_id: int) -> bool:
     """Any scoring result at all, this match included.
 
@@ -182,7 +182,23 @@ def get_player_brief(player_id: int) -> PlayerBrief | None:
         return PlayerBrief(id=row["id"], name=row["name"], alias=row["alias"], discord_name=row["discord_name"])
 
 
+def get_player_names(player_ids: list[int]) -> dict[int, str]:
+    """Names of those ids that exist, in one query - for validating a whole import."""
+    unique_ids = sorted(set(player_ids))
+    if not unique_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in unique_ids)
+    with connect_dict_db() as conn:
+        rows = conn.execute(f"SELECT id, name FROM players WHERE id IN ({placeholders})", unique_ids).fetchall()
+    return {row["id"]: row["name"] for row in rows}
+
+
 def set_away(player_id: int, away_from: str, away_until: str) -> None:
+    """The current window on `players`, and the same window kept in `away_period`.
+
+    A window still running at `away_from` ends there and one starting later is
+    dropped, so the windows in the history follow one another instead of overlapping.
+    """
     with connect_dict_db() as conn:
         conn.execute(
             """
@@ -192,9 +208,15 @@ def set_away(player_id: int, away_from: str, away_until: str) -> None:
             """,
             (away_from, away_until, player_id),
         )
+        _end_away_periods(conn, player_id, away_from)
+        conn.execute(
+            "INSERT INTO away_period (player_id, away_from, away_until) VALUES (?, ?, ?)",
+            (player_id, away_from, away_until),
+        )
 
 
-def clear_away(player_id: int) -> None:
+def clear_away(player_id: int, back_at: str) -> None:
+    """Clears the current window; in `away_period` it ends at `back_at` instead."""
     with connect_dict_db() as conn:
         conn.execute(
             """
@@ -204,6 +226,21 @@ def clear_away(player_id: int) -> None:
             """,
             (player_id,),
         )
+        _end_away_periods(conn, player_id, back_at)
+
+
+def _end_away_periods(conn, player_id: int, at: str) -> None:
+    conn.execute(
+        """
+        UPDATE away_period
+           SET away_until = ?
+         WHERE player_id = ?
+           AND (away_from IS NULL OR away_from < ?)
+           AND (away_until IS NULL OR away_until > ?)
+        """,
+        (at, player_id, at, at),
+    )
+    conn.execute("DELETE FROM away_period WHERE player_id = ? AND away_from >= ?", (player_id, at))
 
 
 def list_leaders() -> list[PlayerLeaderRow]:
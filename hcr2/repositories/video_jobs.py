@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from hcr2.db.connection import connect_db, connect_dict_db
+from hcr2.models.video import VideoJob
+
+
+# Pipeline stages in order; `stage` holds the last one a job finished.
+STAGES = ("queued", "pulled", "extracted", "read", "applied")
+TEAM_KEY = "team"
+
+_COLUMNS = """
+    id, kind, job_key, name, remote_path, stage, size, etag, match_id, year, week,
+    attempts, error, updated_at
+"""
+
+
+def match_key(match_id: int) -> str:
+    return str(match_id)
+
+
+def chest_key(year: int, week: int) -> str:
+    return f"{year}-W{week:02d}"
+
+
+def queue_found(found: Sequence[VideoJob]) -> int:
+    """Adds recordings that are new, and sends those whose file changed - another name,
+    size or ETag under the same key - back to 'queued'. Returns how many were queued.
+
+    One transaction for the whole listing; ids and stages of `found` are ignored.
+    """
+    queued = 0
+    with connect_dict_db() as conn:
+        known = {
+            (row["kind"], row["job_key"]): row
+            for row in conn.execute("SELECT kind, job_key, name, size, etag FROM video_job").fetchall()
+        }
+        for job in found:
+            row = known.get((job.kind, job.key))
+            if row is None:
+                conn.execute(
+                    """
+                    INSERT INTO video_job (kind, job_key, name, remote_path, size, etag, match_id, year, week)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (job.kind, job.key, job.name, job.remote_path, job.size, job.etag, job.match_id, job.year, job.week),
+                )
+            elif _same_file(row, job):
+                continue
+            else:
+                conn.execute(
+                    """
+                    UPDATE video_job
+                    SET name = ?, remote_path = ?, size = ?, etag = ?, stage = 'queued', attempts = 0,
+                        error = NULL, claimed_at = NULL, updated_at = CURRENT_TIMESTAMP
+                    WHERE kind = ? AND job_key = ?
+                    """,
+                    (job.name, job.remote_path, job.size, job.etag, job.kind, job.key),
+                )
+            queued += 1
+    return queued
+
+
+def _same_file(row: dict, job: VideoJob) -> bool:
+    # A listing without ETags (or an older row without one) still compares by name and size.
+    etags = (row["etag"], job.etag)
+    return (row["name"], row["size"]) == (job.name, job.size) and (None in etags or etags[0] == etags[1])
+
+
+def claim_next(*, stale_after: int, max_attempts: int | None, skip: Sequence[int] = ()) -> VideoJob | None:
+    """The oldest open job nobody holds, marked as taken by the caller.
+
+    BEGIN IMMEDIATE takes the write lock before the SELECT, so two workers - threads
+    or processes - never claim the same row. A claim older than `stale_after`
+    seconds is free again. `skip` keeps a worker from retrying a job it already
+    failed on in the same run.
+    """
+    placeholders = ", ".join("?" for _ in skip)
+    with connect_dict_db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            f"""
+            SELECT {_COLUMNS}
+            FROM video_job
+            WHERE stage IN ('queued', 'pulled')
+              AND (claimed_at IS NULL OR claimed_at <= datetime('now', ?))
+              AND (? IS NULL OR attempts < ?)
+              {f"AND id NOT IN ({placeholders})" if skip else ""}
+            ORDER BY id
+            LIMIT 1
+            """,
+            (f"-{int(stale_after)} seconds", max_attempts, max_attempts, *skip),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE video_job SET claimed_at = CURRENT_TIMESTAMP, attempts = attempts + 1 WHERE id = ?",
+            (row["id"],),
+        )
+    return _job(row)
+
+
+def advance(job_id: int, stage: str) -> None:
+    with connect_db() as conn:
+        conn.execute(
+            "UPDATE video_job SET stage = ?, error = NULL, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (stage, job_id),
+        )
+
+
+def release(job_id: int, *, error: str | None = None) -> None:
+    """Gives a claimed job back: done for now, or stuck with `error` (attempts stay counted)."""
+    with connect_db() as conn:
+        if error is None:
+            conn.execute("UPDATE video_job SET claimed_at = NULL, attempts = 0, error = NULL WHERE id = ?", (job_id,))
+        else:
+            conn.execute(
+                "UPDATE video_job SET claimed_at = NULL, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (error, job_id),
+            )
+
+
+def set_stage(kind: str, key: str, stage: str) -> int:
+    """For the steps outside the worker: the readings file showing up, an apply."""
+    with connect_db() as conn:
+        return conn.execute(
+            """
+            UPDATE video_job SET stage = ?, error = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE kind = ? AND job_key = ?
+            """,
+            (stage, kind, key),
+        ).rowcount
+
+
+def reset_attempts() -> int:
+    """Makes jobs that ran out of attempts, or are held by a claim, eligible again."""
+    with connect_db() as conn:
+        return conn.execute(
+            "UPDATE video_job SET attempts = 0, claimed_at = NULL WHERE stage IN ('queued', 'pulled')"
+        ).rowcount
+
+
+def list_jobs(*, include_applied: bool = False, stage: str | None = None) -> list[VideoJob]:
+    conditions, params = [], []
+    if stage is not None:
+        conditions.append("stage = ?")
+        params.append(stage)
+    elif not include_applied:
+        conditions.append("stage != 'applied'")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    with connect_dict_db() as conn:
+        rows = conn.execute(f"SELECT {_COLUMNS} FROM video_job {where} ORDER BY id", params).fetchall()
+    return [_job(row) for row in rows]
+
+
+def _job(row: dict) -> VideoJob:
+    return VideoJob(
+        id=row["id"],
+        kind=row["kind"],
+        key=row["job_key"],
+        name=row["name"],
+        remote_path=row["remote_path"],
+        stage=row["stage"],
+        size=row["size"],
+        etag=row["etag"],
+        match_id=row["match_id"],
+        year=row["year"],
+        week=row["week"],
+        attempts=row["attempts"],
+        error=row["error"],
+        updated_at=row["updated_at"],
+    )
@@ -14,6 +14,7 @@ from pathlib import Path
 from hcr2.models.distance import DistanceHistoryRow, DistanceRankRow, DistanceWeek
 from hcr2.repositories import distances as distance_repo
 from hcr2.repositories import players as player_repo
+from hcr2.repositories import video_jobs as video_job_repo
 from hcr2.services import matchscores as matchscore_service
 
 
@@ -139,24 +140,27 @@ def import_week(
     if not 1 <= week <= 53:
         return ImportResult(status="ERRORS", year=year, week=week, errors=[f"week {week} is not a week number"])
 
+    names = player_repo.get_player_names(
+        [entry["pid"] for entry in entries if isinstance(entry.get("pid"), int)]
+    )
     for entry in entries:
         player_id = entry.get("pid")
         km = entry.get("km")
         if not isinstance(player_id, int) or not isinstance(km, int):
             errors.append(f"{entry.get('name') or '?'}: pid and km must be whole numbers")
             continue
-        brief = player_repo.get_player_brief(player_id)
-        if brief is None:
+        name = names.get(player_id)
+        if name is None:
             errors.append(f"player {player_id} does not exist")
             continue
         if player_id in seen:
-            errors.append(f"player {player_id} ({brief.name}) appears more than once")
+            errors.append(f"player {player_id} ({name}) appears more than once")
             continue
         if not 0 <= km <= MAX_KM:
-            errors.append(f"{brief.name} ({player_id}): {km} km outside 0..{MAX_KM}")
+            errors.append(f"{name} ({player_id}): {km} km outside 0..{MAX_KM}")
             continue
         seen.add(player_id)
-        resolved.append((player_id, brief.name, km))
+        resolved.append((player_id, name, km))
 
     if member_count is not None and member_count != len(entries):
         message = (
@@ -181,8 +185,8 @@ def import_week(
             status="DRY_RUN", year=year, week=week, imported=len(resolved), total=total, warnings=warnings
         )
 
-    for player_id, _, km in resolved:
-        distance_repo.upsert(player_id, year=year, week=week, km=km)
+    distance_repo.upsert_week(year, week, [(player_id, km) for player_id, _, km in resolved])
+    video_job_repo.set_stage("chest", video_job_repo.chest_key(year, week), "applied")
 
     return ImportResult(
         status="IMPORTED",
@@ -29,7 +29,7 @@ def calculate_stats(snapshots: list[DonationEntry]) -> DonationStats:
     parsed = []
     for snapshot in snapshots:
         dt = parse_date(snapshot.date)
-        parsed.append((dt, snapshot.id, snapshot.date, int(snapshot.total)))
+        parsed.append((dt, snapshot.id, snapshot.date, int(snapshot.total), snapshot.delta))
 
     if not parsed:
         return DonationStats(entries=[], last_total=0, total_donated=0, avg_monthly_increment=0.0)
@@ -40,8 +40,11 @@ def calculate_stats(snapshots: list[DonationEntry]) -> DonationStats:
     total_donated = 0
     prev_total = None
 
-    for _dt, donation_id, ds, total in parsed:
-        delta = 0 if prev_total is None else (total - prev_total)
+    for _dt, donation_id, ds, total, known_delta in parsed:
+        if known_delta is not None:
+            delta = int(known_delta)
+        else:
+            delta = 0 if prev_total is None else (total - prev_total)
         entries.append((donation_id, ds, total, delta))
         if prev_total is not None:
             total_donated += delta
@@ -50,7 +53,7 @@ def calculate_stats(snapshots: list[DonationEntry]) -> DonationStats:
     last_total = parsed[-1][3]
 
     month_last = {}
-    for dt, _donation_id, _ds, total in parsed:
+    for dt, _donation_id, _ds, total, _delta in parsed:
         key = f"{dt.year:04d}-{dt.month:02d}"
         if key not in month_last or dt > month_last[key][0]:
             month_last[key] = (dt, total)
@@ -69,7 +72,22 @@ def calculate_stats(snapshots: list[DonationEntry]) -> DonationStats:
     )
 
 
+def calculate_stats_by_player(
+    players: list[tuple[int, str]],
+    snapshots_by_player: dict[int, list[DonationEntry]],
+) -> list[tuple[int, str, DonationStats]]:
+    return [
+        (player_id, name, calculate_stats(snapshots_by_player.get(player_id, [])))
+        for player_id, name in players
+    ]
+
+
 def build_index_row(player_id: int, name: str, matches: int, total: int) -> DonationIndexRow:
     expected = matches * 600
     index = (total / expected) * 100 if expected > 0 else 0.0
     return DonationIndexRow(player_id=player_id, player_name=name, matches=matches, total=total, index=index)
+
+
+def build_index_rows(inputs: list[tuple[int, str, int, int]]) -> list[DonationIndexRow]:
+    """`inputs` as returned by `donation_repo.list_donation_index_inputs`."""
+    return [build_index_row(player_id, name, matches, total) for player_id, name, matches, total in inputs]
@@ -0,0 +1,278 @@
+"""Frame analysis for the video pipeline, in plain Python.
+
+Frames arrive decoded by ffmpeg, which the pipeline needs anyway, as a stream of
+uncompressed PGM/PPM images on its stdout, so nothing here depends on Pillow or
+NumPy. The work is kept to what a recording of a scrolling list needs: a perceptual
+hash to spot frames that show nothing new, the screen region the list scrolls in,
+and a manifest recording which frames were kept and when they were taken.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from hcr2.models.video import FrameRecord, VideoFrame
+
+
+T = TypeVar("T")
+
+# dHash over a (HASH_SIZE + 1) x HASH_SIZE thumbnail: 64 bits.
+HASH_SIZE = 8
+# Frames whose hash differs from the last kept frame in at most this many bits show
+# the same rows. A list scrolled by a row changes more than that.
+DEFAULT_DEDUPE_DISTANCE = 3
+
+MANIFEST_NAME = "frames.json"
+
+_PTS_TIME = re.compile(r"pts_time:\s*(-?[0-9.]+)")
+
+# PGM for one channel, PPM for RGB.
+PNM_MAGIC = {b"P5": 1, b"P6": 3}
+
+
+def read_pnm_frames(stream: BinaryIO) -> Iterator[VideoFrame]:
+    """Frames from ffmpeg's `-f image2pipe -c:v pgm|ppm` output, one at a time.
+
+    Every image carries its own size, so nothing has to be probed beforehand and a
+    crop or scale in the filter chain needs no arithmetic here. A stream that ends
+    inside a frame (ffmpeg failed or was stopped) simply ends the iteration.
+    """
+    index = 0
+    while True:
+        header = _read_pnm_header(stream)
+        if header is None:
+            return
+        width, height, channels = header
+        size = width * height * channels
+        pixels = stream.read(size)
+        if len(pixels) < size:
+            return
+        yield VideoFrame(index=index, width=width, height=height, channels=channels, pixels=pixels)
+        index += 1
+
+
+def _read_pnm_header(stream: BinaryIO) -> tuple[int, int, int] | None:
+    fields: list[bytes] = []
+    token = b""
+    while len(fields) < 4:
+        char = stream.read(1)
+        if not char:
+            return None
+        if char == b"#" and not token:
+            while char not in (b"\n", b""):
+                char = stream.read(1)
+            continue
+        if char.isspace():
+            if token:
+                fields.append(token)
+                token = b""
+            continue
+        token += char
+    # The single whitespace after maxval has been consumed by the loop above.
+    magic, width, height, maxval = fields
+    if magic not in PNM_MAGIC or maxval != b"255":
+        return None
+    return int(width), int(height), PNM_MAGIC[magic]
+
+
+def pnm_bytes(frame: VideoFrame) -> bytes:
+    """The frame as one PGM/PPM image again, e.g. to pipe into an encoder."""
+    magic = b"P6" if frame.channels == 3 else b"P5"
+    return magic + f"\n{frame.width} {frame.height}\n255\n".encode("ascii") + frame.pixels
+
+
+def frame_hash(frame: VideoFrame, *, size: int = HASH_SIZE) -> int:
+    return dhash(frame.pixels, frame.width, frame.height, size=size, channels=frame.channels)
+
+
+def shrink(pixels: bytes, width: int, height: int, columns: int, rows: int, *, channels: int = 1) -> list[float]:
+    """Block means of an 8-bit buffer, `columns` x `rows` of them, row by row.
+
+    Each block is estimated from a sample of its rows and columns, which is plenty
+    for a hash and keeps a 1600 px frame to a few hundred slice sums. Of an RGB
+    buffer only the green channel is read - it carries most of the luminance.
+    """
+    if (width, height) == (columns, rows) and channels == 1:
+        return [float(value) for value in pixels]
+    plane = 1 if channels == 3 else 0
+    stride = width * channels
+    cells: list[float] = []
+    for cell_y in range(rows):
+        top, bottom = cell_y * height // rows, max((cell_y + 1) * height // rows, cell_y * height // rows + 1)
+        lines = range(top, bottom, max(1, (bottom - top) // 8))
+        for cell_x in range(columns):
+            left, right = cell_x * width // columns, max((cell_x + 1) * width // columns, cell_x * width // columns + 1)
+            step = max(1, (right - left) // 32)
+            total = count = 0
+            for y in lines:
+                sample = pixels[y * stride + left * channels + plane:y * stride + right * channels:step * channels]
+                total += sum(sample)
+                count += len(sample)
+            cells.append(total / count if count else 0.0)
+    return cells
+
+
+def dhash(pixels: bytes, width: int, height: int, *, size: int = HASH_SIZE, channels: int = 1) -> int:
+    """Difference hash: one bit per horizontally adjacent pair of thumbnail cells,
+    set where the left one is brighter. Robust to compression noise and to small
+    brightness changes, sensitive to content moving."""
+    cells = shrink(pixels, width, height, size + 1, size, channels=channels)
+    bits = 0
+    for row in range(size):
+        base = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (cells[base + col] > cells[base + col + 1])
+    return bits
+
+
+def hamming(first: int, second: int) -> int:
+    return (first ^ second).bit_count()
+
+
+def drop_near_duplicates(
+    items: Iterable[T],
+    fingerprint: Callable[[T], int],
+    max_distance: int = DEFAULT_DEDUPE_DISTANCE,
+) -> Iterator[T]:
+    """The first item, then every item whose hash is more than `max_distance` bits
+    away from the last one kept. Comparing against the last kept item rather than the
+    immediate predecessor means a slow drift still produces a frame once it adds up."""
+    last: int | None = None
+    for item in items:
+        current = fingerprint(item)
+        if last is None or hamming(current, last) > max_distance:
+            last = current
+            yield item
+
+
+# Pixels whose gray value varies less than this (variance over the samples) are part
+# of the fixed screen furniture: status bar, header art, buttons.
+MIN_REGION_VARIANCE = 40.0
+# A region covering less of the screen height than this is not a list.
+MIN_REGION_SHARE = 0.2
+REGION_MARGIN = 4
+
+
+def detect_list_region(frames: Sequence[VideoFrame]) -> tuple[int, int, int, int] | None:
+    """(width, height, x, y) of the part of the screen that changes while the list
+    scrolls, in the order of ffmpeg's crop filter; None when nothing does.
+
+    Rows are scored by the temporal variance of their pixels across the sampled gray
+    frames and the largest band of moving rows wins - short still stretches inside it,
+    like the space between two list entries, do not split it. The columns are then
+    trimmed the same way within that band.
+    """
+    frames = [frame for frame in frames if frame.channels == 1]
+    if len(frames) < 2:
+        return None
+    width, height = frames[0].width, frames[0].height
+    frames = [frame for frame in frames if (frame.width, frame.height) == (width, height)]
+    if len(frames) < 2:
+        return None
+
+    row_step, column_step = 2, max(1, width // 160)
+    rows = {y: _variance(frames, y * width, (y + 1) * width, column_step) for y in range(0, height, row_step)}
+    band = _widest_band(rows, gap=max(8, height // 50))
+    if band is None or band[1] - band[0] < height * MIN_REGION_SHARE:
+        return None
+    top, bottom = band
+
+    columns = [0.0] * width
+    sampled = range(top, bottom, max(1, (bottom - top) // 64))
+    for y in sampled:
+        for x, value in enumerate(_variances(frames, y * width, (y + 1) * width, 1)):
+            columns[x] += value / len(sampled)
+    threshold = _threshold(columns)
+    moving = [x for x, value in enumerate(columns) if value >= threshold]
+    left, right = (moving[0], moving[-1] + 1) if moving else (0, width)
+
+    left, top = max(0, left - REGION_MARGIN), max(0, top - REGION_MARGIN)
+    right, bottom = min(width, right + REGION_MARGIN), min(height, bottom + REGION_MARGIN)
+    # Even sizes keep the cropped frames encodable as yuv420p.
+    return (right - left) // 2 * 2, (bottom - top) // 2 * 2, left, top
+
+
+def _variances(frames: Sequence[VideoFrame], start: int, stop: int, step: int) -> list[float]:
+    count = len(frames)
+    values = []
+    for series in zip(*(frame.pixels[start:stop:step] for frame in frames)):
+        mean = sum(series) / count
+        values.append(sum(value * value for value in series) / count - mean * mean)
+    return values
+
+
+def _variance(frames: Sequence[VideoFrame], start: int, stop: int, step: int) -> float:
+    values = _variances(frames, start, stop, step)
+    return sum(values) / len(values) if values else 0.0
+
+
+def _threshold(values: Iterable[float]) -> float:
+    return max(MIN_REGION_VARIANCE, 0.05 * max(values, default=0.0))
+
+
+def _widest_band(profile: dict[int, float], *, gap: int) -> tuple[int, int] | None:
+    """[first, last + 1) of the longest run of positions at or above the threshold,
+    runs separated by at most `gap` counting as one."""
+    threshold = _threshold(profile.values())
+    step = min((b - a for a, b in zip(profile, list(profile)[1:])), default=1)
+    best: tuple[int, int] | None = None
+    current: tuple[int, int] | None = None
+    for position, value in profile.items():
+        if value < threshold:
+            continue
+        if current is not None and position - current[1] <= gap:
+            current = (current[0], position + step)
+        else:
+            current = (position, position + step)
+        if best is None or current[1] - current[0] > best[1] - best[0]:
+            best = current
+    return best
+
+
+def crop_filter(region: tuple[int, int, int, int]) -> str:
+    return ":".join(str(value) for value in region)
+
+
+def parse_timecode(value: str | None) -> float | None:
+    """Seconds from `90`, `1:30`, `00:01:30.5` (what ffmpeg's -ss accepts); None if unreadable."""
+    if value is None or not str(value).strip():
+        return None
+    seconds = 0.0
+    try:
+        for part in str(value).strip().split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return None
+    return seconds
+
+
+def fps_times(count: int, fps: float, *, offset: float = 0.0) -> list[float]:
+    """Frame n of a fixed-rate extraction shows the video at offset + n / fps."""
+    return [round(offset + index / fps, 3) for index in range(count)]
+
+
+def logged_times(log: str, *, offset: float = 0.0) -> list[float]:
+    """Timestamps from ffmpeg's `metadata=print` output, one per frame that passed."""
+    return [round(offset + float(match), 3) for match in _PTS_TIME.findall(log)]
+
+
+def write_manifest(out_dir: Path, frames: Sequence[FrameRecord], **details) -> Path:
+    """`frames.json` next to the frames: what was kept, when it was taken, and how."""
+    path = out_dir / MANIFEST_NAME
+    payload = dict(details)
+    payload["frames"] = [
+        {"file": frame.file, "time": frame.time, "hash": f"{frame.hash:016x}" if frame.hash is not None else None}
+        for frame in frames
+    ]
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def load_manifest(out_dir: Path) -> dict | None:
+    try:
+        payload = json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
@@ -5,7 +5,7 @@ from typing import Literal
 
 from hcr2.models.matchscore import MatchScoreDetail, MatchScoreListRow, PlayerLookup
 from hcr2.repositories import matchscores as matchscore_repo
-from modules.common import is_absent_on, parse_int, parse_ymd
+from modules.common import parse_int
 
 
 AddStatus = Literal["CHANGED", "UNCHANGED", "INVALID_RANGE", "PLAYER_NOT_FOUND", "PLAYER_AMBIGUOUS"]
@@ -209,11 +209,5 @@ def edit_score(
 
 
 def compute_absent(match_id: int, player_id: int) -> int:
-    match_start = matchscore_repo.get_match_start(match_id)
-    if not match_start:
-        return 0
-    match_day = parse_ymd(match_start)
-    away_window = matchscore_repo.get_player_away_window(player_id)
-    if not away_window:
-        return 0
-    return 1 if is_absent_on(match_day, away_window[0], away_window[1]) else 0
+    """Away on the match day, by the windows the player had then (see `away_period`)."""
+    return matchscore_repo.absent_flags_for_match(match_id, [player_id])[player_id]
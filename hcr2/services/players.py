@@ -186,7 +186,7 @@ def set_away_for_player(player_id: int, *, days: int) -> AwaySetResult:
 
 
 def clear_away_for_player(player_id: int) -> AwayClearResult:
-    player_repo.clear_away(player_id)
+    player_repo.clear_away(player_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     return AwayClearResult(status="CLEARED", player_id=player_id, brief=player_repo.get_player_brief(player_id))
 
 
@@ -10,7 +10,11 @@ from __future__ import annotations
 
 import difflib
 import json
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterable
 
 from hcr2.models.roster import (
     PendingAddition,
@@ -21,6 +25,7 @@ from hcr2.models.roster import (
     RosterVideo,
 )
 from hcr2.repositories import players as player_repo
+from hcr2.repositories import video_jobs as video_job_repo
 from hcr2.services import players as player_service
 from hcr2.services.videos import TEAM_LOCAL_DIR, normalize_team_name
 
@@ -129,8 +134,17 @@ def _as_int(value) -> int | None:
 
 # -------------------- Matching --------------------
 
+@lru_cache(maxsize=8192)
+def _name_key(name: str) -> str:
+    """normalize_team_name, once per distinct name - the same names are compared over and over."""
+    return normalize_team_name(name)
+
+
 def _similarity(left: str, right: str) -> float:
-    left_key, right_key = normalize_team_name(left), normalize_team_name(right)
+    return _key_similarity(_name_key(left), _name_key(right))
+
+
+def _key_similarity(left_key: str, right_key: str) -> float:
     if not left_key or not right_key:
         return 0.0
     if left_key == right_key:
@@ -138,21 +152,103 @@ def _similarity(left: str, right: str) -> float:
     return difflib.SequenceMatcher(None, left_key, right_key).ratio()
 
 
+class NameIndex:
+    """Players by normalized name, so the matcher only scores the ones that can be close.
+
+    SequenceMatcher between a reading and all 600+ players ever stored is what the
+    matching used to cost. The index answers "who can reach this similarity" from
+    bounds that never undershoot, so the players it leaves out are exactly those the
+    full comparison would have dropped too:
+
+    - character postings: two names cannot have more characters in common than the
+      counts of each character allow, which caps their ratio (difflib's quick_ratio)
+    - trigram postings and the set of names: containment, either way round
+    - garage power, sorted: the GP window is a bisect
+
+    Whatever passes is scored exactly as before, in the original player order.
+    """
+
+    def __init__(self, players: Iterable) -> None:
+        self.players = list(players)
+        self.keys = [_name_key(player.name) for player in self.players]
+        self.by_key: dict[str, list[int]] = defaultdict(list)
+        self._chars: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._trigrams: dict[str, set[int]] = defaultdict(set)
+        for position, key in enumerate(self.keys):
+            if not key:
+                continue
+            self.by_key[key].append(position)
+            for char, count in Counter(key).items():
+                self._chars[char].append((position, count))
+            for trigram in _trigrams(key):
+                self._trigrams[trigram].add(position)
+        self._by_gp = sorted(
+            (player.garage_power, position) for position, player in enumerate(self.players)
+            if player.garage_power is not None
+        )
+
+    def bounds(self, key: str) -> dict[int, float]:
+        """An upper bound of the similarity to `key` per position sharing a character
+        with it; the others cannot score above 0."""
+        shared: dict[int, int] = defaultdict(int)
+        for char, count in Counter(key).items():
+            for position, stored in self._chars.get(char, ()):
+                shared[position] += min(count, stored)
+        return {
+            position: 2.0 * common / (len(key) + len(self.keys[position])) for position, common in shared.items()
+        }
+
+    def reachable(self, key: str, threshold: float) -> set[int]:
+        """Positions whose similarity to `key` may reach `threshold` (a superset)."""
+        return {position for position, bound in self.bounds(key).items() if bound >= threshold}
+
+    def containing(self, key: str, min_stem: int) -> set[int]:
+        """Positions whose key contains `key` or is contained in it, the shorter one
+        at least `min_stem` long (a superset for the longer-than-`key` side)."""
+        found: set[int] = set()
+        if len(key) >= min_stem:
+            postings = sorted((self._trigrams.get(trigram, set()) for trigram in _trigrams(key)), key=len)
+            if postings:
+                found.update(position for position in set.intersection(*postings) if key in self.keys[position])
+        for length in range(min_stem, len(key)):
+            for start in range(len(key) - length + 1):
+                found.update(self.by_key.get(key[start:start + length], ()))
+        return found
+
+    def near_garage_power(self, garage_power: int, window: float) -> set[int]:
+        spread = garage_power * window
+        low = bisect_left(self._by_gp, (garage_power - spread, -1))
+        high = bisect_right(self._by_gp, (garage_power + spread, len(self.players)))
+        return {position for _, position in self._by_gp[low:high]}
+
+
+def _trigrams(key: str) -> set[str]:
+    return {key[start:start + 3] for start in range(len(key) - 2)}
+
+
 def match_reading(reading: RosterReading, players) -> tuple[object | None, str]:
-    """Returns (player, how) - how in EXPLICIT / EXACT / FUZZY / AMBIGUOUS / NONE."""
+    """Returns (player, how) - how in EXPLICIT / EXACT / FUZZY / AMBIGUOUS / NONE.
+
+    `players` may be a NameIndex of them, to build it once for a whole screen."""
+    index = players if isinstance(players, NameIndex) else NameIndex(players)
     if reading.pid is not None:
-        return next((p for p in players if p.id == reading.pid), None), "EXPLICIT"
+        return next((p for p in index.players if p.id == reading.pid), None), "EXPLICIT"
 
-    scored = [(_similarity(reading.name, player.name), player) for player in players]
-    exact = [player for score, player in scored if score == 1.0]
+    key = _name_key(reading.name)
+    if not key:
+        return None, "NONE"
+    exact = index.by_key.get(key, [])
     if len(exact) == 1:
-        return exact[0], "EXACT"
+        return index.players[exact[0]], "EXACT"
     if len(exact) > 1:
         return None, "AMBIGUOUS"
 
-    close = [(score, player) for score, player in scored if score >= NAME_MATCH_SIMILARITY]
+    close = [
+        position for position in sorted(index.reachable(key, NAME_MATCH_SIMILARITY))
+        if _key_similarity(key, index.keys[position]) >= NAME_MATCH_SIMILARITY
+    ]
     if len(close) == 1:
-        return close[0][1], "FUZZY"
+        return index.players[close[0]], "FUZZY"
     if len(close) > 1:
         return None, "AMBIGUOUS"
     return None, "NONE"
@@ -161,19 +257,27 @@ def match_reading(reading: RosterReading, players) -> tuple[object | None, str]:
 def candidate_score(reading_name: str, player_name: str) -> float:
     """Containment beats the raw ratio: 'Bisa' inside 'BisaTheWise' is a shortened name,
     while three-letter leftovers score deceptively high on the ratio alone."""
-    similarity = _similarity(reading_name, player_name)
-    shorter, longer = sorted((normalize_team_name(reading_name), normalize_team_name(player_name)), key=len)
+    return _key_candidate_score(_name_key(reading_name), _name_key(player_name))
+
+
+def _key_candidate_score(reading_key: str, player_key: str) -> float:
+    similarity = _key_similarity(reading_key, player_key)
+    shorter, longer = sorted((reading_key, player_key), key=len)
     if len(shorter) >= CONTAINMENT_MIN_STEM and shorter and shorter in longer:
         return max(similarity, CONTAINMENT_SCORE)
     return similarity
 
 
-def find_candidates(reading: RosterReading, leaving=()) -> list[RosterCandidate]:
+def find_candidates(reading: RosterReading, leaving=(), *, index: NameIndex | None = None) -> list[RosterCandidate]:
     """Everyone who could be this person.
 
     The players who vanished from the video come first and unconditionally: one leaver
     plus one arrival is what a rename looks like from the outside, and that pairing is
     far more likely than a random return out of 600 former members.
+
+    `index` covers every stored player, ordered by name; without one it is built here.
+    Only the best CANDIDATE_LIMIT of them are kept, so they are scored in the order of
+    their upper bound until no bound left can beat the last of those.
     """
     leaving_ids = {player.id for player in leaving}
     candidates = [
@@ -189,11 +293,28 @@ def find_candidates(reading: RosterReading, leaving=()) -> list[RosterCandidate]
     ]
     candidates.sort(key=lambda c: (-c.similarity, abs(c.garage_power - reading.garage_power)))
 
-    scored: list[RosterCandidate] = []
-    for player in player_repo.list_players(sort_by="name"):
+    if index is None:
+        index = NameIndex(player_repo.list_players(sort_by="name"))
+    key = _name_key(reading.name)
+    bounds = index.bounds(key) if key else {}
+    for position in index.containing(key, CONTAINMENT_MIN_STEM) if key else ():
+        bounds[position] = max(bounds.get(position, 0.0), CONTAINMENT_SCORE)
+    near = index.near_garage_power(reading.garage_power, GP_CANDIDATE_WINDOW) if reading.garage_power > 0 else set()
+    order = sorted(
+        (position for position in bounds.keys() | near
+         if position in near or bounds[position] >= CANDIDATE_MIN_SIMILARITY),
+        key=lambda position: -bounds.get(position, 0.0),
+    )
+
+    # (-similarity, GP distance, position): the order of the full sort over everyone.
+    best: list[tuple[float, int, int, RosterCandidate]] = []
+    for position in order:
+        if len(best) == CANDIDATE_LIMIT and bounds.get(position, 0.0) < -best[-1][0]:
+            break
+        player = index.players[position]
         if player.id in leaving_ids:
             continue
-        similarity = candidate_score(reading.name, player.name)
+        similarity = _key_candidate_score(key, index.keys[position])
         close_gp = (
             reading.garage_power > 0
             and player.garage_power > 0
@@ -201,19 +322,18 @@ def find_candidates(reading: RosterReading, leaving=()) -> list[RosterCandidate]
         )
         if similarity < CANDIDATE_MIN_SIMILARITY and not close_gp:
             continue
-        scored.append(
-            RosterCandidate(
-                player_id=player.id,
-                name=player.name,
-                team=player.team,
-                active=player.active,
-                garage_power=player.garage_power,
-                similarity=similarity,
-            )
+        candidate = RosterCandidate(
+            player_id=player.id,
+            name=player.name,
+            team=player.team,
+            active=player.active,
+            garage_power=player.garage_power,
+            similarity=similarity,
         )
+        insort(best, (-similarity, abs(player.garage_power - reading.garage_power), position, candidate))
+        del best[CANDIDATE_LIMIT:]
 
-    scored.sort(key=lambda c: (-c.similarity, abs(c.garage_power - reading.garage_power)))
-    return candidates + scored[:CANDIDATE_LIMIT]
+    return candidates + [candidate for *_, candidate in best]
 
 
 # -------------------- Plan --------------------
@@ -243,6 +363,7 @@ def build_plan(video: RosterVideo, *, force: bool = False) -> RosterPlan:
 
     active = list(player_repo.list_players(active_only=True, team_filter="PLTE", sort_by="name"))
     by_id = {player.id: player for player in active}
+    active_index = NameIndex(active)
 
     changes: list[RosterChange] = []
     unmatched: list[RosterReading] = []
@@ -250,7 +371,7 @@ def build_plan(video: RosterVideo, *, force: bool = False) -> RosterPlan:
     unchanged = 0
 
     for reading in readings:
-        player, how = match_reading(reading, active)
+        player, how = match_reading(reading, active_index)
         if how == "AMBIGUOUS":
             errors.append(f"{reading.name}: matches more than one active player - set \"pid\" explicitly")
             continue
@@ -306,7 +427,13 @@ def build_plan(video: RosterVideo, *, force: bool = False) -> RosterPlan:
     # Leavers first, then the candidate lists - who vanished is the best hint for who appeared.
     claimed = matched_ids | {r.reactivate for r in unmatched if r.reactivate is not None}
     leavers = [player for player in active if player.id not in claimed]
-    pending = [_plan_addition(reading, leavers) for reading in unmatched]
+    # Everyone ever stored, read and indexed once for all the unknown names.
+    everyone = (
+        NameIndex(player_repo.list_players(sort_by="name"))
+        if any(r.reactivate is None and not r.new for r in unmatched)
+        else None
+    )
+    pending = [_plan_addition(reading, leavers, everyone) for reading in unmatched]
     if leavers and len(leavers) > max(1, int(len(active) * MAX_LEAVER_SHARE)):
         message = (
             f"{len(leavers)} of {len(active)} active players are missing from the video "
@@ -363,10 +490,10 @@ def build_plan(video: RosterVideo, *, force: bool = False) -> RosterPlan:
     )
 
 
-def _plan_addition(reading: RosterReading, leavers=()) -> PendingAddition:
+def _plan_addition(reading: RosterReading, leavers=(), index: NameIndex | None = None) -> PendingAddition:
     if reading.reactivate is not None or reading.new:
         return PendingAddition(reading=reading, candidates=[])
-    return PendingAddition(reading=reading, candidates=find_candidates(reading, leavers))
+    return PendingAddition(reading=reading, candidates=find_candidates(reading, leavers, index=index))
 
 
 def _changes_for_renamed(player, reading: RosterReading) -> list[RosterChange]:
@@ -401,6 +528,7 @@ def apply_plan(plan: RosterPlan, video: RosterVideo) -> RosterPlan:
     for change in plan.changes:
         reading = by_name.get(normalize_team_name(change.reading_name or change.name))
         applied.append(_apply_change(change, reading))
+    video_job_repo.set_stage("team", video_job_repo.TEAM_KEY, "applied")
 
     return RosterPlan(
         status="APPLIED",
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 import re
 import sqlite3
+import sys
 from pathlib import Path
 from typing import Any, Callable, Optional
 
@@ -69,6 +71,13 @@ class MatchExportData:
     players: list[tuple[int, str, str | None, str | None]]
 
 
+@dataclass(frozen=True)
+class SeasonExportData:
+    season: int
+    matches: list[tuple[int, str, int, str, str]]
+    players: list[tuple[int, str, str | None, str | None]]
+
+
 @dataclass(frozen=True)
 class PlayerWorkbookImportOutcome:
     status: str
@@ -101,6 +110,23 @@ class WorkbookExportOutcome:
     created: bool = False
 
 
+@dataclass(frozen=True)
+class SeasonSheetFile:
+    match_id: int
+    filename: str
+    status: str
+    # Exception type of a failed upload; the message may carry the account URL.
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class SeasonSheetsExportOutcome:
+    status: str
+    season: int
+    web_url: str | None = None
+    files: list[SeasonSheetFile] = field(default_factory=list)
+
+
 PlayerWorkbookReader = Callable[[Path], Any]
 DonationWorkbookReader = Callable[[Path], Any]
 MatchSheetWorkbookReader = Callable[[Path], Any]
@@ -119,6 +145,10 @@ DONATIONS_XLSX_NAME = "Donations.xlsx"
 DONATIONS_REMOTE_PATH = NEXTCLOUD_BASE / DONATIONS_DIR / DONATIONS_XLSX_NAME
 DONATIONS_LOCAL_TMP = Path("tmp") / DONATIONS_XLSX_NAME
 
+# Uploads go to the same Nextcloud box on the home network; a few in flight hide the
+# per-request latency without hammering it.
+SEASON_UPLOAD_WORKERS = 4
+
 
 def sanitize_filename(value: str) -> str:
     return re.sub(r"[^A-Za-z0-9_]", "", value.replace(" ", "_"))
@@ -296,6 +326,73 @@ def export_match_sheet(
     )
 
 
+def export_season_match_sheets(
+    db_path: str | Path,
+    season: int,
+    *,
+    output_path: Path,
+    workbook_builder: WorkbookBuilder,
+    workbook_saver: WorkbookSaver,
+    absent_checker: AbsentChecker,
+    max_workers: int = SEASON_UPLOAD_WORKERS,
+) -> SeasonSheetsExportOutcome:
+    """All match sheets of one season in one go.
+
+    The roster is ranked once for the whole season, the workbooks are built one after
+    the other (openpyxl is not worth sharing across threads) and only the uploads run
+    concurrently, since they spend their time waiting on Nextcloud.
+    """
+    export_data = get_season_export_data(db_path, season)
+    if export_data is None:
+        return SeasonSheetsExportOutcome(status="NO_MATCHES", season=season)
+
+    pending: list[tuple[int, str, Path]] = []
+
+    def upload(item: tuple[int, str, Path]) -> SeasonSheetFile:
+        match_id, filename, local_path = item
+        try:
+            url, created = upload_match_sheet(local_path, season, filename)
+        except Exception as e:
+            # One failed upload must not cost the results of the others.
+            _report_upload_failure(filename, e)
+            return SeasonSheetFile(
+                match_id=match_id, filename=filename, status="UPLOAD_FAILED", error=type(e).__name__
+            )
+        if url is None:
+            status = "UPLOAD_FAILED"
+        else:
+            status = "CREATED" if created else "EXISTS"
+        return SeasonSheetFile(match_id=match_id, filename=filename, status=status)
+
+    try:
+        for match in export_data.matches:
+            match_id, _, _, opponent, event = match
+            filename = match_sheet_filename(match_id, event, opponent)
+            local_path = match_sheet_local_path(output_path, season, filename)
+            # Listed before saving, so a save that fails halfway is cleaned up too.
+            pending.append((match_id, filename, local_path))
+            workbook = workbook_builder(match, export_data.players, is_absent_on=absent_checker)
+            workbook_saver(workbook, local_path)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            files = list(pool.map(upload, pending))
+    finally:
+        for _, _, local_path in pending:
+            delete_local_file(local_path)
+
+    return SeasonSheetsExportOutcome(
+        status="EXPORTED",
+        season=season,
+        web_url=scores_web_url(season),
+        files=files,
+    )
+
+
+def _report_upload_failure(filename: str, error: Exception) -> None:
+    # Type only, like nextcloud._report: the message carries the account URL.
+    print(f"sheets: upload failed for {filename}: {type(error).__name__}", file=sys.stderr)
+
+
 def import_players_workbook(
     db_path: str | Path,
     *,
@@ -569,6 +666,25 @@ def get_match_export_data(db_path: str | Path, match_id: int) -> MatchExportData
         return MatchExportData(match=match, players=players)
 
 
+def get_season_export_data(db_path: str | Path, season: int) -> SeasonExportData | None:
+    with db_connection.connect_path(db_path) as conn:
+        matches = _get_season_matches(conn, season)
+        if not matches:
+            return None
+        players = _rank_active_plte_for_season(conn, season) or _get_active_players(conn)
+        return SeasonExportData(season=season, matches=matches, players=players)
+
+
+DONATION_UPSERT_SQL = """
+    INSERT INTO donation (player_id, date, total)
+    VALUES (?, ?, ?)
+    ON CONFLICT(player_id, date) DO UPDATE SET total = excluded.total
+"""
+
+# Stays below SQLITE_MAX_VARIABLE_NUMBER of older SQLite builds (999).
+SQL_IN_CHUNK = 900
+
+
 def import_donation_entries(
     db_path: str | Path,
     date_str: str,
@@ -576,31 +692,83 @@ def import_donation_entries(
     *,
     initial_errors: int = 0,
 ) -> DonationImportResult:
-    added = 0
+    """Validate every row up front, then write all valid ones in one transaction.
+
+    The checks are the ones the schema would enforce row by row (player exists,
+    total present and not negative), and a rejected row is reported with the same
+    text SQLite would have produced, so the import report does not change.
+    """
     errors = initial_errors
     messages: list[str] = []
     if initial_errors:
         messages.append(f"{initial_errors} row(s) skipped while reading the workbook")
 
     with db_connection.connect_path(db_path) as conn:
+        known_ids = _existing_player_ids(conn, [player_id for player_id, _ in donation_entries])
+
+        rows: list[tuple[int, str, int]] = []
         for player_id, total in donation_entries:
-            try:
-                conn.execute(
-                    """
-                    INSERT INTO donation (player_id, date, total)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(player_id, date) DO UPDATE SET total = excluded.total
-                    """,
-                    (player_id, date_str, total),
-                )
-                added += 1
-            except (sqlite3.Error, ValueError, TypeError) as e:
+            problem = _donation_row_problem(player_id, total, known_ids)
+            if problem is not None:
                 errors += 1
-                messages.append(_import_failure("donation for player", player_id, e))
+                messages.append(_import_failure("donation for player", player_id, problem))
+                continue
+            rows.append((player_id, date_str, total))
+
+        try:
+            conn.executemany(DONATION_UPSERT_SQL, rows)
+            added = len(rows)
+        except (sqlite3.Error, ValueError, TypeError):
+            # Something the checks above do not know about: fall back to one row at a
+            # time, so the report still names the row instead of failing the batch.
+            conn.rollback()
+            added, row_errors, row_messages = _upsert_donations_one_by_one(conn, rows)
+            errors += row_errors
+            messages.extend(row_messages)
 
     return DonationImportResult(added=added, errors=errors, messages=messages)
 
 
+def _existing_player_ids(conn: sqlite3.Connection, player_ids: list[int]) -> set[int]:
+    wanted = sorted({player_id for player_id in player_ids if isinstance(player_id, int)})
+    found: set[int] = set()
+    for i in range(0, len(wanted), SQL_IN_CHUNK):
+        chunk = wanted[i:i + SQL_IN_CHUNK]
+        cur = conn.execute(
+            f"SELECT id FROM players WHERE id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        found.update(row[0] for row in cur.fetchall())
+    return found
+
+
+def _donation_row_problem(player_id, total, known_ids: set[int]) -> Exception | None:
+    if player_id not in known_ids:
+        return sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+    if total is None:
+        return sqlite3.IntegrityError("NOT NULL constraint failed: donation.total")
+    if isinstance(total, (int, float)) and total < 0:
+        return sqlite3.IntegrityError("CHECK constraint failed: total >= 0")
+    return None
+
+
+def _upsert_donations_one_by_one(
+    conn: sqlite3.Connection,
+    rows: list[tuple[int, str, int]],
+) -> tuple[int, int, list[str]]:
+    added = 0
+    errors = 0
+    messages: list[str] = []
+    for row in rows:
+        try:
+            conn.execute(DONATION_UPSERT_SQL, row)
+            added += 1
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            errors += 1
+            messages.append(_import_failure("donation for player", row[0], e))
+    return added, errors, messages
+
+
 def _import_failure(what: str, key, error: Exception) -> str:
     """One line per failed row - "4 errors" alone is not diagnosable."""
     return f"{what} {key if key is not None else '?'}: {type(error).__name__}: {error}"
@@ -842,6 +1010,18 @@ def _get_match_info(conn: sqlite3.Connection, match_id: int) -> tuple[int, str,
     return cur.fetchone()
 
 
+def _get_season_matches(conn: sqlite3.Connection, season_number: int) -> list[tuple[int, str, int, str, str]]:
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT m.id, m.start, m.season_number, m.opponent, e.name
+        FROM match m
+        JOIN teamevent e ON m.teamevent_id = e.id
+        WHERE m.season_number = ?
+        ORDER BY m.start, m.id
+    """, (season_number,))
+    return cur.fetchall()
+
+
 def _get_active_players(conn: sqlite3.Connection) -> list[tuple[int, str, str | None, str | None]]:
     cur = conn.cursor()
     cur.execute("""
@@ -0,0 +1,150 @@
+"""Scrolling frames -> one tall image of the list.
+
+A standings recording shows a list moving up through a fixed window. Consecutive
+frames overlap; how far the content moved between them is found by comparing row
+profiles (a few band means per pixel row) at every candidate offset - coarsely on
+blocks of rows first, then row by row around the best block. Only the rows that
+scrolled into view are appended, so every list row ends up in the image once.
+"""
+from __future__ import annotations
+
+from typing import Callable, Sequence
+
+from hcr2.models.video import VideoFrame
+
+
+# Column bands per row profile. One mean per row cannot tell two entries of the same
+# layout apart; the bands follow the text across the row.
+PROFILE_BANDS = 8
+COARSE_ROWS = 8
+# Consecutive frames must share at least this share of their height to be matched.
+MIN_OVERLAP_SHARE = 0.2
+# Mean absolute difference (8-bit gray) above which an offset is not a match but a cut.
+MAX_MATCH_COST = 12.0
+DEFAULT_TILE_HEIGHT = 4096
+
+# Called as write_tile(number, width, rows) with the RGB rows of one finished tile.
+TileWriter = Callable[[int, int, Sequence[bytes]], object]
+
+
+def row_profile(frame: VideoFrame) -> list[float]:
+    """PROFILE_BANDS gray means per row, row by row (green plane of an RGB frame)."""
+    channels, width = frame.channels, frame.width
+    plane = 1 if channels == 3 else 0
+    stride = width * channels
+    bounds = [(band * width // PROFILE_BANDS, (band + 1) * width // PROFILE_BANDS) for band in range(PROFILE_BANDS)]
+    step = max(1, width // (PROFILE_BANDS * 16))
+    profile: list[float] = []
+    for y in range(frame.height):
+        base = y * stride + plane
+        for left, right in bounds:
+            sample = frame.pixels[base + left * channels:y * stride + right * channels:step * channels]
+            profile.append(sum(sample) / len(sample) if sample else 0.0)
+    return profile
+
+
+def estimate_scroll(previous: Sequence[float], current: Sequence[float], height: int) -> tuple[int, float] | None:
+    """(rows the content moved up from `previous` to `current`, mean difference at that
+    offset), or None when no offset lines the two frames up.
+
+    Only upward movement counts - the list is read top to bottom; a frame that
+    scrolled back shows nothing new and matches at 0 or not at all.
+    """
+    min_overlap = max(1, int(height * MIN_OVERLAP_SHARE))
+    coarse_previous = _coarse(previous, height)
+    coarse_current = _coarse(current, height)
+    blocks = height // COARSE_ROWS
+    if blocks < 2:
+        candidates = range(0, height - min_overlap + 1)
+    else:
+        scores = [
+            (_cost(coarse_previous, coarse_current, blocks, shift, 1), shift)
+            for shift in range(0, blocks - max(1, min_overlap // COARSE_ROWS) + 1)
+        ]
+        best_block = min(scores)[1]
+        candidates = range(
+            max(0, (best_block - 1) * COARSE_ROWS), min(height - min_overlap, (best_block + 1) * COARSE_ROWS) + 1
+        )
+    cost, shift = min((_cost(previous, current, height, shift, 1), shift) for shift in candidates)
+    return (shift, cost) if cost <= MAX_MATCH_COST else None
+
+
+def _coarse(profile: Sequence[float], height: int) -> list[float]:
+    blocks = height // COARSE_ROWS
+    coarse = []
+    for block in range(blocks):
+        for band in range(PROFILE_BANDS):
+            total = sum(profile[(block * COARSE_ROWS + row) * PROFILE_BANDS + band] for row in range(COARSE_ROWS))
+            coarse.append(total / COARSE_ROWS)
+    return coarse
+
+
+def _cost(previous: Sequence[float], current: Sequence[float], rows: int, shift: int, step: int) -> float:
+    """Mean absolute difference between row y + shift of `previous` and row y of `current`."""
+    overlap = (rows - shift) * PROFILE_BANDS
+    if overlap <= 0:
+        return float("inf")
+    offset = shift * PROFILE_BANDS
+    total = sum(abs(a - b) for a, b in zip(previous[offset:offset + overlap:step], current[:overlap:step]))
+    return total / len(range(0, overlap, step))
+
+
+class Stitcher:
+    """Assembles frames into tiles of at most `tile_height` rows, handed to `write_tile`
+    as they fill up.
+
+    A frame that lines up with the one before contributes the rows that scrolled into
+    view - none if it did not move. One that does not line up (a cut, a jump, a
+    different screen) is appended whole and counted in `breaks`: a row read twice is
+    caught by the duplicate check, a row never written is lost.
+    """
+
+    def __init__(self, write_tile: TileWriter, *, tile_height: int = DEFAULT_TILE_HEIGHT) -> None:
+        self.write_tile = write_tile
+        self.tile_height = tile_height
+        self.frames = 0
+        self.skipped = 0
+        self.breaks = 0
+        self.height = 0
+        self.tiles = 0
+        self._width: int | None = None
+        self._rows: list[bytes] = []
+        self._previous: list[float] | None = None
+        self._previous_size: tuple[int, int] | None = None
+
+    def add(self, frame: VideoFrame) -> None:
+        self.frames += 1
+        profile = row_profile(frame)
+        stride = frame.width * frame.channels
+        rows = range(frame.height)
+        if self._previous is not None:
+            match = (
+                estimate_scroll(self._previous, profile, frame.height)
+                if self._previous_size == (frame.width, frame.height)
+                else None
+            )
+            if match is None:
+                self.breaks += 1
+            else:
+                rows = range(frame.height - match[0], frame.height)
+                if not rows:
+                    self.skipped += 1
+        self._previous, self._previous_size = profile, (frame.width, frame.height)
+
+        if rows and self._width is not None and self._width != frame.width:
+            self._flush()
+        self._width = frame.width
+        for y in rows:
+            self._rows.append(frame.pixels[y * stride:(y + 1) * stride])
+            self.height += 1
+            if len(self._rows) >= self.tile_height:
+                self._flush()
+
+    def finish(self) -> None:
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._rows and self._width is not None:
+            self.tiles += 1
+            self.write_tile(self.tiles, self._width, self._rows)
+        self._rows = []
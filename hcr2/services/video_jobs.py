@@ -0,0 +1,251 @@
+"""Video job queue: recordings found on Nextcloud are pulled and cut without being asked.
+
+Match, chest and team recordings used to go through `video pull` and `video frames`
+one at a time. The worker lists the season, chest and team folders (one indexed
+PROPFIND, see nextcloud.WebDavClient.index_tree), queues every recording it can tie
+to a match, a week or the team screen in `video_job`, and takes the open jobs in a
+few threads at once - downloads wait on the network and ffmpeg runs in its own
+process, so threads are enough.
+
+Every finished step is written down before the next one starts; a worker stopped
+halfway resumes at the stage it reached. Repeating a step is cheap anyway - a pull of
+a current copy is CACHED and `frames.json` answers an unchanged extraction - but the
+stage is what `video jobs` shows. Reading the frames stays with a person (or a chat
+client); a job is `read` once its readings file exists and `applied` after `video
+apply`, `video chest apply` or `video player apply` went through.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Callable
+
+from hcr2.integrations import nextcloud
+from hcr2.models.video import FramesOutcome, JobRun, PullOutcome, VideoCandidate, VideoJob, WorkerOutcome
+from hcr2.repositories import matches as match_repo
+from hcr2.repositories import seasons as season_repo
+from hcr2.repositories import video_jobs as video_job_repo
+from hcr2.services import distances as distance_service
+from hcr2.services import rosters as roster_service
+from hcr2.services import videos as video_service
+
+
+# Season folders looked at: the running season and the one before, for a match
+# recorded at the turn of the season.
+DISCOVER_SEASONS = 2
+DEFAULT_WORKERS = 2
+# A job that failed this many runs in a row waits for `video worker --retry`.
+MAX_ATTEMPTS = 3
+# Seconds after which a claim is taken to be left over from a worker that died.
+CLAIM_TIMEOUT = 30 * 60
+
+_LEADING_ID = re.compile(r"\d+")
+
+
+def discover(
+    *,
+    lister: video_service.Lister = nextcloud.list_directory,
+    refresh: bool = False,
+    today: date | None = None,
+) -> tuple[int, list[str]]:
+    """(recordings queued, video files that belong to nothing) for the season, chest
+    and team folders. Only the newest upload per match, week or team screen counts."""
+    found: list[VideoJob] = []
+    unmatched: list[str] = []
+
+    for season in season_repo.list_latest(DISCOVER_SEASONS):
+        match_ids = {match.id for match in match_repo.list_matches(season_number=season.number)}
+        taken: set[int] = set()
+        for candidate in video_service.list_candidates(season.number, lister=lister, refresh=refresh):
+            match_id = _match_id_of(candidate.name)
+            if match_id is None or match_id not in match_ids:
+                unmatched.append(candidate.name)
+            elif match_id not in taken:
+                taken.add(match_id)
+                found.append(_found("standings", video_job_repo.match_key(match_id), candidate, match_id=match_id))
+
+    year = (today or date.today()).isocalendar().year
+    weeks: set[int] = set()
+    for candidate in video_service.list_candidates_in(video_service.chest_folder(year), lister=lister, refresh=refresh):
+        week = video_service.week_of(candidate.name)
+        if week is None or not 1 <= week <= 53:
+            unmatched.append(candidate.name)
+        elif week not in weeks:
+            weeks.add(week)
+            found.append(_found("chest", video_job_repo.chest_key(year, week), candidate, year=year, week=week))
+
+    team = video_service.TEAM_VIDEO_NAME.lower()
+    for candidate in video_service.list_candidates_in(video_service.team_folder(), lister=lister, refresh=refresh):
+        if candidate.name.lower() == team:
+            found.append(_found("team", video_job_repo.TEAM_KEY, candidate))
+            break
+
+    return video_job_repo.queue_found(found), unmatched
+
+
+def _match_id_of(name: str) -> int | None:
+    """The match a recording is named after, by the rule of `matches_match_id`."""
+    leading = _LEADING_ID.match(name)
+    if leading is None:
+        return None
+    match_id = int(leading.group())
+    return match_id if video_service.matches_match_id(name, match_id) else None
+
+
+def _found(kind: str, key: str, candidate: VideoCandidate, **target) -> VideoJob:
+    return VideoJob(
+        id=0,
+        kind=kind,
+        key=key,
+        name=candidate.name,
+        remote_path=candidate.remote_path,
+        stage="queued",
+        size=candidate.size,
+        etag=candidate.etag,
+        **target,
+    )
+
+
+def readings_path(job: VideoJob) -> Path:
+    """Where the readings of the job's frames are expected, as the apply commands read them."""
+    if job.kind == "standings":
+        return video_service.results_path(job.match_id)
+    if job.kind == "chest":
+        return distance_service.chest_path(job.year, job.week)
+    return roster_service.roster_path()
+
+
+def note_readings() -> int:
+    """Moves extracted jobs whose readings file has appeared on to `read`."""
+    moved = 0
+    for job in video_job_repo.list_jobs(stage="extracted"):
+        if readings_path(job).exists():
+            moved += video_job_repo.set_stage(job.kind, job.key, "read")
+    return moved
+
+
+def list_queue(*, include_applied: bool = False) -> list[VideoJob]:
+    note_readings()
+    return video_job_repo.list_jobs(include_applied=include_applied)
+
+
+def run_worker(
+    *,
+    workers: int = DEFAULT_WORKERS,
+    retry: bool = False,
+    lister: video_service.Lister = nextcloud.list_directory,
+    downloader: video_service.Downloader = nextcloud.download_file,
+    refresh: bool = False,
+    spawner: video_service.Spawner | None = None,
+    ffmpeg_resolver: Callable[[], str | None] = video_service.resolve_ffmpeg,
+    today: date | None = None,
+) -> WorkerOutcome:
+    """Discover, then work through the open jobs with `workers` threads.
+
+    Each thread claims one job at a time (see `claim_next`), so a second worker
+    process running at the same time shares the queue instead of doubling it. A job
+    that fails is not tried again in the same run.
+    """
+    executable = ffmpeg_resolver()
+    if executable is None:
+        return WorkerOutcome(status="FFMPEG_MISSING")
+
+    queued, unmatched = discover(lister=lister, refresh=refresh, today=today)
+    note_readings()
+    if retry:
+        video_job_repo.reset_attempts()
+
+    failed: set[int] = set()
+    lock = threading.Lock()
+
+    def work() -> list[JobRun]:
+        runs: list[JobRun] = []
+        while True:
+            # Claims go one at a time anyway (BEGIN IMMEDIATE); under the lock the skip
+            # list cannot go stale between reading it and claiming.
+            with lock:
+                job = video_job_repo.claim_next(
+                    stale_after=CLAIM_TIMEOUT, max_attempts=MAX_ATTEMPTS, skip=tuple(failed)
+                )
+            if job is None:
+                return runs
+            run = _process(job, executable=executable, lister=lister, downloader=downloader, spawner=spawner)
+            if run.status != "OK":
+                # Skipped before it is released, or another thread would pick it up again.
+                with lock:
+                    failed.add(job.id)
+                    video_job_repo.release(job.id, error=run.detail)
+            else:
+                video_job_repo.release(job.id)
+            runs.append(run)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(work) for _ in range(max(1, workers))]
+        runs = sorted((run for future in futures for run in future.result()), key=lambda run: run.job.id)
+    return WorkerOutcome(status="OK", queued=queued, unmatched=unmatched, runs=runs)
+
+
+def _process(
+    job: VideoJob,
+    *,
+    executable: str,
+    lister: video_service.Lister,
+    downloader: video_service.Downloader,
+    spawner: video_service.Spawner | None,
+) -> JobRun:
+    stage = job.stage
+    try:
+        pull = _pull(job, lister=lister, downloader=downloader)
+        if pull.status not in ("OK", "CACHED"):
+            return _stuck(job, stage, f"pull: {pull.status}")
+        if stage == "queued":
+            stage = "pulled"
+            video_job_repo.advance(job.id, stage)
+
+        frames = _extract(job, executable=executable, lister=lister, downloader=downloader, spawner=spawner)
+        if frames.status not in ("OK", "CACHED"):
+            return _stuck(job, stage, f"frames: {frames.status} {frames.detail.splitlines()[0] if frames.detail else ''}")
+        stage = "extracted"
+        video_job_repo.advance(job.id, stage)
+        if readings_path(job).exists():
+            stage = "read"
+            video_job_repo.advance(job.id, stage)
+    except Exception as e:
+        # Whatever went wrong belongs to this job; the thread goes on with the next one.
+        return _stuck(job, stage, f"{type(e).__name__}: {e}")
+    return JobRun(job=job, stage=stage, status="OK", frames=frames.frame_count)
+
+
+def _stuck(job: VideoJob, stage: str, detail: str) -> JobRun:
+    return JobRun(job=job, stage=stage, status="FAILED", detail=detail.strip())
+
+
+def _pull(job: VideoJob, *, lister, downloader) -> PullOutcome:
+    if job.kind == "standings":
+        return video_service.pull_video(job.match_id, filename=job.name, lister=lister, downloader=downloader)
+    if job.kind == "chest":
+        return video_service.pull_chest_video(
+            job.year, job.week, filename=job.name, lister=lister, downloader=downloader
+        )
+    return video_service.pull_team_video(filename=job.name, lister=lister, downloader=downloader)
+
+
+def _extract(job: VideoJob, *, executable: str, lister, downloader, spawner) -> FramesOutcome:
+    """The default `video frames` run for the job, with the crop saved for its kind.
+    The frames are written as JPEGs: a person reads them next."""
+    options = dict(
+        keep_images=True,
+        filename=job.name,
+        lister=lister,
+        downloader=downloader,
+        spawner=spawner,
+        ffmpeg_resolver=lambda: executable,
+    )
+    if job.kind == "standings":
+        return video_service.extract_frames(job.match_id, **options)
+    if job.kind == "chest":
+        return video_service.extract_chest_frames(job.year, job.week, **options)
+    return video_service.extract_team_frames(**options)
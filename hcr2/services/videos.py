@@ -12,29 +12,43 @@ from __future__ import annotations
 
 import difflib
 import json
+import math
 import os
+import re
 import shutil
 import statistics
 import subprocess
+import tempfile
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Callable, Optional, Sequence
+from typing import BinaryIO, Callable, Optional, Protocol, Sequence
 
 from hcr2.integrations import nextcloud
+from hcr2.models.match import MatchDetail
 from hcr2.models.video import (
     ApplyOutcome,
+    FrameRecord,
     FramesOutcome,
     PullOutcome,
     ReviewNote,
     RosterPlayer,
+    StitchOutcome,
     VideoCandidate,
     VideoEntry,
+    VideoInfo,
     VideoResults,
 )
 from hcr2.repositories import matches as match_repo
 from hcr2.repositories import matchscores as matchscore_repo
 from hcr2.repositories import players as player_repo
+from hcr2.repositories import video_jobs as video_job_repo
+from hcr2.services import frames as frame_service
 from hcr2.services import matchscores as matchscore_service
+from hcr2.services import stitching
 from hcr2.timestamps import to_local
 
 
@@ -46,12 +60,68 @@ TEAM_LOCAL_DIR = LOCAL_VIDEO_ROOT / "team"
 CHEST_LOCAL_ROOT = LOCAL_VIDEO_ROOT / "chest"
 FRAME_PATTERN = "frame_%04d.jpg"
 FRAME_GLOB = "frame_*.jpg"
+# Frames travel between ffmpeg and Python uncompressed, as PGM (gray) or PPM (RGB).
+PIPE_CODECS = {"gray": "pgm", "rgb24": "ppm"}
+# Written by ffmpeg in scene mode: the timestamp of every frame it kept.
+SCENE_LOG = "scene.log"
+# With --jobs, every decoder works in a directory of its own until the frames are merged.
+SEGMENT_DIR = ".segment-%02d"
+SEGMENT_GLOB = ".segment-*"
+DEFAULT_JOBS = 1
+# Shorter pieces cost more in ffmpeg start-up and seeking than they save.
+MIN_SEGMENT_SECONDS = 10.0
+_DURATION = re.compile(r"Duration:\s*(\d+:\d+:\d+(?:\.\d+)?)")
+_VIDEO_SIZE = re.compile(r"Video:.*?\b(\d{2,5})x(\d{2,5})\b")
+_ROTATION = re.compile(r"rotat(?:e\s*:|ion of)\s*(-?[0-9.]+)")
+
+# --crop values besides w:h:x:y. Without --crop, the crop last detected for the
+# kind of video is used, as long as the recording has the same size.
+CROP_AUTO = "auto"
+CROP_NONE = "none"
+CROPS_NAME = "crops.json"
+# Frames looked at to find the list region, spread over the video.
+CROP_SAMPLES = 12
+
+# `video stitch` samples more often than `video frames`: consecutive frames have to overlap.
+STITCH_FPS = 4.0
+TILE_PATTERN = "standings_%02d.png"
+TILE_GLOB = "standings_*.png"
 
 DEFAULT_FPS = 1.0
 DEFAULT_WIDTH = 1600
 
+# "fps" samples at a fixed rate; "scene" keeps a frame only when the picture changed.
+FRAME_MODES = ("fps", "scene")
+DEFAULT_MODE = "fps"
+# ffmpeg's scene score runs from 0 to 1. A scrolling list moves by a row or two between
+# frames, far below the 0.3-0.4 of a cut, so the default sits low.
+DEFAULT_SCENE_THRESHOLD = 0.08
+# Seconds between two scene frames at least, so a fast scroll or a flickering
+# animation does not turn into a burst of near-identical frames.
+MIN_SCENE_INTERVAL = 0.5
+
 FFMPEG_ENV = "HCR2_FFMPEG"
 
+# Called as downloader(remote_path, target, expected_size=..., progress=...),
+# the signature of nextcloud.download_file.
+Downloader = Callable[..., Optional[Path]]
+# Called as lister(folder), or lister(folder, refresh=True) to bypass the listing cache.
+Lister = Callable[..., Sequence[nextcloud.RemoteEntry]]
+
+
+class FfmpegProcess(Protocol):
+    """A started ffmpeg: frames go in through `stdin` or come out of `stdout`."""
+
+    stdin: BinaryIO | None
+    stdout: BinaryIO | None
+
+    def finish(self) -> tuple[int, str]:
+        """Close the pipes, wait, and return (exit code, stderr)."""
+
+
+# Called as spawner(command) for every ffmpeg run of the frame pipeline.
+Spawner = Callable[[list[str]], FfmpegProcess]
+
 MAX_SCORE = 75000
 MAX_POINTS = 300
 
@@ -105,23 +175,26 @@ def chest_local_dir(year: int, week: int) -> Path:
 def list_candidates(
     season: int,
     *,
-    lister: Callable[[str], Sequence[nextcloud.RemoteEntry]] = nextcloud.list_directory,
+    lister: Lister = nextcloud.list_directory,
+    refresh: bool = False,
 ) -> list[VideoCandidate]:
-    return list_candidates_in(season_folder(season), lister=lister)
+    return list_candidates_in(season_folder(season), lister=lister, refresh=refresh)
 
 
 def list_candidates_in(
     folder: str,
     *,
-    lister: Callable[[str], Sequence[nextcloud.RemoteEntry]] = nextcloud.list_directory,
+    lister: Lister = nextcloud.list_directory,
+    refresh: bool = False,
 ) -> list[VideoCandidate]:
-    entries = lister(folder)
+    entries = lister(folder, refresh=True) if refresh else lister(folder)
     candidates = [
         VideoCandidate(
             name=entry.name,
             remote_path=entry.path,
             size=entry.size,
             last_modified=entry.last_modified,
+            etag=entry.etag,
         )
         for entry in entries
         if not entry.is_dir and entry.name.lower().endswith(VIDEO_SUFFIXES)
@@ -160,15 +233,17 @@ def pull_video(
     match_id: int,
     *,
     filename: str | None = None,
-    lister: Callable[[str], Sequence[nextcloud.RemoteEntry]] = nextcloud.list_directory,
-    downloader: Callable[[str, Path], Optional[Path]] = nextcloud.download_file,
+    lister: Lister = nextcloud.list_directory,
+    downloader: Downloader = nextcloud.download_file,
+    progress: nextcloud.ProgressCallback | None = None,
+    refresh: bool = False,
 ) -> PullOutcome:
     match = match_repo.get_match(match_id)
     if match is None:
         return PullOutcome(status="NO_MATCH")
 
     season = match.season_number
-    candidates = list_candidates(season, lister=lister)
+    candidates = list_candidates(season, lister=lister, refresh=refresh)
     if not candidates:
         return PullOutcome(status="NO_VIDEO", season=season)
 
@@ -177,17 +252,44 @@ def pull_video(
         return PullOutcome(status="NOT_FOUND", candidates=candidates, season=season)
 
     target = local_dir(match_id) / candidate.name
-    if target.exists() and candidate.size and target.stat().st_size == candidate.size:
+    return _fetch(candidate, target, candidates, downloader=downloader, progress=progress, season=season)
+
+
+def _fetch(
+    candidate: VideoCandidate,
+    target: Path,
+    candidates: list[VideoCandidate],
+    *,
+    downloader: Downloader,
+    progress: nextcloud.ProgressCallback | None,
+    season: int | None = None,
+) -> PullOutcome:
+    """CACHED when the local copy is the remote file, otherwise a (resumed) download.
+
+    The size alone misses a recording replaced by one of the same length, so when
+    the listing carries an ETag and the content cache knows which ETag the local
+    copy was downloaded as, the two have to agree as well.
+    """
+    if _is_current(candidate, target):
         return PullOutcome(status="CACHED", local_path=target, candidate=candidate, candidates=candidates, season=season)
 
     target.parent.mkdir(parents=True, exist_ok=True)
-    downloaded = downloader(candidate.remote_path, target)
+    downloaded = downloader(candidate.remote_path, target, expected_size=candidate.size or None, progress=progress)
     if downloaded is None:
         return PullOutcome(status="DOWNLOAD_FAILED", candidate=candidate, candidates=candidates, season=season)
 
     return PullOutcome(status="OK", local_path=target, candidate=candidate, candidates=candidates, season=season)
 
 
+def _is_current(candidate: VideoCandidate, target: Path) -> bool:
+    if not (target.exists() and candidate.size and target.stat().st_size == candidate.size):
+        return False
+    if candidate.etag is None:
+        return True
+    known = nextcloud.cached_etag(candidate.remote_path)
+    return known is None or nextcloud.etags_match(known, candidate.etag)
+
+
 # -------------------- Frames --------------------
 
 def resolve_ffmpeg() -> str | None:
@@ -220,9 +322,26 @@ def build_ffmpeg_command(
     crop: str | None = None,
     start: str | None = None,
     duration: str | None = None,
+    mode: str = DEFAULT_MODE,
+    threshold: float = DEFAULT_SCENE_THRESHOLD,
+    min_interval: float = MIN_SCENE_INTERVAL,
+    pix_fmt: str | None = None,
     executable: str = "ffmpeg",
 ) -> list[str]:
-    filters = [f"fps={fps}"]
+    """`mode="scene"` replaces the fixed rate with ffmpeg's scene detection: the first
+    frame, then every frame whose scene score exceeds `threshold` and that comes at
+    least `min_interval` seconds after the last one kept.
+
+    With `pix_fmt` ("gray" or "rgb24") the frames are not written as JPEGs into
+    `out_dir` but streamed uncompressed to stdout; `out_dir` then only receives the
+    scene log."""
+    if mode == "scene":
+        filters = [
+            f"select='eq(n,0)+gt(scene,{threshold})*gte(t-prev_selected_t,{min_interval})'",
+            f"metadata=print:file='{(out_dir / SCENE_LOG).as_posix()}'",
+        ]
+    else:
+        filters = [f"fps={fps}"]
     if crop:
         filters.append(f"crop={crop}")
     if width:
@@ -234,10 +353,78 @@ def build_ffmpeg_command(
     command += ["-i", str(video_path)]
     if duration:
         command += ["-t", duration]
-    command += ["-vf", ",".join(filters), "-q:v", "2", str(out_dir / FRAME_PATTERN)]
+    command += ["-vf", ",".join(filters)]
+    if mode == "scene":
+        # One output frame per selected frame instead of duplicates filling the gaps.
+        command += ["-vsync", "vfr"]
+    if pix_fmt:
+        command += ["-pix_fmt", pix_fmt, "-f", "image2pipe", "-c:v", PIPE_CODECS[pix_fmt], "-"]
+    else:
+        command += ["-q:v", "2", str(out_dir / FRAME_PATTERN)]
     return command
 
 
+def build_jpeg_command(out_dir: Path, *, executable: str = "ffmpeg") -> list[str]:
+    """An encoder that turns the PGM/PPM frames piped into it into numbered JPEGs."""
+    return [
+        executable, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "image2pipe", "-i", "-",
+        "-q:v", "2", str(out_dir / FRAME_PATTERN),
+    ]
+
+
+class FfmpegRun:
+    """ffmpeg with its frames piped. stderr goes to a temporary file instead of a
+    pipe, so a chatty run cannot block on output nobody reads yet."""
+
+    def __init__(self, command: list[str]) -> None:
+        self._stderr = tempfile.TemporaryFile()
+        reads_stdin = "-i" in command and command[command.index("-i") + 1] == "-"
+        writes_stdout = command[-1] == "-"
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE if reads_stdin else subprocess.DEVNULL,
+            stdout=subprocess.PIPE if writes_stdout else subprocess.DEVNULL,
+            stderr=self._stderr,
+        )
+        self.stdin = self.process.stdin
+        self.stdout = self.process.stdout
+
+    def finish(self) -> tuple[int, str]:
+        for pipe in (self.stdin, self.stdout):
+            if pipe is not None:
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+        code = self.process.wait()
+        self._stderr.seek(0)
+        detail = self._stderr.read().decode("utf-8", errors="replace")
+        self._stderr.close()
+        return code, detail
+
+
+def open_frame_stream(
+    video_path: Path,
+    *,
+    executable: str,
+    pix_fmt: str = "gray",
+    log_dir: Path | None = None,
+    spawner: Spawner | None = None,
+    **options,
+) -> FfmpegProcess:
+    """Start decoding `video_path` into frames on stdout.
+
+    Read them with `frames.read_pnm_frames(run.stdout)`, then call `run.finish()` for
+    the exit code. `options` are those of `build_ffmpeg_command`; scene mode writes its
+    log into `log_dir`.
+    """
+    command = build_ffmpeg_command(
+        video_path, log_dir or video_path.parent, pix_fmt=pix_fmt, executable=executable, **options
+    )
+    return (spawner or FfmpegRun)(command)
+
+
 def extract_frames(
     match_id: int,
     *,
@@ -246,27 +433,42 @@ def extract_frames(
     crop: str | None = None,
     start: str | None = None,
     duration: str | None = None,
+    mode: str = DEFAULT_MODE,
+    threshold: float = DEFAULT_SCENE_THRESHOLD,
+    dedupe: int | None = frame_service.DEFAULT_DEDUPE_DISTANCE,
+    jobs: int = DEFAULT_JOBS,
+    keep_images: bool = False,
     filename: str | None = None,
-    lister: Callable[[str], Sequence[nextcloud.RemoteEntry]] = nextcloud.list_directory,
-    downloader: Callable[[str, Path], Optional[Path]] = nextcloud.download_file,
-    runner: Callable[[list[str]], subprocess.CompletedProcess] | None = None,
+    lister: Lister = nextcloud.list_directory,
+    downloader: Downloader = nextcloud.download_file,
+    progress: nextcloud.ProgressCallback | None = None,
+    refresh: bool = False,
+    spawner: Spawner | None = None,
     ffmpeg_resolver: Callable[[], str | None] = resolve_ffmpeg,
 ) -> FramesOutcome:
     executable = ffmpeg_resolver()
     if executable is None:
         return FramesOutcome(status="FFMPEG_MISSING")
 
-    pull = pull_video(match_id, filename=filename, lister=lister, downloader=downloader)
+    pull = pull_video(
+        match_id, filename=filename, lister=lister, downloader=downloader, progress=progress, refresh=refresh
+    )
     return _cut_frames(
         pull,
         frames_dir(match_id),
+        video_type="standings",
         executable=executable,
         fps=fps,
         width=width,
         crop=crop,
         start=start,
         duration=duration,
-        runner=runner,
+        mode=mode,
+        threshold=threshold,
+        dedupe=dedupe,
+        jobs=jobs,
+        keep_images=keep_images,
+        spawner=spawner,
     )
 
 
@@ -274,41 +476,553 @@ def _cut_frames(
     pull: PullOutcome,
     out_dir: Path,
     *,
+    video_type: str,
     executable: str,
     fps: float,
     width: int,
     crop: str | None,
     start: str | None,
     duration: str | None,
-    runner: Callable[[list[str]], subprocess.CompletedProcess] | None,
+    mode: str,
+    threshold: float,
+    dedupe: int | None,
+    jobs: int,
+    keep_images: bool,
+    spawner: Spawner | None,
 ) -> FramesOutcome:
+    """Decode once, drop the near-duplicates in memory, encode only what is asked for.
+
+    The frames come out of ffmpeg uncompressed and are hashed as they arrive; what
+    survives is listed in `frames.json`. Only with `keep_images` do the survivors go
+    into a second ffmpeg that writes them as JPEGs for a person to read. No frame is
+    encoded, written and decoded again just to be thrown away. With
+    `jobs` above 1 the video is split into that many time segments decoded side by
+    side, see `_segment_plan`.
+
+    A directory already cut from the same recording with the same settings is left
+    as it is (CACHED) without starting ffmpeg at all; `jobs` does not count, it does
+    not change the result, and an earlier run with images also answers one without.
+    `crop` may also be "auto" or "none", see `_resolve_crop`; it is only resolved
+    when the frames have to be cut.
+    """
     if pull.status not in ("OK", "CACHED") or pull.local_path is None:
         return FramesOutcome(status="NO_VIDEO", pull=pull)
 
+    source = _video_identity(pull)
+    settings = {
+        "mode": mode,
+        "fps": fps if mode == "fps" else None,
+        "threshold": threshold if mode == "scene" else None,
+        "width": width,
+        "crop": _crop_key(crop, video_type),
+        "start": start,
+        "duration": duration,
+        "dedupe": dedupe,
+    }
+    cached = _cached_frames(out_dir, source, settings, images=keep_images)
+    if cached is not None:
+        return FramesOutcome(
+            status="CACHED",
+            frame_dir=out_dir,
+            frame_count=len(cached["frames"]),
+            pull=pull,
+            mode=mode,
+            dropped=cached.get("dropped") or 0,
+            crop=cached.get("crop"),
+            crop_note=cached.get("crop_note") or "",
+            images=bool(cached.get("images")),
+        )
+
+    spawn = spawner or FfmpegRun
+    requested = crop
+    try:
+        crop, crop_note = _resolve_crop(
+            crop, video_type, pull.local_path, executable=executable, spawner=spawn, start=start, duration=duration
+        )
+    except OSError as e:
+        return FramesOutcome(status="FFMPEG_FAILED", pull=pull, detail=f"{type(e).__name__}: {e}", mode=mode)
+    # Resolving may have saved a region for the kind; the next run looks it up as it is now.
+    settings["crop"] = _crop_key(requested, video_type)
+
     out_dir.mkdir(parents=True, exist_ok=True)
     for stale in out_dir.glob(FRAME_GLOB):
         stale.unlink()
+    for stale in (out_dir / SCENE_LOG, out_dir / frame_service.MANIFEST_NAME):
+        stale.unlink(missing_ok=True)
+    for stale in out_dir.glob(SEGMENT_GLOB):
+        shutil.rmtree(stale, ignore_errors=True)
 
-    command = build_ffmpeg_command(
-        pull.local_path,
+    options = dict(fps=fps, width=width, crop=crop, mode=mode, threshold=threshold)
+    try:
+        plan = _segment_plan(
+            pull.local_path, start, duration, jobs, fps=fps if mode == "fps" else None, executable=executable, spawner=spawn
+        )
+        if len(plan) == 1:
+            segments = [
+                _decode_segment(pull.local_path, out_dir, plan[0], executable, spawn, dedupe, keep_images, options)
+            ]
+        else:
+            with ThreadPoolExecutor(max_workers=len(plan)) as pool:
+                segments = list(pool.map(
+                    lambda numbered: _decode_segment(
+                        pull.local_path, out_dir / (SEGMENT_DIR % numbered[0]), numbered[1],
+                        executable, spawn, dedupe, keep_images, options,
+                    ),
+                    enumerate(plan, start=1),
+                ))
+    except OSError as e:
+        return FramesOutcome(status="FFMPEG_FAILED", pull=pull, detail=f"{type(e).__name__}: {e}", mode=mode)
+
+    failed = next((segment for segment in segments if segment.code != 0), None)
+    if failed is not None:
+        return FramesOutcome(status="FFMPEG_FAILED", pull=pull, detail=failed.detail.strip(), mode=mode)
+    records = _merge_segments(segments, out_dir, dedupe=dedupe) if len(segments) > 1 else segments[0].records
+    decoded = sum(segment.decoded for segment in segments)
+    if not records:
+        return FramesOutcome(status="NO_FRAMES", frame_dir=out_dir, pull=pull, mode=mode)
+
+    frame_service.write_manifest(
         out_dir,
-        fps=fps,
-        width=width,
+        records,
+        video=pull.local_path.name,
+        source=source,
+        settings=settings,
+        dropped=decoded - len(records),
+        jobs=len(segments),
+        images=keep_images,
+        crop=crop,
+        crop_note=crop_note,
+    )
+    return FramesOutcome(
+        status="OK",
+        frame_dir=out_dir,
+        frame_count=len(records),
+        pull=pull,
+        mode=mode,
+        dropped=decoded - len(records),
+        jobs=len(segments),
         crop=crop,
+        crop_note=crop_note,
+        images=keep_images,
+    )
+
+
+def crops_path() -> Path:
+    return LOCAL_VIDEO_ROOT / CROPS_NAME
+
+
+def load_crops() -> dict:
+    """The saved crop per kind of video: {"standings": {"crop", "source", "detected"}}."""
+    try:
+        payload = json.loads(crops_path().read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def save_crop(video_type: str, crop: str, source: tuple[int, int]) -> None:
+    crops = load_crops()
+    crops[video_type] = {"crop": crop, "source": list(source), "detected": datetime.now().isoformat(timespec="seconds")}
+    path = crops_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(crops, indent=2) + "\n", encoding="utf-8")
+
+
+def detect_crop(
+    video_path: Path,
+    *,
+    executable: str,
+    spawner: Spawner | None = None,
+    start: str | None = None,
+    duration: str | None = None,
+    info: VideoInfo | None = None,
+) -> str | None:
+    """The crop filter (w:h:x:y, source pixels) of the region the list scrolls in,
+    found on CROP_SAMPLES gray frames spread over the video; None if nothing moves.
+
+    Only keyframes are decoded for the samples, which is a fraction of a second even
+    for a long recording; a video with too few keyframes is sampled in full.
+    """
+    spawn = spawner or FfmpegRun
+    info = info or probe_video(video_path, executable=executable, spawner=spawn)
+    span = frame_service.parse_timecode(duration) or (
+        info.duration - (frame_service.parse_timecode(start) or 0.0) if info.duration else None
+    )
+    fps = CROP_SAMPLES / span if span and span > 0 else 1.0
+
+    samples: list = []
+    for keyframes_only in (True, False):
+        command = build_ffmpeg_command(
+            video_path, video_path.parent, fps=fps, width=0, start=start,
+            duration=duration if span is not None else str(CROP_SAMPLES), pix_fmt="gray", executable=executable,
+        )
+        if keyframes_only:
+            command[command.index("-i"):command.index("-i")] = ["-skip_frame", "nokey"]
+        run = spawn(command)
+        samples = list(islice(frame_service.read_pnm_frames(run.stdout), CROP_SAMPLES))
+        run.finish()
+        if len({frame.pixels for frame in samples}) >= 3:
+            break
+    region = frame_service.detect_list_region(samples)
+    return frame_service.crop_filter(region) if region is not None else None
+
+
+def _resolve_crop(
+    crop: str | None,
+    video_type: str,
+    video_path: Path,
+    *,
+    executable: str,
+    spawner: Spawner,
+    start: str | None,
+    duration: str | None,
+) -> tuple[str | None, str]:
+    """(crop filter or None, how it came about: "", "saved", "detected" or "undetected").
+
+    A w:h:x:y crop is used as given and "none" switches cropping off. "auto" looks
+    for the list region and saves it for the kind of video; without a crop, the saved
+    one is used when the recording has the size it was found on, and looked for
+    again when it has not.
+    """
+    if crop is not None and crop.strip().lower() == CROP_NONE:
+        return None, ""
+    if crop is not None and crop.strip().lower() != CROP_AUTO:
+        return crop, ""
+
+    saved = load_crops().get(video_type)
+    if crop is None and not isinstance(saved, dict):
+        return None, ""
+    info = probe_video(video_path, executable=executable, spawner=spawner)
+    if crop is None and saved.get("source") == [info.width, info.height] and saved.get("crop"):
+        return str(saved["crop"]), "saved"
+
+    detected = detect_crop(
+        video_path, executable=executable, spawner=spawner, start=start, duration=duration, info=info
+    )
+    if detected is None:
+        return None, "undetected"
+    if info.width and info.height:
+        save_crop(video_type, detected, (info.width, info.height))
+    return detected, "detected"
+
+
+def _crop_key(crop: str | None, video_type: str) -> str | dict | None:
+    """What the crop of an extraction depends on besides the recording, known without
+    starting ffmpeg: the `crop` given, or without one the region saved for the kind."""
+    if crop is not None:
+        crop = crop.strip()
+        return crop.lower() if crop.lower() in (CROP_AUTO, CROP_NONE) else crop
+    saved = load_crops().get(video_type)
+    if not isinstance(saved, dict):
+        return None
+    return {"saved": saved.get("crop"), "source": saved.get("source")}
+
+
+def _video_identity(pull: PullOutcome) -> dict | None:
+    """What makes two extractions come from the same recording: the local file's
+    size and modification time, and the ETag Nextcloud listed it with."""
+    try:
+        stat = pull.local_path.stat()
+    except OSError:
+        return None
+    candidate = pull.candidate
+    return {
+        "name": pull.local_path.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "etag": candidate.etag if candidate is not None else None,
+    }
+
+
+def _cached_frames(out_dir: Path, source: dict | None, settings: dict, *, images: bool) -> dict | None:
+    """The manifest of an earlier run over the same recording with the same settings,
+    if every frame it lists is still there when `images` are wanted; None means
+    extract again."""
+    if source is None:
+        return None
+    manifest = frame_service.load_manifest(out_dir)
+    if manifest is None or manifest.get("source") != source or manifest.get("settings") != settings:
+        return None
+    frames = manifest.get("frames")
+    if not isinstance(frames, list) or not frames:
+        return None
+    if not all(isinstance(frame, dict) for frame in frames):
+        return None
+    if images and not all(frame.get("file") and (out_dir / str(frame["file"])).is_file() for frame in frames):
+        return None
+    return manifest
+
+
+@dataclass(frozen=True)
+class _Segment:
+    """What one decoder run left in its directory."""
+
+    out_dir: Path
+    records: list[FrameRecord]
+    decoded: int
+    code: int = 0
+    detail: str = ""
+
+
+def _segment_plan(
+    video_path: Path,
+    start: str | None,
+    duration: str | None,
+    jobs: int,
+    *,
+    fps: float | None,
+    executable: str,
+    spawner: Spawner,
+) -> list[tuple[str | None, str | None]]:
+    """(-ss, -t) for every decoder to run.
+
+    One job, or a video too short or unreadable to split, is a single run over
+    `start`/`duration` as given. Otherwise the span is cut into `jobs` pieces of at
+    least MIN_SEGMENT_SECONDS; at a fixed rate the cuts fall on the sampling grid, so
+    the frames and their times are those of a single run. Rounding up to the grid
+    can leave fewer pieces than `jobs`; none of them is empty.
+    """
+    if jobs <= 1:
+        return [(start, duration)]
+    offset = frame_service.parse_timecode(start) or 0.0
+    span = frame_service.parse_timecode(duration)
+    if span is None:
+        total = probe_video(video_path, executable=executable, spawner=spawner).duration
+        if total is None:
+            return [(start, duration)]
+        span = total - offset
+    jobs = min(jobs, int(span // MIN_SEGMENT_SECONDS))
+    if jobs <= 1:
+        return [(start, duration)]
+
+    length = span / jobs
+    if fps:
+        length = math.ceil(length * fps) / fps
+    plan = []
+    for number in range(jobs):
+        begin = number * length
+        if begin >= span:
+            # At a low rate the rounded pieces reach the end early; nothing is left.
+            break
+        last = number == jobs - 1 or begin + length >= span
+        # The last piece runs to the end unless a duration bounds it.
+        piece = max(0.0, span - begin) if last and duration else (None if last else length)
+        plan.append((f"{offset + begin:.3f}", f"{piece:.3f}" if piece is not None else None))
+        if last:
+            break
+    return plan if len(plan) > 1 else [(start, duration)]
+
+
+def probe_video(video_path: Path, *, executable: str, spawner: Spawner | None = None) -> VideoInfo:
+    """Length and picture size of the video, from the banner `ffmpeg -i` prints.
+
+    ffmpeg exits with an error here (no output file was given); only the banner
+    counts. The size is the one frames are decoded at, so a recording flagged as
+    rotated by 90 degrees reports its sides swapped.
+    """
+    run = (spawner or FfmpegRun)([executable, "-hide_banner", "-i", str(video_path)])
+    _code, detail = run.finish()
+    duration = _DURATION.search(detail)
+    size = _VIDEO_SIZE.search(detail)
+    width, height = (int(size.group(1)), int(size.group(2))) if size else (None, None)
+    rotation = _ROTATION.search(detail)
+    if rotation and abs(int(float(rotation.group(1)))) % 180 == 90:
+        width, height = height, width
+    return VideoInfo(
+        duration=frame_service.parse_timecode(duration.group(1)) if duration else None,
+        width=width,
+        height=height,
+    )
+
+
+def _decode_segment(
+    video_path: Path,
+    out_dir: Path,
+    piece: tuple[str | None, str | None],
+    executable: str,
+    spawn: Spawner,
+    dedupe: int | None,
+    keep_images: bool,
+    options: dict,
+) -> _Segment:
+    """One decoder over one (-ss, -t) piece, dropping near-duplicates and, with
+    `keep_images`, encoding the rest into `out_dir` as frame_0001.jpg onwards."""
+    start, duration = piece
+    out_dir.mkdir(parents=True, exist_ok=True)
+    decoder = open_frame_stream(
+        video_path,
+        executable=executable,
+        pix_fmt="rgb24",
+        log_dir=out_dir,
+        spawner=spawn,
         start=start,
         duration=duration,
-        executable=executable,
+        **options,
     )
-    run = runner or (lambda cmd: subprocess.run(cmd, capture_output=True, text=True, check=False))
-    completed = run(command)
-    if completed.returncode != 0:
-        return FramesOutcome(status="FFMPEG_FAILED", pull=pull, detail=(completed.stderr or "").strip())
 
-    frames = sorted(out_dir.glob(FRAME_GLOB))
-    if not frames:
-        return FramesOutcome(status="NO_FRAMES", frame_dir=out_dir, pull=pull)
+    decoded = 0
+    kept: list[tuple[int, int]] = []
+    encoder: FfmpegProcess | None = None
+    encode_failed = False
+
+    def hashed():
+        nonlocal decoded
+        for frame in frame_service.read_pnm_frames(decoder.stdout):
+            decoded += 1
+            yield frame, frame_service.frame_hash(frame)
+
+    frames = hashed()
+    if dedupe is not None:
+        frames = frame_service.drop_near_duplicates(frames, lambda pair: pair[1], dedupe)
+    try:
+        for frame, frame_hash in frames:
+            if keep_images:
+                if encoder is None:
+                    encoder = spawn(build_jpeg_command(out_dir, executable=executable))
+                encoder.stdin.write(frame_service.pnm_bytes(frame))
+            kept.append((frame.index, frame_hash))
+    except OSError:
+        # The encoder quit; its exit code and stderr say why.
+        encode_failed = True
+
+    code, detail = decoder.finish()
+    if encoder is not None:
+        encoder_code, encoder_detail = encoder.finish()
+        if encoder_code != 0 or encode_failed:
+            code, detail = encoder_code or 1, encoder_detail or detail
+    if code != 0:
+        return _Segment(out_dir=out_dir, records=[], decoded=decoded, code=code, detail=detail)
+
+    times = _frame_times(
+        decoded, out_dir, mode=options["mode"], fps=options["fps"], offset=frame_service.parse_timecode(start) or 0.0
+    )
+    records = [
+        FrameRecord(file=FRAME_PATTERN % number if keep_images else None, time=times[index], hash=frame_hash)
+        for number, (index, frame_hash) in enumerate(kept, start=1)
+    ]
+    return _Segment(out_dir=out_dir, records=records, decoded=decoded)
+
 
-    return FramesOutcome(status="OK", frame_dir=out_dir, frame_count=len(frames), pull=pull)
+def _merge_segments(segments: Sequence[_Segment], out_dir: Path, *, dedupe: int | None) -> list[FrameRecord]:
+    """Move the segments' frames into `out_dir`, numbered on from one to the next.
+
+    Each segment only deduplicated within itself, so its leading frames are checked
+    once more against the last frame kept before it: a still screen across a cut
+    yields one frame, not one per segment.
+    """
+    records: list[FrameRecord] = []
+    for segment in segments:
+        leading = True
+        for record in segment.records:
+            source = segment.out_dir / record.file if record.file else None
+            if leading and dedupe is not None and records and record.hash is not None and records[-1].hash is not None \
+                    and frame_service.hamming(record.hash, records[-1].hash) <= dedupe:
+                if source is not None:
+                    source.unlink(missing_ok=True)
+                continue
+            leading = False
+            name = None
+            if source is not None:
+                name = FRAME_PATTERN % (len(records) + 1)
+                source.replace(out_dir / name)
+            records.append(FrameRecord(file=name, time=record.time, hash=record.hash))
+        shutil.rmtree(segment.out_dir, ignore_errors=True)
+    return records
+
+
+def _frame_times(count: int, out_dir: Path, *, mode: str, fps: float, offset: float) -> list[float | None]:
+    """When each decoded frame was taken: computed from the rate, or logged by ffmpeg in scene mode."""
+    if mode == "scene":
+        try:
+            times = frame_service.logged_times((out_dir / SCENE_LOG).read_text(encoding="utf-8"), offset=offset)
+        except OSError:
+            times = []
+    else:
+        times = frame_service.fps_times(count, fps, offset=offset)
+    return times if len(times) == count else [None] * count
+
+
+def stitch_dir(match_id: int) -> Path:
+    return local_dir(match_id) / "stitched"
+
+
+def stitch_video(
+    match_id: int,
+    *,
+    tile_writer: Callable[[Path, int, Sequence[bytes]], Path],
+    fps: float = STITCH_FPS,
+    width: int = DEFAULT_WIDTH,
+    crop: str | None = None,
+    start: str | None = None,
+    duration: str | None = None,
+    tile_height: int = stitching.DEFAULT_TILE_HEIGHT,
+    filename: str | None = None,
+    lister: Lister = nextcloud.list_directory,
+    downloader: Downloader = nextcloud.download_file,
+    progress: nextcloud.ProgressCallback | None = None,
+    refresh: bool = False,
+    spawner: Spawner | None = None,
+    ffmpeg_resolver: Callable[[], str | None] = resolve_ffmpeg,
+) -> StitchOutcome:
+    """The standings list of the match video as tall images, every row once.
+
+    Frames are streamed at `fps` (often enough for consecutive frames to overlap),
+    cropped to the list region like `video frames` and laid end to end by
+    `stitching.Stitcher`; `tile_writer(path, width, rows)` writes each tile of at
+    most `tile_height` rows.
+    """
+    executable = ffmpeg_resolver()
+    if executable is None:
+        return StitchOutcome(status="FFMPEG_MISSING")
+
+    pull = pull_video(
+        match_id, filename=filename, lister=lister, downloader=downloader, progress=progress, refresh=refresh
+    )
+    if pull.status not in ("OK", "CACHED") or pull.local_path is None:
+        return StitchOutcome(status="NO_VIDEO", pull=pull)
+
+    out_dir = stitch_dir(match_id)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob(TILE_GLOB):
+        stale.unlink()
+
+    spawn = spawner or FfmpegRun
+    tiles: list[Path] = []
+    try:
+        crop, crop_note = _resolve_crop(
+            crop, "standings", pull.local_path, executable=executable, spawner=spawn, start=start, duration=duration
+        )
+        decoder = open_frame_stream(
+            pull.local_path, executable=executable, pix_fmt="rgb24", log_dir=out_dir, spawner=spawn,
+            fps=fps, width=width, crop=crop, start=start, duration=duration,
+        )
+    except OSError as e:
+        return StitchOutcome(status="FFMPEG_FAILED", pull=pull, detail=f"{type(e).__name__}: {e}")
+
+    stitcher = stitching.Stitcher(
+        lambda number, tile_width, rows: tiles.append(tile_writer(out_dir / (TILE_PATTERN % number), tile_width, rows)),
+        tile_height=tile_height,
+    )
+    for frame in frame_service.read_pnm_frames(decoder.stdout):
+        stitcher.add(frame)
+    code, detail = decoder.finish()
+    if code != 0:
+        return StitchOutcome(status="FFMPEG_FAILED", pull=pull, detail=detail.strip())
+    stitcher.finish()
+    if not tiles:
+        return StitchOutcome(status="NO_FRAMES", out_dir=out_dir, pull=pull)
+    return StitchOutcome(
+        status="OK",
+        out_dir=out_dir,
+        tiles=tiles,
+        height=stitcher.height,
+        frames=stitcher.frames,
+        skipped=stitcher.skipped,
+        breaks=stitcher.breaks,
+        pull=pull,
+        crop=crop,
+        crop_note=crop_note,
+    )
 
 
 # -------------------- Team video (Ladys.mp4) --------------------
@@ -316,11 +1030,13 @@ def _cut_frames(
 def pull_team_video(
     *,
     filename: str = TEAM_VIDEO_NAME,
-    lister: Callable[[str], Sequence[nextcloud.RemoteEntry]] = nextcloud.list_directory,
-    downloader: Callable[[str, Path], Optional[Path]] = nextcloud.download_file,
+    lister: Lister = nextcloud.list_directory,
+    downloader: Downloader = nextcloud.download_file,
+    progress: nextcloud.ProgressCallback | None = None,
+    refresh: bool = False,
 ) -> PullOutcome:
     """The team screen is not tied to a season, so it lives next to Ladys.xlsx in the base folder."""
-    candidates = list_candidates_in(team_folder(), lister=lister)
+    candidates = list_candidates_in(team_folder(), lister=lister, refresh=refresh)
     if not candidates:
         return PullOutcome(status="NO_VIDEO")
 
@@ -330,13 +1046,7 @@ def pull_team_video(
         return PullOutcome(status="NOT_FOUND", candidates=candidates)
 
     target = TEAM_LOCAL_DIR / candidate.name
-    if target.exists() and candidate.size and target.stat().st_size == candidate.size:
-        return PullOutcome(status="CACHED", local_path=target, candidate=candidate, candidates=candidates)
-
-    target.parent.mkdir(parents=True, exist_ok=True)
-    if downloader(candidate.remote_path, target) is None:
-        return PullOutcome(status="DOWNLOAD_FAILED", candidate=candidate, candidates=candidates)
-    return PullOutcome(status="OK", local_path=target, candidate=candidate, candidates=candidates)
+    return _fetch(candidate, target, candidates, downloader=downloader, progress=progress)
 
 
 def extract_team_frames(
@@ -346,27 +1056,42 @@ def extract_team_frames(
     crop: str | None = None,
     start: str | None = None,
     duration: str | None = None,
+    mode: str = DEFAULT_MODE,
+    threshold: float = DEFAULT_SCENE_THRESHOLD,
+    dedupe: int | None = frame_service.DEFAULT_DEDUPE_DISTANCE,
+    jobs: int = DEFAULT_JOBS,
+    keep_images: bool = False,
     filename: str = TEAM_VIDEO_NAME,
-    lister: Callable[[str], Sequence[nextcloud.RemoteEntry]] = nextcloud.list_directory,
-    downloader: Callable[[str, Path], Optional[Path]] = nextcloud.download_file,
-    runner: Callable[[list[str]], subprocess.CompletedProcess] | None = None,
+    lister: Lister = nextcloud.list_directory,
+    downloader: Downloader = nextcloud.download_file,
+    progress: nextcloud.ProgressCallback | None = None,
+    refresh: bool = False,
+    spawner: Spawner | None = None,
     ffmpeg_resolver: Callable[[], str | None] = resolve_ffmpeg,
 ) -> FramesOutcome:
     executable = ffmpeg_resolver()
     if executable is None:
         return FramesOutcome(status="FFMPEG_MISSING")
 
-    pull = pull_team_video(filename=filename, lister=lister, downloader=downloader)
+    pull = pull_team_video(
+        filename=filename, lister=lister, downloader=downloader, progress=progress, refresh=refresh
+    )
     return _cut_frames(
         pull,
         TEAM_LOCAL_DIR / "frames",
+        video_type="team",
         executable=executable,
         fps=fps,
         width=width,
         crop=crop,
         start=start,
         duration=duration,
-        runner=runner,
+        mode=mode,
+        threshold=threshold,
+        dedupe=dedupe,
+        jobs=jobs,
+        keep_images=keep_images,
+        spawner=spawner,
     )
 
 
@@ -375,33 +1100,29 @@ def pull_chest_video(
     week: int,
     *,
     filename: str | None = None,
-    lister: Callable[[str], Sequence[nextcloud.RemoteEntry]] = nextcloud.list_directory,
-    downloader: Callable[[str, Path], Optional[Path]] = nextcloud.download_file,
+    lister: Lister = nextcloud.list_directory,
+    downloader: Downloader = nextcloud.download_file,
+    progress: nextcloud.ProgressCallback | None = None,
+    refresh: bool = False,
 ) -> PullOutcome:
-    candidates = list_candidates_in(chest_folder(year), lister=lister)
+    candidates = list_candidates_in(chest_folder(year), lister=lister, refresh=refresh)
     if not candidates:
         return PullOutcome(status="NO_VIDEO")
 
     wanted = (filename or chest_video_name(week)).strip().lower()
     # w34.mp4 and w034.mp4 are the same week; do not make the user guess the padding.
     candidate = next(
-        (c for c in candidates if c.name.lower() == wanted or _week_of(c.name) == week),
+        (c for c in candidates if c.name.lower() == wanted or week_of(c.name) == week),
         None,
     )
     if candidate is None:
         return PullOutcome(status="NOT_FOUND", candidates=candidates)
 
     target = chest_local_dir(year, week) / candidate.name
-    if target.exists() and candidate.size and target.stat().st_size == candidate.size:
-        return PullOutcome(status="CACHED", local_path=target, candidate=candidate, candidates=candidates)
-
-    target.parent.mkdir(parents=True, exist_ok=True)
-    if downloader(candidate.remote_path, target) is None:
-        return PullOutcome(status="DOWNLOAD_FAILED", candidate=candidate, candidates=candidates)
-    return PullOutcome(status="OK", local_path=target, candidate=candidate, candidates=candidates)
+    return _fetch(candidate, target, candidates, downloader=downloader, progress=progress)
 
 
-def _week_of(name: str) -> int | None:
+def week_of(name: str) -> int | None:
     stem = name.rsplit(".", 1)[0].strip().lower()
     if not stem.startswith("w") or not stem[1:].isdigit():
         return None
@@ -417,27 +1138,42 @@ def extract_chest_frames(
     crop: str | None = None,
     start: str | None = None,
     duration: str | None = None,
+    mode: str = DEFAULT_MODE,
+    threshold: float = DEFAULT_SCENE_THRESHOLD,
+    dedupe: int | None = frame_service.DEFAULT_DEDUPE_DISTANCE,
+    jobs: int = DEFAULT_JOBS,
+    keep_images: bool = False,
     filename: str | None = None,
-    lister: Callable[[str], Sequence[nextcloud.RemoteEntry]] = nextcloud.list_directory,
-    downloader: Callable[[str, Path], Optional[Path]] = nextcloud.download_file,
-    runner: Callable[[list[str]], subprocess.CompletedProcess] | None = None,
+    lister: Lister = nextcloud.list_directory,
+    downloader: Downloader = nextcloud.download_file,
+    progress: nextcloud.ProgressCallback | None = None,
+    refresh: bool = False,
+    spawner: Spawner | None = None,
     ffmpeg_resolver: Callable[[], str | None] = resolve_ffmpeg,
 ) -> FramesOutcome:
     executable = ffmpeg_resolver()
     if executable is None:
         return FramesOutcome(status="FFMPEG_MISSING")
 
-    pull = pull_chest_video(year, week, filename=filename, lister=lister, downloader=downloader)
+    pull = pull_chest_video(
+        year, week, filename=filename, lister=lister, downloader=downloader, progress=progress, refresh=refresh
+    )
     return _cut_frames(
         pull,
         chest_local_dir(year, week) / "frames",
+        video_type="chest",
         executable=executable,
         fps=fps,
         width=width,
         crop=crop,
         start=start,
         duration=duration,
-        runner=runner,
+        mode=mode,
+        threshold=threshold,
+        dedupe=dedupe,
+        jobs=jobs,
+        keep_images=keep_images,
+        spawner=spawner,
     )
 
 
@@ -448,6 +1184,10 @@ def get_roster(match_id: int | None = None) -> list[RosterPlayer] | None:
     need the same mapping table but have no match to hang it on."""
     if match_id is not None and match_repo.get_match(match_id) is None:
         return None
+    return _active_roster()
+
+
+def _active_roster() -> list[RosterPlayer]:
     return [
         RosterPlayer(
             id=row.id,
@@ -659,6 +1399,19 @@ def validate_results(
     *,
     match_id: int,
     force: bool = False,
+) -> tuple[list[str], list[str], list[tuple[VideoEntry, str]]]:
+    match = match_repo.get_match(match_id)
+    roster = _active_roster() if match is not None else []
+    return _validate(results, match_id=match_id, match=match, roster=roster, force=force)
+
+
+def _validate(
+    results: VideoResults,
+    *,
+    match_id: int,
+    match: MatchDetail | None,
+    roster: Sequence[RosterPlayer],
+    force: bool,
 ) -> tuple[list[str], list[str], list[tuple[VideoEntry, str]]]:
     errors: list[str] = []
     warnings: list[str] = []
@@ -667,7 +1420,6 @@ def validate_results(
     if results.match_id and results.match_id != match_id:
         errors.append(f"results file is for match {results.match_id}, not {match_id}")
 
-    match = match_repo.get_match(match_id)
     if match is not None:
         opponent_errors, opponent_warnings = _check_opponent(results, match.opponent, force=force)
         errors.extend(opponent_errors)
@@ -679,6 +1431,7 @@ def validate_results(
     if results.score_opponent <= 0:
         warnings.append("score_opponent is 0 - was the opponent total unreadable?")
 
+    names = player_repo.get_player_names([entry.pid for entry in results.entries])
     seen: set[int] = set()
     for entry in results.entries:
         if entry.pid in seen:
@@ -686,15 +1439,15 @@ def validate_results(
             continue
         seen.add(entry.pid)
 
-        brief = player_repo.get_player_brief(entry.pid)
-        if brief is None:
+        name = names.get(entry.pid)
+        if name is None:
             errors.append(f"player {entry.pid} does not exist")
             continue
         if not 0 <= entry.score <= MAX_SCORE:
-            errors.append(f"player {entry.pid} ({brief.name}): score {entry.score} outside 0..{MAX_SCORE}")
+            errors.append(f"player {entry.pid} ({name}): score {entry.score} outside 0..{MAX_SCORE}")
         if not 0 <= entry.points <= MAX_POINTS:
-            errors.append(f"player {entry.pid} ({brief.name}): points {entry.points} outside 0..{MAX_POINTS}")
-        rows.append((entry, brief.name))
+            errors.append(f"player {entry.pid} ({name}): points {entry.points} outside 0..{MAX_POINTS}")
+        rows.append((entry, name))
 
     monotonicity_errors = _check_monotonicity(rows) + _check_ceiling(rows, match_id)
     if force:
@@ -715,7 +1468,7 @@ def validate_results(
             errors.append(message)
 
     # Who is missing is spelled out per player in build_notes, away-aware - here only the count.
-    missing = len([player for player in get_roster(match_id) or [] if player.id not in seen])
+    missing = len([player for player in roster if player.id not in seen])
     if missing:
         warnings.append(f"{missing} roster player(s) without an entry - see the review below")
 
@@ -755,19 +1508,48 @@ def _name_notes(rows: Sequence[tuple[VideoEntry, str]]) -> list[ReviewNote]:
     return notes
 
 
-def _absence_notes(match_id: int, rows: Sequence[tuple[VideoEntry, str]]) -> list[ReviewNote]:
+@dataclass(frozen=True)
+class _ReviewData:
+    """What the review notes read from the database, fetched once for the whole roster
+    instead of a handful of queries per player."""
+
+    match: MatchDetail | None
+    roster: Sequence[RosterPlayer]
+    history: dict[int, list[int]]
+    has_driven: set[int]
+    absent: dict[int, int]
+
+
+def _review_data(
+    match_id: int,
+    match: MatchDetail | None,
+    roster: Sequence[RosterPlayer],
+    rows: Sequence[tuple[VideoEntry, str]],
+) -> _ReviewData:
+    roster_ids = [player.id for player in roster]
+    return _ReviewData(
+        match=match,
+        roster=roster,
+        history=matchscore_repo.recent_scores_by_player(
+            roster_ids + [entry.pid for entry, _ in rows], exclude_match_id=match_id
+        ),
+        has_driven=matchscore_repo.players_who_have_driven(roster_ids),
+        absent=matchscore_repo.absent_flags_for_match(match_id, roster_ids),
+    )
+
+
+def _absence_notes(rows: Sequence[tuple[VideoEntry, str]], data: _ReviewData) -> list[ReviewNote]:
     """A 0/0 row and a missing row mean the same thing - the player did not drive."""
     drove = {entry.pid for entry, _ in rows if entry.score > 0 or entry.points > 0}
-    match = match_repo.get_match(match_id)
-    match_start = match.start if match is not None else None
+    match_start = data.match.start if data.match is not None else None
 
     notes = []
-    for player in get_roster(match_id) or []:
+    for player in data.roster:
         if player.id in drove:
             continue
-        history = matchscore_repo.recent_scores(player.id, exclude_match_id=match_id)
+        history = data.history.get(player.id, [])
         last = f", last scored {_thousands(history[0])}" if history else ", no earlier score"
-        if joined_after_start(player.joined_at, match_start) and not matchscore_repo.has_ever_driven(player.id):
+        if joined_after_start(player.joined_at, match_start) and player.id not in data.has_driven:
             notes.append(ReviewNote(
                 kind="joined",
                 message=(
@@ -776,7 +1558,7 @@ def _absence_notes(match_id: int, rows: Sequence[tuple[VideoEntry, str]]) -> lis
                 ),
             ))
             continue
-        if matchscore_service.compute_absent(match_id, player.id):
+        if data.absent.get(player.id):
             notes.append(ReviewNote(
                 kind="absent",
                 message=f"{player.name} ({player.id}) did not drive - marked away, so expected{last}",
@@ -794,7 +1576,7 @@ def joined_after_start(joined_at: str | None, match_start: str | None) -> bool:
     locks the roster at the start, so this is not a no-show and not the player's doing.
 
     Only half the test: the caller also requires that the player has never driven, see
-    `matchscore_repo.has_ever_driven`. On its own a join date is too weak to excuse
+    `matchscore_repo.players_who_have_driven`. On its own a join date is too weak to excuse
     anyone, because it falls back to a seed-wide `created_at`.
 
     Both sides are plain `YYYY-MM-DD` local dates, so a string compare is the date
@@ -808,14 +1590,14 @@ def joined_after_start(joined_at: str | None, match_start: str | None) -> bool:
     return joined_at > match_start
 
 
-def _outlier_notes(match_id: int, rows: Sequence[tuple[VideoEntry, str]]) -> list[ReviewNote]:
+def _outlier_notes(rows: Sequence[tuple[VideoEntry, str]], data: _ReviewData) -> list[ReviewNote]:
     """Measured against the team's own shift, not against the player's average alone -
     a hard track set drags everyone down and would otherwise flag the whole roster."""
     deviations = []
     for entry, name in rows:
         if entry.score <= 0:
             continue
-        history = matchscore_repo.recent_scores(entry.pid, exclude_match_id=match_id)
+        history = data.history.get(entry.pid, [])
         if len(history) < MIN_HISTORY_FOR_OUTLIER:
             continue
         average = sum(history) / len(history)
@@ -848,8 +1630,20 @@ def build_notes(
     match_id: int,
     rows: Sequence[tuple[VideoEntry, str]],
 ) -> list[ReviewNote]:
-    notes: list[ReviewNote] = []
     match = match_repo.get_match(match_id)
+    roster = _active_roster() if match is not None else []
+    return _build_notes(results, match_id=match_id, rows=rows, data=_review_data(match_id, match, roster, rows))
+
+
+def _build_notes(
+    results: VideoResults,
+    *,
+    match_id: int,
+    rows: Sequence[tuple[VideoEntry, str]],
+    data: _ReviewData,
+) -> list[ReviewNote]:
+    notes: list[ReviewNote] = []
+    match = data.match
 
     if match is not None and results.opponent:
         verdict, _ = compare_opponent(results.opponent, match.opponent)
@@ -861,8 +1655,8 @@ def build_notes(
             ))
 
     notes.extend(_name_notes(rows))
-    notes.extend(_absence_notes(match_id, rows))
-    notes.extend(_outlier_notes(match_id, rows))
+    notes.extend(_absence_notes(rows, data))
+    notes.extend(_outlier_notes(rows, data))
     return notes
 
 
@@ -873,14 +1667,18 @@ def apply_results(
     force: bool = False,
     dry_run: bool = False,
 ) -> ApplyOutcome:
-    if match_repo.get_match(match_id) is None:
+    match = match_repo.get_match(match_id)
+    if match is None:
         return ApplyOutcome(status="NO_MATCH")
 
-    errors, warnings, rows = validate_results(results, match_id=match_id, force=force)
+    roster = _active_roster()
+    errors, warnings, rows = _validate(results, match_id=match_id, match=match, roster=roster, force=force)
     if errors:
         return ApplyOutcome(status="VALIDATION_ERRORS", errors=errors, warnings=warnings, results=results, rows=rows)
 
-    notes = build_notes(results, match_id=match_id, rows=rows)
+    notes = _build_notes(
+        results, match_id=match_id, rows=rows, data=_review_data(match_id, match, roster, rows)
+    )
 
     if dry_run:
         return ApplyOutcome(status="DRY_RUN", warnings=warnings, results=results, rows=rows, notes=notes)
@@ -913,6 +1711,7 @@ def apply_results(
         match_id,
         {"score_ladys": results.score_ladys, "score_opponent": results.score_opponent},
     ) > 0
+    video_job_repo.set_stage("standings", video_job_repo.match_key(match_id), "applied")
 
     return ApplyOutcome(
         status="APPLIED",
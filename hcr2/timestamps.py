@@ -5,8 +5,9 @@ Two conventions live in the database and must not be mixed up:
 - `created_at`, `last_modified` and `active_modified` are written by SQLite
   (column DEFAULT and the players triggers) via CURRENT_TIMESTAMP, which is
   **UTC**. Show them through `to_local()`.
-- `away_from` / `away_until` are written by Python in **local** time and are
-  compared against local time in the absence logic. Leave them alone.
+- `away_from` / `away_until` (on `players` and in `away_period`) are written by
+  Python in **local** time and are compared against local time in the absence
+  logic. Leave them alone.
 """
 
 from __future__ import annotations
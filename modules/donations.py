@@ -229,10 +229,7 @@ def show_all_stats():
             donation_output.print_no_active_players()
             return
 
-        rows = []
-        for pid, name in players:
-            stats = donation_service.calculate_stats(donation_repo.list_player_totals(pid))
-            rows.append((pid, name, stats))
+        rows = donation_service.calculate_stats_by_player(players, donation_repo.list_active_player_totals())
         donation_output.print_all_stats(rows)
 
     except Exception as e:
@@ -253,17 +250,8 @@ def _compute_donation_index_results():
     if cutoff_date is None:
         return None, []
 
-    players = donation_repo.list_active_plte_players()
-    if not players:
-        return cutoff_date, []
-
-    results = []
-    for pid, name in players:
-        matches = donation_repo.count_player_matches_between(pid, STATS_START_DATE, cutoff_date)
-        total = donation_repo.get_player_latest_total(pid, cutoff_date)
-        results.append(donation_service.build_index_row(pid, name, matches, total))
-
-    return cutoff_date, results
+    inputs = donation_repo.list_donation_index_inputs(STATS_START_DATE, cutoff_date)
+    return cutoff_date, donation_service.build_index_rows(inputs)
 
 
 # ---------------- New Stats / Index (all) ---------------- #
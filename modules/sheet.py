@@ -7,6 +7,7 @@ from hcr2.output import sheets as sheet_output
 from hcr2.services import sheets as sheet_service
 from modules.common import (
     DB_PATH,
+    get_arg_value,
     is_absent_on,
     is_help_request,
     parse_date_or_none,
@@ -149,6 +150,7 @@ def import_donations_from_excel(db_path: str = DB_PATH, local_xlsx: Optional[Pat
 # ===================== CLI =====================
 
 USAGE_SHEET_CREATE = "Usage: sheet create <match_id>"
+USAGE_SHEET_CREATE_SEASON = "Usage: sheet create-season <season>"
 USAGE_SHEET_IMPORT = "Usage: sheet import <match_id>"
 USAGE_SHEET_PLAYER = "Usage: sheet player <export|import>"
 USAGE_SHEET_DONATIONS = "Usage: sheet donations <export|import>"
@@ -158,6 +160,7 @@ def print_help():
         usage="hcr2.py sheet <command> [options]",
         commands=[
             ("create <match_id>", "Create one Excel file and upload it to Nextcloud"),
+            ("create-season <season>", "Create the Excel files for every match of a season"),
             ("import <match_id>", "Import scores from one Excel file on Nextcloud"),
             ("player export", "Export active PLTE players to Ladys.xlsx"),
             ("player import", "Import active PLTE players from Ladys.xlsx"),
@@ -174,6 +177,7 @@ def handle_command(command, args):
 
     handlers = {
         "create": _handle_create,
+        "create-season": _handle_create_season,
         "import": _handle_import,
         "player": _handle_player,
         "donations": _handle_donations,
@@ -217,6 +221,33 @@ def _handle_create(args):
     sheet_output.print_match_sheet_link_created(outcome.markdown_link or "", outcome.created)
 
 
+def _handle_create_season(args):
+    raw = get_arg_value(args, "season")
+    if raw is None:
+        if len(args) != 1:
+            print(USAGE_SHEET_CREATE_SEASON)
+            return
+        raw = args[0]
+    season = parse_int(raw, default=None)
+    if season is None:
+        sheet_output.print_invalid_season()
+        return
+
+    outcome = sheet_service.export_season_match_sheets(
+        DB_PATH,
+        season,
+        output_path=sheet_service.NEXTCLOUD_BASE,
+        workbook_builder=excel_exporter.build_match_sheet_workbook,
+        workbook_saver=excel_exporter.save_workbook,
+        absent_checker=_is_absent_on_match_day,
+    )
+    if outcome.status == "NO_MATCHES":
+        sheet_output.print_no_season_matches(season)
+        return
+
+    sheet_output.print_season_sheets_result(outcome)
+
+
 def _handle_import(args):
     match_id = _parse_match_id_arg(args, USAGE_SHEET_IMPORT)
     if match_id is None:
@@ -2,15 +2,19 @@
 """CLI adapter for the final-standings video pipeline."""
 from __future__ import annotations
 
+import re
 from pathlib import Path
 from typing import Callable
 
+from hcr2.exporters import png as png_exporter
 from hcr2.output import distances as distance_output
 from hcr2.output import rosters as roster_output
 from hcr2.output import videos as video_output
 from hcr2.repositories import matches as match_repo
 from hcr2.services import distances as distance_service
+from hcr2.services import frames as frame_service
 from hcr2.services import rosters as roster_service
+from hcr2.services import video_jobs as video_job_service
 from hcr2.services import videos as video_service
 from modules.common import (
     get_arg_value,
@@ -21,21 +25,31 @@ from modules.common import (
 )
 
 
-USAGE_LIST = "Usage: video list --match <match_id>"
-USAGE_PULL = "Usage: video pull --match <match_id> [--file <name>]"
+USAGE_LIST = "Usage: video list --match <match_id> [--refresh]"
+USAGE_PULL = "Usage: video pull --match <match_id> [--file <name>] [--refresh]"
 USAGE_FRAMES = (
-    "Usage: video frames --match <match_id> [--file <name>] [--fps <n>] "
-    "[--width <px>] [--crop <w:h:x:y>] [--start <hh:mm:ss>] [--duration <sec>]"
+    "Usage: video frames --match <match_id> [--file <name>] [--refresh] [--fps <n>] "
+    "[--width <px>] [--crop <w:h:x:y|auto|none>] [--start <hh:mm:ss>] [--duration <sec>] "
+    "[--mode fps|scene] [--threshold <0-1>] [--dedupe <bits|off>] [--jobs <n>] [--jpeg]"
 )
+USAGE_STITCH = (
+    "Usage: video stitch --match <match_id> [--file <name>] [--refresh] [--fps <n>] [--width <px>] "
+    "[--crop <w:h:x:y|auto|none>] [--start <hh:mm:ss>] [--duration <sec>]"
+)
+USAGE_WORKER = "Usage: video worker [--workers <n>] [--refresh] [--retry]"
 USAGE_ROSTER = "Usage: video roster [--match <match_id>]"
 USAGE_APPLY = "Usage: video apply --match <match_id> [--file <results.json>] [--dry-run] [--force]"
 USAGE_PLAYER = "Usage: video player <frames|apply>"
 USAGE_CHEST = "Usage: video chest <frames|apply> --year <yyyy> --week <n> [options]"
-USAGE_CHEST_FRAMES = "Usage: video chest frames --year <yyyy> --week <n> [--file <name>] [--fps <n>] [--width <px>]"
+USAGE_CHEST_FRAMES = (
+    "Usage: video chest frames --year <yyyy> --week <n> [--file <name>] [--refresh] [--fps <n>] [--width <px>] "
+    "[--crop <w:h:x:y|auto|none>] [--mode fps|scene] [--threshold <0-1>] [--dedupe <bits|off>] [--jobs <n>] [--jpeg]"
+)
 USAGE_CHEST_APPLY = "Usage: video chest apply --year <yyyy> --week <n> [--file <chest.json>] [--dry-run] [--force]"
 USAGE_PLAYER_FRAMES = (
-    "Usage: video player frames [--file Ladys.mp4] [--fps <n>] [--width <px>] "
-    "[--crop <w:h:x:y>] [--start <hh:mm:ss>] [--duration <sec>]"
+    "Usage: video player frames [--file Ladys.mp4] [--refresh] [--fps <n>] [--width <px>] "
+    "[--crop <w:h:x:y|auto|none>] [--start <hh:mm:ss>] [--duration <sec>] [--mode fps|scene] [--threshold <0-1>] "
+    "[--dedupe <bits|off>] [--jobs <n>] [--jpeg]"
 )
 
 
@@ -46,9 +60,12 @@ def print_help():
             ("list --match <match_id>", "List video files in the match's season folder"),
             ("pull --match <match_id> [--file <name>]", "Download the match video from Nextcloud"),
             (
-                "frames --match <match_id> [--fps <n>] [--width <px>] [--crop <w:h:x:y>]",
+                "frames --match <match_id> [--fps <n>] [--width <px>] [--crop <w:h:x:y|auto|none>]",
                 "Cut the video into frames with ffmpeg",
             ),
+            ("stitch --match <match_id> [--fps <n>] [--crop auto]", "Stitch the scrolling standings into tall images"),
+            ("worker [--workers <n>] [--retry]", "Queue new recordings, then pull and cut them in parallel"),
+            ("jobs [--all]", "Show the video job queue and what each job waits for"),
             ("roster [--match <match_id>]", "Show active PLTE players for name matching"),
             (
                 "apply --match <match_id> [--file <results.json>] [--dry-run] [--force]",
@@ -70,6 +87,17 @@ def print_help():
             "apply refuses to write unless the points sum equals score_ladys (--force overrides).",
             "The team screen video (Ladys.mp4) sits in Ladys/, the chest videos in Wochen-Truhe/<year>/w<week>.mp4.",
             "player apply refuses to write while an addition has no new/reactivate decision.",
+            "Folder listings are cached for a minute; --refresh asks Nextcloud again (done automatically when nothing is found).",
+            "frames --mode scene keeps a frame only when the picture changed (--threshold, default "
+            f"{video_service.DEFAULT_SCENE_THRESHOLD}) instead of sampling --fps.",
+            "frames drops frames within --dedupe bits (perceptual hash, default "
+            f"{frame_service.DEFAULT_DEDUPE_DISTANCE}) of the last kept one and lists the rest in frames.json.",
+            "frames --crop auto finds the scrolling list region and keeps it for later videos of the same kind; "
+            "--crop none switches the saved one off.",
+            "frames --jobs <n> decodes n time segments of a long video side by side (one per CPU core is plenty).",
+            "frames lists the kept frames in frames.json; --jpeg also writes them as JPEGs to read (the worker always does).",
+            "worker looks through the latest season, chest and team folders; a stopped worker resumes where "
+            f"it was, and a job that failed {video_job_service.MAX_ATTEMPTS} runs in a row waits for --retry.",
         ],
     )
 
@@ -83,6 +111,9 @@ def handle_command(command, args):
         "list": _handle_list,
         "pull": _handle_pull,
         "frames": _handle_frames,
+        "stitch": _handle_stitch,
+        "worker": _handle_worker,
+        "jobs": _handle_jobs,
         "roster": _handle_roster,
         "apply": _handle_apply,
         "player": _handle_player,
@@ -119,7 +150,10 @@ def _handle_list(args):
         return
 
     folder = video_service.season_folder(match.season_number)
-    candidates = video_service.list_candidates(match.season_number)
+    refresh = _wants_refresh(args)
+    candidates = video_service.list_candidates(match.season_number, refresh=refresh)
+    if not candidates and not refresh:
+        candidates = video_service.list_candidates(match.season_number, refresh=True)
     if not candidates:
         video_output.print_no_video_found(folder, match_id=match_id)
         return
@@ -130,10 +164,34 @@ def _handle_pull(args):
     match_id = _match_id_from(args, USAGE_PULL)
     if match_id is None:
         return
-    outcome = video_service.pull_video(match_id, filename=get_arg_value(args, "file"))
+    outcome = _with_fresh_listing(
+        args,
+        lambda refresh: video_service.pull_video(
+            match_id, filename=get_arg_value(args, "file"), progress=video_output.download_progress(), refresh=refresh
+        ),
+    )
     _report_pull(outcome, match_id=match_id, filename=get_arg_value(args, "file"))
 
 
+def _wants_refresh(args) -> bool:
+    return get_arg_value(args, "refresh") is not None
+
+
+def _wants_images(args) -> bool:
+    return get_arg_value(args, "jpeg") is not None
+
+
+def _with_fresh_listing(args, run: Callable[[bool], object]):
+    """Run with the cached listing first; a video uploaded within the cache's minute
+    is not in it yet, so "not found" earns one retry against a fresh listing."""
+    refresh = _wants_refresh(args)
+    outcome = run(refresh)
+    pull = getattr(outcome, "pull", outcome)
+    if not refresh and pull is not None and pull.status in ("NO_VIDEO", "NOT_FOUND"):
+        outcome = run(True)
+    return outcome
+
+
 def _report_pull(outcome, *, match_id: int, filename: str | None) -> bool:
     if outcome.status == "NO_MATCH":
         video_output.print_no_match_found()
@@ -159,18 +217,30 @@ def _handle_frames(args):
 
     filename = get_arg_value(args, "file")
     fps = _parse_fps(get_arg_value(args, "fps"))
-    if fps is None:
+    selection = _parse_selection(args)
+    if fps is None or selection is None or not _valid_crop(get_arg_value(args, "crop")):
         print(USAGE_FRAMES)
         return
-
-    outcome = video_service.extract_frames(
-        match_id,
-        fps=fps,
-        width=parse_int(get_arg_value(args, "width"), default=video_service.DEFAULT_WIDTH),
-        crop=get_arg_value(args, "crop"),
-        start=get_arg_value(args, "start"),
-        duration=get_arg_value(args, "duration"),
-        filename=filename,
+    mode, threshold, dedupe, jobs = selection
+
+    outcome = _with_fresh_listing(
+        args,
+        lambda refresh: video_service.extract_frames(
+            match_id,
+            fps=fps,
+            width=parse_int(get_arg_value(args, "width"), default=video_service.DEFAULT_WIDTH),
+            crop=get_arg_value(args, "crop"),
+            start=get_arg_value(args, "start"),
+            duration=get_arg_value(args, "duration"),
+            mode=mode,
+            threshold=threshold,
+            dedupe=dedupe,
+            jobs=jobs,
+            keep_images=_wants_images(args),
+            filename=filename,
+            progress=video_output.download_progress(),
+            refresh=refresh,
+        ),
     )
     if outcome.status == "NO_VIDEO" and outcome.pull is not None:
         _report_pull(outcome.pull, match_id=match_id, filename=filename)
@@ -180,6 +250,60 @@ def _handle_frames(args):
     video_output.print_frames_outcome(outcome)
 
 
+def _handle_stitch(args):
+    match_id = _match_id_from(args, USAGE_STITCH)
+    if match_id is None:
+        return
+
+    filename = get_arg_value(args, "file")
+    raw_fps = get_arg_value(args, "fps")
+    fps = _parse_fps(raw_fps) if raw_fps is not None else video_service.STITCH_FPS
+    if fps is None or not _valid_crop(get_arg_value(args, "crop")):
+        print(USAGE_STITCH)
+        return
+
+    outcome = _with_fresh_listing(
+        args,
+        lambda refresh: video_service.stitch_video(
+            match_id,
+            tile_writer=png_exporter.write_png,
+            fps=fps,
+            width=parse_int(get_arg_value(args, "width"), default=video_service.DEFAULT_WIDTH),
+            crop=get_arg_value(args, "crop"),
+            start=get_arg_value(args, "start"),
+            duration=get_arg_value(args, "duration"),
+            filename=filename,
+            progress=video_output.download_progress(),
+            refresh=refresh,
+        ),
+    )
+    if outcome.status == "NO_VIDEO" and outcome.pull is not None:
+        _report_pull(outcome.pull, match_id=match_id, filename=filename)
+        return
+    if outcome.pull is not None:
+        video_output.print_pull_outcome(outcome.pull, match_id=match_id)
+    video_output.print_stitch_outcome(outcome)
+
+
+def _handle_worker(args):
+    raw = get_arg_value(args, "workers")
+    workers = video_job_service.DEFAULT_WORKERS if raw is None else parse_int(raw, default=None)
+    if workers is None or workers < 1:
+        print(USAGE_WORKER)
+        return
+
+    outcome = video_job_service.run_worker(
+        workers=workers,
+        retry=get_arg_value(args, "retry") is not None,
+        refresh=_wants_refresh(args),
+    )
+    video_output.print_worker_outcome(outcome)
+
+
+def _handle_jobs(args):
+    video_output.print_jobs(video_job_service.list_queue(include_applied=get_arg_value(args, "all") is not None))
+
+
 def _handle_chest(args):
     if not args or args[0] not in ("frames", "apply"):
         print(USAGE_CHEST)
@@ -197,19 +321,31 @@ def _handle_chest(args):
         return
 
     fps = _parse_fps(get_arg_value(rest, "fps"))
-    if fps is None:
+    selection = _parse_selection(rest)
+    if fps is None or selection is None or not _valid_crop(get_arg_value(rest, "crop")):
         print(USAGE_CHEST_FRAMES)
         return
-
-    outcome = video_service.extract_chest_frames(
-        year,
-        week,
-        fps=fps,
-        width=parse_int(get_arg_value(rest, "width"), default=video_service.DEFAULT_WIDTH),
-        crop=get_arg_value(rest, "crop"),
-        start=get_arg_value(rest, "start"),
-        duration=get_arg_value(rest, "duration"),
-        filename=get_arg_value(rest, "file"),
+    mode, threshold, dedupe, jobs = selection
+
+    outcome = _with_fresh_listing(
+        rest,
+        lambda refresh: video_service.extract_chest_frames(
+            year,
+            week,
+            fps=fps,
+            width=parse_int(get_arg_value(rest, "width"), default=video_service.DEFAULT_WIDTH),
+            crop=get_arg_value(rest, "crop"),
+            start=get_arg_value(rest, "start"),
+            duration=get_arg_value(rest, "duration"),
+            mode=mode,
+            threshold=threshold,
+            dedupe=dedupe,
+            jobs=jobs,
+            keep_images=_wants_images(rest),
+            filename=get_arg_value(rest, "file"),
+            progress=video_output.download_progress(),
+            refresh=refresh,
+        ),
     )
     if outcome.pull is not None and outcome.pull.status in ("NO_VIDEO", "NOT_FOUND", "DOWNLOAD_FAILED"):
         video_output.print_team_video_missing(
@@ -253,6 +389,46 @@ def _parse_fps(raw: str | None):
     return fps if fps > 0 else None
 
 
+def _valid_crop(raw: str | None) -> bool:
+    if raw is None or raw.strip().lower() in (video_service.CROP_AUTO, video_service.CROP_NONE):
+        return True
+    return re.fullmatch(r"\d+:\d+:\d+:\d+", raw.strip()) is not None
+
+
+def _parse_selection(args):
+    """(mode, scene threshold, dedupe distance or None, jobs) from
+    --mode/--threshold/--dedupe/--jobs, None when any of them is invalid."""
+    mode = (get_arg_value(args, "mode") or video_service.DEFAULT_MODE).strip().lower()
+    if mode not in video_service.FRAME_MODES:
+        return None
+
+    threshold = video_service.DEFAULT_SCENE_THRESHOLD
+    raw = get_arg_value(args, "threshold")
+    if raw is not None:
+        try:
+            threshold = float(raw)
+        except ValueError:
+            return None
+        if not 0 < threshold < 1:
+            return None
+
+    dedupe = frame_service.DEFAULT_DEDUPE_DISTANCE
+    raw = get_arg_value(args, "dedupe")
+    if raw is not None:
+        if raw.strip().lower() == "off":
+            dedupe = None
+        else:
+            dedupe = parse_int(raw, default=None)
+            if dedupe is None or not 0 <= dedupe < 64:
+                return None
+
+    raw = get_arg_value(args, "jobs")
+    jobs = video_service.DEFAULT_JOBS if raw is None else parse_int(raw, default=None)
+    if jobs is None or jobs < 1:
+        return None
+    return mode, threshold, dedupe, jobs
+
+
 def _handle_roster(args):
     raw = get_arg_value(args, "match")
     match_id = parse_int(raw, default=None) if raw is not None else None
@@ -305,17 +481,29 @@ def _handle_player(args):
 
 def _handle_player_frames(args):
     fps = _parse_fps(get_arg_value(args, "fps"))
-    if fps is None:
+    selection = _parse_selection(args)
+    if fps is None or selection is None or not _valid_crop(get_arg_value(args, "crop")):
         print(USAGE_PLAYER_FRAMES)
         return
-
-    outcome = video_service.extract_team_frames(
-        fps=fps,
-        width=parse_int(get_arg_value(args, "width"), default=video_service.DEFAULT_WIDTH),
-        crop=get_arg_value(args, "crop"),
-        start=get_arg_value(args, "start"),
-        duration=get_arg_value(args, "duration"),
-        filename=get_arg_value(args, "file") or video_service.TEAM_VIDEO_NAME,
+    mode, threshold, dedupe, jobs = selection
+
+    outcome = _with_fresh_listing(
+        args,
+        lambda refresh: video_service.extract_team_frames(
+            fps=fps,
+            width=parse_int(get_arg_value(args, "width"), default=video_service.DEFAULT_WIDTH),
+            crop=get_arg_value(args, "crop"),
+            start=get_arg_value(args, "start"),
+            duration=get_arg_value(args, "duration"),
+            mode=mode,
+            threshold=threshold,
+            dedupe=dedupe,
+            jobs=jobs,
+            keep_images=_wants_images(args),
+            filename=get_arg_value(args, "file") or video_service.TEAM_VIDEO_NAME,
+            progress=video_output.download_progress(),
+            refresh=refresh,
+        ),
     )
     filename = get_arg_value(args, "file") or video_service.TEAM_VIDEO_NAME
     if outcome.pull is not None and outcome.pull.status in ("NO_VIDEO", "NOT_FOUND", "DOWNLOAD_FAILED"):
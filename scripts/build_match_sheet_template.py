@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Regenerate hcr2/exporters/templates/match_sheet.xlsx.
+
+The exporter only fills the template, so layout changes (help text, widths,
+alignments) are made here and the template is rebuilt and committed:
+
+    python3 scripts/build_match_sheet_template.py
+
+Placeholders in braces are filled per match by `build_match_sheet_workbook`.
+Row 4 is the prototype player row: its values and styles are copied for every
+player and the row itself is not part of the output.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment
+
+MATCH_SHEET_TEMPLATE = Path(__file__).resolve().parents[1] / "hcr2" / "exporters" / "templates" / "match_sheet.xlsx"
+
+
+HELP_TEXT = (
+    "H1: Did not drive: enter Score=0 and Points=0.\n"
+    "H2: Set Absent to true when a player is excused (vacation etc.).\n"
+    "H3: Set Checkin to true when a player logged into the match but did not drive.\n"
+    "H4: If a player left the team but is still listed, delete the row.\n"
+    "H5: If a player is missing, add them with the correct ID.\n"
+    "H6: If a missing player has not been created yet, enter 'a' for add in column B instead of the ID. The player is created during import.\n"
+    "H7: Enter the match results in cell C2 (Ladies) and D2 (opponent).\n"
+    "H8: Column C (Player) may be corrected when someone changed their name; the new name is stored during import. Leave it as it is otherwise, and never use it for notes — use column H."
+)
+
+COLUMN_WIDTHS = {"A": 15, "B": 20, "C": 26, "D": 20, "E": 20, "F": 8, "G": 9, "H": 130}
+
+
+def build_template() -> Workbook:
+    center = Alignment(horizontal="center", vertical="center")
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Match Info"
+
+    ws.append(["Match ID: {match_id}", "Date: {date}", "Season: {season}", "Opponent: {opponent}", "Event: {event}"])
+    # The result cells are placeholders: openpyxl does not store an empty string, and
+    # the sheet has always handed them out as "" to be typed over.
+    ws.append(["Result", "Power Ladies -->", "{score_ladys}", "{score_opponent}", "<-- {opponent}"])
+    ws.append(["MatchID", "PlayerID", "Player", "Score", "Points", "Absent", "Checkin", HELP_TEXT])
+    ws.append(["{match_id}", "{player_id}", "{player}", "", "", "{absent}", "", ""])
+
+    for row in ws.iter_rows(min_row=3, max_row=3, min_col=1, max_col=7):
+        for cell in row:
+            cell.alignment = center
+    for row in ws.iter_rows(min_row=1, max_row=4, min_col=1, max_col=2):
+        for cell in row:
+            cell.alignment = center
+    ws["H3"].alignment = Alignment(wrap_text=True, vertical="top")
+
+    for column, width in COLUMN_WIDTHS.items():
+        ws.column_dimensions[column].width = width
+    return wb
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Regenerate the match sheet template.")
+    parser.add_argument("--out", type=Path, default=MATCH_SHEET_TEMPLATE, help="Target path of the template.")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    build_template().save(args.out)
+    print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,7 @@
 """Contract tests for the coupling between bot.py and the CLI.
 
-bot.py does not import the package - it shells out to hcr2.py and parses the
-printed output with regexes. That makes the output format a contract, and these
+bot.py does not get its answers from the package - it shells out to hcr2.py
+and parses the printed output with regexes. That makes the output format a contract, and these
 tests pin it: they render real CLI output through the same code paths the CLI
 uses and then parse it with bot.py's own patterns. If someone reformats
 hcr2/output/players.py, this fails instead of the Discord bot.
@@ -12,7 +12,10 @@ its config at import time.
 
 from __future__ import annotations
 
+import asyncio
+import sqlite3
 import sys
+import threading
 import types
 from unittest import mock
 
@@ -161,3 +164,103 @@ class DiscordMessageLengthTests(TemporaryDatabaseTestCase):
 
         self.assertLessEqual(len(output) + bot.CODEBLOCK_FENCE_LEN, bot.MAX_DISCORD_MSG_LEN)
 
+
+
+class ResponseCacheTests(TemporaryDatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.now = 1000.0
+        self.cache = bot.ResponseCache(self.db_path, ttl=60, clock=lambda: self.now)
+        self.calls: list[list[str]] = []
+        self.in_flight = bot.InFlight()
+        for name, value in (
+            ("response_cache", self.cache), ("in_flight", self.in_flight), ("run_hcr2_sync", self.fake_cli)
+        ):
+            patch = mock.patch.object(bot, name, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def fake_cli(self, args):
+        self.calls.append(list(args))
+        return bot.CliResult(f"answer {len(self.calls)}")
+
+    def run_cli(self, args):
+        return asyncio.run(bot.run_hcr2(args))
+
+    def test_read_only_answers_are_reused_until_a_write_has_run(self) -> None:
+        self.assertEqual(self.run_cli(["stats", "perf"]), "answer 1")
+        self.assertEqual(self.run_cli([" stats", "perf "]), "answer 1")
+        self.assertEqual(self.run_cli(["stats", "perf", "3"]), "answer 2")
+
+        self.run_cli(["player", "edit", "1", "--gp", "6000"])
+        self.assertEqual(self.run_cli(["stats", "perf"]), "answer 4")
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual((self.cache.hits, self.cache.invalidations["write"]), (1, 1))
+
+    def test_a_commit_from_outside_or_the_ttl_empties_the_cache(self) -> None:
+        self.run_cli(["player", "show", "1"])
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE players SET garage_power = 6000 WHERE id = 1")
+        self.assertEqual(self.run_cli(["player", "show", "1"]), "answer 2")
+        self.assertEqual(self.cache.invalidations["database"], 1)
+
+        self.now += 61
+        self.assertEqual(self.run_cli(["player", "show", "1"]), "answer 3")
+        self.assertEqual(self.cache.expired, 1)
+        self.assertIn("1 database changes", self.cache.describe())
+
+    def test_an_answer_computed_across_a_write_is_not_kept(self) -> None:
+        generation = self.cache.generation
+        self.cache.invalidate("write")
+        self.cache.put(("match", "list"), bot.CliResult("old"), generation)
+        self.assertIsNone(self.cache.get(("match", "list")))
+
+        self.cache.put(("match", "list"), bot.CliResult("new"), self.cache.generation)
+        self.assertEqual(self.cache.invalidate("clear"), 1)
+
+    def held_cli(self, release: threading.Event):
+        """The fake CLI, with `stats` calls held until `release` is set."""
+        def run(args):
+            if args[0] == "stats":
+                release.wait(5)
+            return self.fake_cli(args)
+        return run
+
+    def test_identical_calls_at_the_same_time_share_one_run(self) -> None:
+        release = threading.Event()
+
+        async def burst():
+            stats = [asyncio.ensure_future(bot.run_hcr2(["stats", "perf"])) for _ in range(3)]
+            other = asyncio.ensure_future(bot.run_hcr2(["match", "list"]))
+            await asyncio.sleep(0)
+            release.set()
+            return await asyncio.gather(*stats), await other
+
+        with mock.patch.object(bot, "run_hcr2_sync", self.held_cli(release)):
+            stats, other = asyncio.run(burst())
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertTrue(all(result is stats[0] for result in stats))
+        self.assertNotEqual(other, stats[0])
+        self.assertEqual((self.in_flight.started, self.in_flight.joined), (2, 2))
+        self.assertEqual(self.in_flight.running, {})
+        self.assertIn("2 calls joined", self.in_flight.describe())
+
+    def test_a_call_after_a_write_does_not_join_a_run_from_before_it(self) -> None:
+        release = threading.Event()
+
+        async def read_write_read():
+            before = asyncio.ensure_future(bot.run_hcr2(["stats", "perf"]))
+            await asyncio.sleep(0)
+            await bot.run_hcr2(["matchscore", "edit", "1", "--absent", "toggle"])
+            after = asyncio.ensure_future(bot.run_hcr2(["stats", "perf"]))
+            await asyncio.sleep(0)
+            release.set()
+            return await before, await after
+
+        with mock.patch.object(bot, "run_hcr2_sync", self.held_cli(release)):
+            before, after = asyncio.run(read_write_read())
+
+        self.assertNotEqual(before, after)
+        self.assertEqual(self.in_flight.joined, 0)
+        self.assertIs(self.cache.get(("stats", "perf")), after)
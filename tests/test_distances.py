@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import sqlite3
 import unittest
+from unittest import mock
 
+from hcr2.db.migrations import MIGRATIONS_DIR
 from hcr2.repositories import distances as distance_repo
 from hcr2.repositories import players as player_repo
 from hcr2.services import distances as distance_service
@@ -40,6 +43,27 @@ class DistanceServiceTests(TemporaryDatabaseTestCase):
         self.assertAlmostEqual(row.average, 200.0)
         self.assertEqual(row.weeks, 3)
 
+    def test_the_rolling_average_runs_across_new_year(self) -> None:
+        # 2026-W01 follows 2025-W52 directly; year*100+week put 48 weeks between them.
+        for year, week, km in ((2025, 51, 100), (2025, 52, 200), (2026, 1, 300)):
+            distance_service.add_distance(player_input="1", year=year, week=week, km=km)
+        row = distance_service.ranking(2026, 1)[0]
+        self.assertAlmostEqual(row.average, 200.0)
+        self.assertEqual(row.weeks, 3)
+
+    def test_the_rolling_average_covers_the_last_window_entries(self) -> None:
+        for week in range(1, distance_repo.AVERAGE_WINDOW + 3):
+            distance_service.add_distance(player_input="1", year=2026, week=week, km=week * 10)
+        last_week = distance_repo.AVERAGE_WINDOW + 2
+        row = distance_service.ranking(2026, last_week)[0]
+        expected = [week * 10 for week in range(last_week - distance_repo.AVERAGE_WINDOW + 1, last_week + 1)]
+        self.assertAlmostEqual(row.average, sum(expected) / len(expected))
+        self.assertAlmostEqual(row.average, player_repo.get_player_detail(1).avg_km)
+
+    def test_week_ordinals_are_continuous_across_year_ends(self) -> None:
+        self.assertEqual(distance_repo.week_ordinal(2026, 1) - distance_repo.week_ordinal(2025, 52), 1)
+        self.assertEqual(distance_repo.week_ordinal(2021, 1) - distance_repo.week_ordinal(2020, 53), 1)
+
     def test_history_reports_the_rank_within_each_week(self) -> None:
         distance_service.add_distance(player_input="1", year=2026, week=34, km=100)
         distance_service.add_distance(player_input="2", year=2026, week=34, km=300)
@@ -95,6 +119,21 @@ class DistanceImportTests(TemporaryDatabaseTestCase):
         )
         self.assertEqual((result.status, result.imported, result.total), ("IMPORTED", 2, 400))
 
+    def test_the_week_is_validated_with_one_player_lookup(self) -> None:
+        with mock.patch.object(player_repo, "get_player_names", wraps=player_repo.get_player_names) as lookup:
+            result = distance_service.import_week(
+                year=2026, week=1, entries=[{"pid": 1, "km": 100}, {"pid": 2, "km": 300}, {"pid": 99, "km": 5}]
+            )
+        lookup.assert_called_once()
+        self.assertEqual(result.errors, ["player 99 does not exist"])
+        self.assertEqual(distance_service.ranking(2026, 1), [])
+
+    def test_an_imported_week_lands_in_the_new_year_ranking(self) -> None:
+        distance_service.add_distance(player_input="1", year=2025, week=52, km=100)
+        distance_service.import_week(year=2026, week=1, entries=[{"pid": 1, "km": 300}])
+        row = distance_service.ranking(2026, 1)[0]
+        self.assertEqual((row.km, row.average), (300, 200.0))
+
 
 class DistanceProfileTests(TemporaryDatabaseTestCase):
     def test_the_profile_averages_the_recent_weeks(self) -> None:
@@ -112,6 +151,23 @@ class DistanceProfileTests(TemporaryDatabaseTestCase):
         self.assertEqual(player_repo.DISTANCE_AVERAGE_WINDOW, distance_repo.AVERAGE_WINDOW)
 
 
+class DistanceMigrationTests(TemporaryDatabaseTestCase):
+    def test_the_migration_backfills_the_same_ordinal_as_the_repository(self) -> None:
+        # The backfill SQL in 0004 and week_ordinal() must agree, or old and new
+        # rows would be windowed apart.
+        with sqlite3.connect(self.db_path) as conn:
+            sql = (MIGRATIONS_DIR / "0004_distance_week_ordinal.sql").read_text(encoding="utf-8")
+            expression = sql.split("SET week_ordinal =", 1)[1].split(";", 1)[0]
+            for year, week in ((2020, 53), (2021, 1), (2025, 52), (2026, 1), (2026, 34), (2027, 53)):
+                conn.execute(
+                    "INSERT INTO distance (player_id, year, week, km) VALUES (1, ?, ?, 1)", (year, week)
+                )
+                stored = conn.execute(
+                    f"SELECT {expression} FROM distance WHERE year = ? AND week = ?", (year, week)
+                ).fetchone()[0]
+                self.assertEqual(stored, distance_repo.week_ordinal(year, week), (year, week))
+
+
 class DistanceDeleteGuardTests(TemporaryDatabaseTestCase):
     def test_a_player_with_kilometres_cannot_be_deleted(self) -> None:
         distance_service.add_distance(player_input="1", year=2026, week=34, km=100)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import sqlite3
 
+from hcr2.repositories import donations as donation_repo
 from modules import donations
 from tests.support import TemporaryDatabaseTestCase
 
@@ -76,3 +77,41 @@ class DonationTests(TemporaryDatabaseTestCase):
 
         under_output = self.capture_stdout(donations.handle_command, "under", [])
         self.assertIn("ℹ️ No players with donation index below 100 in team PLTE.", under_output)
+
+    def test_set_based_queries_cover_every_active_player(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO players (id, name, alias, garage_power, active, birthday, team, discord_name, is_leader)
+                VALUES (?, ?, ?, ?, 1, NULL, 'PLTE', NULL, 0)
+                """,
+                [(3, "Carla", "carla", 3000), (4, "Dora", "dora", 2000)],
+            )
+            conn.execute(
+                """
+                INSERT INTO match (id, teamevent_id, season_number, start, opponent, score_ladys, score_opponent)
+                VALUES (2, 1, 2, '2025-11-05 18:00', 'Future Rivals', 200, 100)
+                """
+            )
+            conn.executemany(
+                "INSERT INTO matchscore (id, match_id, player_id, score, points, absent, checkin) VALUES (?, 2, ?, 1, 1, 0, 1)",
+                [(2, 1), (3, 3)],
+            )
+            conn.executemany(
+                "INSERT INTO donation (player_id, date, total) VALUES (?, ?, ?)",
+                [
+                    (1, "2025-11-15", 900),
+                    (1, "2025-11-01", 300),
+                    (3, "2025-11-01", 50),
+                    (3, "2025-11-20", 400),
+                    (2, "2025-11-01", 999),
+                ],
+            )
+
+        totals = donation_repo.list_active_player_totals()
+        self.assertEqual(sorted(totals), [1, 3])
+        self.assertEqual([(e.date, e.total, e.delta) for e in totals[1]], [("2025-11-01", 300, 0), ("2025-11-15", 900, 600)])
+        self.assertEqual([e.delta for e in totals[3]], [0, 350])
+
+        inputs = donation_repo.list_donation_index_inputs("2025-11-01", "2025-11-15")
+        self.assertEqual(inputs, [(1, "Alice", 1, 900), (3, "Carla", 1, 50), (4, "Dora", 0, 0)])
@@ -27,6 +27,27 @@ class ImportErrorReportingTests(TemporaryDatabaseTestCase):
         self.assertIn("donation for player 999", result.messages[0])
         self.assertIn("IntegrityError", result.messages[0])
 
+    def test_donation_import_rejects_bad_rows_before_writing_the_rest(self) -> None:
+        with mock.patch.object(sheet_service, "SQL_IN_CHUNK", 1):
+            result = sheet_service.import_donation_entries(
+                self.db_path, "2026-06-13", [(1, 12000), (2, -5), (999, 5000), (2, 8000)]
+            )
+
+        self.assertEqual(result.added, 2)
+        self.assertEqual(result.errors, 2)
+        self.assertEqual(
+            result.messages,
+            [
+                "donation for player 2: IntegrityError: CHECK constraint failed: total >= 0",
+                "donation for player 999: IntegrityError: FOREIGN KEY constraint failed",
+            ],
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT player_id, total FROM donation WHERE date = '2026-06-13' ORDER BY player_id"
+            ).fetchall()
+        self.assertEqual(rows, [(1, 12000), (2, 8000)])
+
     def test_donation_import_keeps_workbook_read_errors_in_the_report(self) -> None:
         result = sheet_service.import_donation_entries(
             self.db_path, "2026-06-13", [(1, 12000)], initial_errors=2
@@ -62,9 +83,14 @@ class ImportErrorReportingTests(TemporaryDatabaseTestCase):
 
 
 class NextcloudErrorReportingTests(TemporaryDatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        previous = nextcloud.set_client(nextcloud.WebDavClient())
+        self.addCleanup(nextcloud.set_client, previous)
+
     def test_network_failure_is_reported_on_stderr_without_leaking_the_account(self) -> None:
         with mock.patch.object(
-            nextcloud.requests, "get", side_effect=requests.ConnectionError("http://user@host/secret")
+            nextcloud.requests.Session, "request", side_effect=requests.ConnectionError("http://user@host/secret")
         ):
             with mock.patch("sys.stderr") as stderr:
                 result = nextcloud.download_file("Scores/x.xlsx", Path(self.tempdir.name) / "x.xlsx")
@@ -78,7 +104,7 @@ class NextcloudErrorReportingTests(TemporaryDatabaseTestCase):
 
     def test_http_status_is_reported_too(self) -> None:
         response = mock.Mock(status_code=404)
-        with mock.patch.object(nextcloud.requests, "get", return_value=response):
+        with mock.patch.object(nextcloud.requests.Session, "request", return_value=response):
             with mock.patch("sys.stderr") as stderr:
                 result = nextcloud.download_file("Scores/x.xlsx", Path(self.tempdir.name) / "x.xlsx")
 
@@ -87,7 +113,7 @@ class NextcloudErrorReportingTests(TemporaryDatabaseTestCase):
         self.assertIn("HTTP 404", written)
 
     def test_delete_failure_is_reported_and_still_returns_false(self) -> None:
-        with mock.patch.object(nextcloud.requests, "delete", side_effect=requests.Timeout("boom")):
+        with mock.patch.object(nextcloud.requests.Session, "request", side_effect=requests.Timeout("boom")):
             with mock.patch("sys.stderr") as stderr:
                 self.assertFalse(nextcloud.delete_file("Scores/x.xlsx"))
 
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from hcr2.models.video import FrameRecord, VideoFrame
+from hcr2.services import frames as frame_service
+
+
+def gradient(width: int, height: int, *, shift: int = 0) -> bytes:
+    """20 px rows shaded left to right and right to left in turn, moved by `shift` -
+    a list scrolled by that much."""
+    return bytes(
+        (x * 200 // width if (y + shift) // 20 % 2 else 200 - x * 200 // width)
+        for y in range(height)
+        for x in range(width)
+    )
+
+
+class FrameHashTests(unittest.TestCase):
+    def test_identical_and_noisy_frames_hash_close_and_moved_content_far(self) -> None:
+        frame = gradient(320, 240)
+        noisy = bytes(min(255, value + (index % 3)) for index, value in enumerate(frame))
+        moved = gradient(320, 240, shift=5)
+
+        base = frame_service.dhash(frame, 320, 240)
+        self.assertEqual(frame_service.hamming(base, frame_service.dhash(frame, 320, 240)), 0)
+        self.assertEqual(frame_service.hamming(base, frame_service.dhash(noisy, 320, 240)), 0)
+        self.assertGreater(
+            frame_service.hamming(base, frame_service.dhash(moved, 320, 240)), frame_service.DEFAULT_DEDUPE_DISTANCE
+        )
+
+    def test_a_thumbnail_of_hash_size_is_hashed_as_is(self) -> None:
+        rising = bytes(range(72))
+        self.assertEqual(frame_service.dhash(rising, 9, 8), 0)
+        self.assertEqual(frame_service.dhash(rising[::-1], 9, 8), 2 ** 64 - 1)
+
+    def test_duplicates_are_compared_with_the_last_kept_frame(self) -> None:
+        hashes = [0b0, 0b1, 0b11, 0b111, 0b1111, 0b0]
+        kept = list(frame_service.drop_near_duplicates(range(len(hashes)), hashes.__getitem__, max_distance=2))
+        # 1-3 are each one bit from their neighbour; only the drift to 4 bits counts.
+        self.assertEqual(kept, [0, 3, 5])
+
+
+class FrameStreamTests(unittest.TestCase):
+    def test_pgm_and_ppm_frames_are_read_from_one_stream(self) -> None:
+        gray = VideoFrame(index=0, width=4, height=2, channels=1, pixels=bytes(range(8)))
+        rgb = VideoFrame(index=1, width=2, height=1, channels=3, pixels=bytes(range(6)))
+        stream = io.BytesIO(
+            frame_service.pnm_bytes(gray) + b"P6 # comment\n2 1\n255\n" + rgb.pixels + b"P5\n4 2\n255\n\x00"
+        )
+        # The truncated third frame ends the stream quietly.
+        self.assertEqual(list(frame_service.read_pnm_frames(stream)), [gray, rgb])
+
+    def test_an_rgb_frame_hashes_like_its_gray_version(self) -> None:
+        pixels = gradient(180, 120)
+        gray = VideoFrame(index=0, width=180, height=120, channels=1, pixels=pixels)
+        rgb = VideoFrame(index=0, width=180, height=120, channels=3, pixels=bytes(v for v in pixels for _ in range(3)))
+        self.assertEqual(frame_service.frame_hash(rgb), frame_service.frame_hash(gray))
+
+
+class ListRegionTests(unittest.TestCase):
+    @staticmethod
+    def screen(shift: int) -> VideoFrame:
+        """120x200: header rows 0-29, a list in rows 30-169 between 10 px side margins, buttons below."""
+        pixels = bytes(
+            ((255 if ((y + shift) // 7 + x // 9) % 2 else 20) if 30 <= y < 170 and 10 <= x < 110 else (100 if y < 30 else 50))
+            for y in range(200)
+            for x in range(120)
+        )
+        return VideoFrame(index=shift, width=120, height=200, channels=1, pixels=pixels)
+
+    def test_the_scrolling_list_is_found_inside_the_fixed_screen_furniture(self) -> None:
+        region = frame_service.detect_list_region([self.screen(shift) for shift in range(0, 78, 13)])
+        self.assertEqual(region, (108, 148, 6, 26))
+        self.assertEqual(frame_service.crop_filter(region), "108:148:6:26")
+
+    def test_a_still_recording_has_no_list_region(self) -> None:
+        self.assertIsNone(frame_service.detect_list_region([self.screen(0)] * 6))
+
+
+class FrameTimeTests(unittest.TestCase):
+    def test_timecodes(self) -> None:
+        self.assertEqual(frame_service.parse_timecode("90"), 90)
+        self.assertEqual(frame_service.parse_timecode("1:30"), 90)
+        self.assertEqual(frame_service.parse_timecode("00:01:30.5"), 90.5)
+        self.assertIsNone(frame_service.parse_timecode("soon"))
+        self.assertIsNone(frame_service.parse_timecode(None))
+
+    def test_times_from_the_rate_and_from_the_ffmpeg_log(self) -> None:
+        self.assertEqual(frame_service.fps_times(3, 2.0, offset=5), [5.0, 5.5, 6.0])
+        log = "frame:0    pts:0       pts_time:0\nlavfi.scene_score=1\nframe:1    pts:3072    pts_time:1.2\n"
+        self.assertEqual(frame_service.logged_times(log, offset=1), [1.0, 2.2])
+
+    def test_manifest_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            frame_service.write_manifest(Path(tmpdir), [FrameRecord("frame_0001.jpg", 0.0, 255)], mode="fps")
+            manifest = frame_service.load_manifest(Path(tmpdir))
+        self.assertEqual(manifest["mode"], "fps")
+        self.assertEqual(manifest["frames"], [{"file": "frame_0001.jpg", "time": 0.0, "hash": "00000000000000ff"}])
@@ -4,6 +4,7 @@ import sqlite3
 
 from hcr2.repositories import matches as match_repo
 from hcr2.repositories import matchscores as matchscore_repo
+from hcr2.repositories import players as player_repo
 from hcr2.services import matchscores as matchscore_service
 from modules import matchscore
 from tests.support import TemporaryDatabaseTestCase
@@ -26,9 +27,34 @@ class MatchscoreTests(TemporaryDatabaseTestCase):
         self.assertIsNotNone(unique)
         self.assertEqual(unique.points, 200)
 
+    def test_bulk_roster_reads_match_the_per_player_ones(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT INTO match (id, teamevent_id, season_number, start, opponent, score_ladys, score_opponent)
+                VALUES (2, 1, 2, '2021-06-12', 'Others', 100, 90)
+                """
+            )
+            conn.execute(
+                "INSERT INTO matchscore (match_id, player_id, score, points, absent, checkin) VALUES (2, 1, 42000, 150, 0, 1)"
+            )
+            conn.execute("INSERT INTO away_period (player_id, away_from) VALUES (2, '2021-06-01')")
+
+        self.assertEqual(
+            matchscore_repo.recent_scores_by_player([1, 2], exclude_match_id=2),
+            {1: matchscore_repo.recent_scores(1, exclude_match_id=2)},
+        )
+        self.assertEqual(matchscore_repo.recent_scores_by_player([1], exclude_match_id=1, limit=1), {1: [42000]})
+        self.assertEqual(matchscore_repo.players_who_have_driven([1, 2, 1]), {1})
+        self.assertEqual(
+            matchscore_repo.absent_flags_for_match(2, [1, 2]),
+            {player_id: matchscore_service.compute_absent(2, player_id) for player_id in (1, 2)},
+        )
+        self.assertEqual(matchscore_repo.absent_flags_for_match(2, [2, 1]), {1: 0, 2: 1})
+        self.assertEqual(matchscore_repo.recent_scores_by_player([], exclude_match_id=1), {})
+
     def test_matchscore_repository_mutates_scores(self) -> None:
         self.assertEqual(matchscore_repo.get_match_start(1), "2021-06-05")
-        self.assertEqual(matchscore_repo.get_player_away_window(1), (None, None))
         self.assertEqual(matchscore_repo.get_match_result(1), (123, 111))
         self.assertEqual([player.name for player in matchscore_repo.find_players("ali")], ["Alice"])
 
@@ -181,11 +207,7 @@ class MatchscoreTests(TemporaryDatabaseTestCase):
 
         with sqlite3.connect(self.db_path) as conn:
             conn.execute(
-                """
-                UPDATE players
-                SET away_from = '2021-06-01', away_until = '2021-06-10'
-                WHERE id = 1
-                """
+                "INSERT INTO away_period (player_id, away_from, away_until) VALUES (1, '2021-06-01', '2021-06-10')"
             )
 
         updated = matchscore_service.edit_score(1, score=51000)
@@ -193,3 +215,17 @@ class MatchscoreTests(TemporaryDatabaseTestCase):
         refreshed = matchscore_repo.fetch_by_match_player(1, 1)
         self.assertIsNotNone(refreshed)
         self.assertEqual(refreshed.absent, 1)
+
+    def test_absence_follows_the_window_the_player_had_on_the_match_day(self) -> None:
+        # Away over match 1 (2021-06-05), back two days early, then away again in July.
+        player_repo.set_away(1, "2021-06-01 10:00:00", "2021-06-10 10:00:00")
+        self.assertEqual(matchscore_service.compute_absent(1, 1), 1)
+        player_repo.clear_away(1, "2021-06-08 18:00:00")
+        player_repo.set_away(1, "2021-07-01 10:00:00", "2021-07-05 10:00:00")
+        self.assertEqual(matchscore_service.compute_absent(1, 1), 1)
+
+        # Coming back before the match day ends the window there.
+        player_repo.set_away(1, "2021-06-01 10:00:00", "2021-06-10 10:00:00")
+        player_repo.clear_away(1, "2021-06-04 18:00:00")
+        self.assertEqual(matchscore_repo.absent_flags_for_match(1, [1, 2]), {1: 0, 2: 0})
+        self.assertEqual(matchscore_repo.absent_flags_for_match(99, [1]), {1: 0})
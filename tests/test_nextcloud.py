@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import tempfile
 import unittest
+from pathlib import Path
 from unittest import mock
 
-from hcr2.integrations import nextcloud
+from hcr2.integrations import nextcloud, nextcloud_cache
+from hcr2.integrations.nextcloud_cache import ContentCache, ListingCache, RemoteDirCache
+from tests.webdav import WebDavStandIn
 
 
 class NextcloudIntegrationTests(unittest.TestCase):
@@ -19,3 +25,437 @@ class NextcloudIntegrationTests(unittest.TestCase):
                 nextcloud.remote_url("/Power-Ladys-Scores/Ladys/Ladys.xlsx"),
                 "http://192.168.178.101:8080/remote.php/dav/files/user/Power-Ladys-Scores/Ladys/Ladys.xlsx",
             )
+
+
+class WebDavClientTests(unittest.TestCase):
+    """Against the local stand-in, through the module functions the services call."""
+
+    def setUp(self) -> None:
+        self.dav = WebDavStandIn().start()
+        self.addCleanup(self.dav.stop)
+        self.client = nextcloud.WebDavClient(
+            url_template=self.dav.url_template, auth=self.dav.auth, timeout=(2.0, 2.0), backoff=0
+        )
+        self.addCleanup(self.client.close)
+        previous = nextcloud.set_client(self.client)
+        self.addCleanup(nextcloud.set_client, previous)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def local_file(self, content: bytes = b"sheet") -> Path:
+        path = Path(self.tempdir.name) / "upload.xlsx"
+        path.write_bytes(content)
+        return path
+
+    def test_upload_creates_the_folders_and_reuses_one_connection(self) -> None:
+        local = self.local_file()
+        url, created = nextcloud.upload_file(local, "Power-Ladys-Scores/Team-Event/S62/1_Cup.xlsx")
+        self.assertTrue(created)
+        self.assertTrue(url.endswith("/Power-Ladys-Scores/Team-Event/S62/1_Cup.xlsx"))
+        self.assertEqual(self.dav.files["Power-Ladys-Scores/Team-Event/S62/1_Cup.xlsx"], b"sheet")
+
+        self.assertEqual(nextcloud.upload_file(local, "Power-Ladys-Scores/Team-Event/S62/1_Cup.xlsx"), (url, False))
+        entries = nextcloud.list_directory("Power-Ladys-Scores/Team-Event/S62")
+        self.assertEqual([(entry.name, entry.size) for entry in entries], [("1_Cup.xlsx", 5)])
+        self.assertEqual(self.dav.connections, 1)
+
+    def test_download_and_delete(self) -> None:
+        self.dav.add_file("Power-Ladys-Scores/Ladys/Ladys.xlsx", b"roster")
+        target = Path(self.tempdir.name) / "Ladys.xlsx"
+        self.assertEqual(nextcloud.download_file("Power-Ladys-Scores/Ladys/Ladys.xlsx", target), target)
+        self.assertEqual(target.read_bytes(), b"roster")
+        self.assertTrue(nextcloud.delete_file("Power-Ladys-Scores/Ladys/Ladys.xlsx"))
+        self.assertNotIn("Power-Ladys-Scores/Ladys/Ladys.xlsx", self.dav.files)
+
+    def test_transient_server_errors_are_retried(self) -> None:
+        self.dav.add_file("Power-Ladys-Scores/Team-Event/S2/2.mp4", b"video")
+        self.dav.failures = [503, 502]
+        entries = nextcloud.list_directory("Power-Ladys-Scores/Team-Event/S2")
+        self.assertEqual([entry.name for entry in entries], ["2.mp4"])
+        self.assertEqual(self.dav.count("PROPFIND"), 3)
+
+    def test_a_hung_server_times_out_instead_of_blocking(self) -> None:
+        slow = nextcloud.WebDavClient(
+            url_template=self.dav.url_template, auth=self.dav.auth, timeout=(1.0, 0.1), retries=0
+        )
+        self.addCleanup(slow.close)
+        self.dav.latency = 0.5
+        with mock.patch("sys.stderr") as stderr:
+            self.assertEqual(slow.list_directory("Power-Ladys-Scores"), [])
+        written = "".join(call.args[0] for call in stderr.write.call_args_list if call.args)
+        self.assertIn("PROPFIND failed", written)
+
+    def test_timeouts_are_configurable_from_the_environment(self) -> None:
+        with mock.patch.dict(os.environ, {nextcloud.TIMEOUT_ENV: "3,90"}):
+            self.assertEqual(nextcloud.configured_timeout(), (3.0, 90.0))
+        with mock.patch.dict(os.environ, {nextcloud.TIMEOUT_ENV: "10"}):
+            self.assertEqual(nextcloud.configured_timeout(), (10.0, 10.0))
+
+
+class RemoteDirCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dav = WebDavStandIn().start()
+        self.addCleanup(self.dav.stop)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.local = Path(self.tempdir.name) / "sheet.xlsx"
+        self.local.write_bytes(b"sheet")
+
+    def client(self, **kwargs) -> nextcloud.WebDavClient:
+        client = nextcloud.WebDavClient(url_template=self.dav.url_template, auth=self.dav.auth, backoff=0, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_the_second_upload_into_a_folder_sends_no_mkcol(self) -> None:
+        client = self.client()
+        client.upload_file(self.local, "Power-Ladys-Scores/Team-Event/S62/1.xlsx")
+        self.assertEqual(self.dav.count("MKCOL"), 3)
+
+        client.upload_file(self.local, "Power-Ladys-Scores/Team-Event/S62/2.xlsx")
+        self.assertEqual(self.dav.count("MKCOL"), 3)
+        self.assertEqual(client.stats.saved["MKCOL"], 3)
+        self.assertIn("3 saved by caches (MKCOL 3)", client.stats.summary())
+
+    def test_a_listing_feeds_the_cache(self) -> None:
+        self.dav.add_file("Power-Ladys-Scores/Team-Event/S62/1.xlsx", b"x")
+        client = self.client()
+        client.list_directory("Power-Ladys-Scores/Team-Event")
+        client.upload_file(self.local, "Power-Ladys-Scores/Team-Event/S62/2.xlsx")
+        self.assertEqual(self.dav.count("MKCOL"), 0)
+
+    def test_the_on_disk_cache_carries_over_to_the_next_process(self) -> None:
+        cache_file = Path(self.tempdir.name) / "dirs.json"
+        self.client(dir_cache=RemoteDirCache(path=cache_file)).upload_file(
+            self.local, "Power-Ladys-Scores/Ladys/Ladys.xlsx"
+        )
+        self.client(dir_cache=RemoteDirCache(path=cache_file)).upload_file(
+            self.local, "Power-Ladys-Scores/Ladys/Ladys-2.xlsx"
+        )
+        self.assertEqual(self.dav.count("MKCOL"), 2)
+
+    def test_entries_expire_after_the_ttl(self) -> None:
+        now = [1000.0]
+        cache = RemoteDirCache(ttl=60, clock=lambda: now[0])
+        cache.add("Power-Ladys-Scores/Ladys")
+        self.assertEqual(cache.missing("Power-Ladys-Scores/Ladys/2026"), ["Power-Ladys-Scores/Ladys/2026"])
+        now[0] += 61
+        self.assertEqual(
+            cache.missing("Power-Ladys-Scores/Ladys"), ["Power-Ladys-Scores", "Power-Ladys-Scores/Ladys"]
+        )
+
+    def test_a_folder_removed_behind_the_caches_back_is_recreated(self) -> None:
+        client = self.client()
+        client.upload_file(self.local, "Power-Ladys-Scores/Team-Event/S62/1.xlsx")
+        self.dav.dirs.discard("Power-Ladys-Scores/Team-Event/S62")
+        del self.dav.files["Power-Ladys-Scores/Team-Event/S62/1.xlsx"]
+
+        url, created = client.upload_file(self.local, "Power-Ladys-Scores/Team-Event/S62/2.xlsx")
+        self.assertTrue(created)
+        self.assertIn("Power-Ladys-Scores/Team-Event/S62/2.xlsx", self.dav.files)
+
+
+class StreamingDownloadTests(unittest.TestCase):
+    VIDEO = "Power-Ladys-Scores/Team-Event/S62/627.mp4"
+
+    def setUp(self) -> None:
+        self.dav = WebDavStandIn().start()
+        self.addCleanup(self.dav.stop)
+        self.client = nextcloud.WebDavClient(url_template=self.dav.url_template, auth=self.dav.auth, backoff=0)
+        self.addCleanup(self.client.close)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.target = Path(self.tempdir.name) / "627" / "627.mp4"
+        self.content = bytes(range(256)) * 4096  # 1 MiB
+        self.dav.add_file(self.VIDEO, self.content)
+
+    def test_the_file_arrives_in_chunks_with_progress(self) -> None:
+        seen = []
+        with mock.patch.object(nextcloud, "DOWNLOAD_CHUNK_SIZE", 64 * 1024):
+            result = self.client.download_file(
+                self.VIDEO, self.target, expected_size=len(self.content), progress=lambda d, t: seen.append((d, t))
+            )
+        self.assertEqual(result, self.target)
+        self.assertEqual(self.target.read_bytes(), self.content)
+        self.assertFalse(nextcloud.partial_path(self.target).exists())
+        self.assertEqual(len(seen), 16)
+        self.assertEqual(seen[-1], (len(self.content), len(self.content)))
+
+    def test_an_interrupted_download_resumes_with_a_range_request(self) -> None:
+        self.dav.cut_after = 300_000
+        with mock.patch.object(nextcloud, "DOWNLOAD_CHUNK_SIZE", 64 * 1024), mock.patch("sys.stderr"):
+            self.assertIsNone(self.client.download_file(self.VIDEO, self.target, expected_size=len(self.content)))
+        partial = nextcloud.partial_path(self.target)
+        # Whole chunks survive the cut; the unfinished one is fetched again.
+        self.assertEqual(partial.stat().st_size, 4 * 64 * 1024)
+        self.assertFalse(self.target.exists())
+
+        self.assertEqual(self.client.download_file(self.VIDEO, self.target, expected_size=len(self.content)), self.target)
+        self.assertEqual(self.target.read_bytes(), self.content)
+        self.assertEqual(self.dav.count("GET"), 2)
+
+    def test_a_size_mismatch_is_not_accepted(self) -> None:
+        with mock.patch("sys.stderr") as stderr:
+            result = self.client.download_file(self.VIDEO, self.target, expected_size=len(self.content) - 1)
+        self.assertIsNone(result)
+        self.assertFalse(self.target.exists())
+        written = "".join(call.args[0] for call in stderr.write.call_args_list if call.args)
+        self.assertIn(f"delivered {len(self.content)} of {len(self.content) - 1} bytes", written)
+
+    def test_a_complete_partial_is_finished_without_a_transfer(self) -> None:
+        nextcloud.partial_path(self.target).parent.mkdir(parents=True)
+        nextcloud.partial_path(self.target).write_bytes(self.content)
+        self.assertEqual(self.client.download_file(self.VIDEO, self.target, expected_size=len(self.content)), self.target)
+        self.assertEqual(self.target.read_bytes(), self.content)
+
+
+    def test_a_file_replaced_between_runs_is_not_spliced_onto_the_old_part(self) -> None:
+        self.dav.cut_after = 300_000
+        with mock.patch.object(nextcloud, "DOWNLOAD_CHUNK_SIZE", 64 * 1024), mock.patch("sys.stderr"):
+            self.assertIsNone(self.client.download_file(self.VIDEO, self.target))
+        self.assertEqual(
+            nextcloud.partial_etag_path(self.target).read_text(encoding="utf-8"), self.dav.etag(self.VIDEO)
+        )
+
+        replaced = bytes(reversed(self.content))
+        self.dav.add_file(self.VIDEO, replaced)
+        self.assertEqual(self.client.download_file(self.VIDEO, self.target), self.target)
+        self.assertEqual(self.target.read_bytes(), replaced)
+        self.assertFalse(nextcloud.partial_etag_path(self.target).exists())
+
+    def test_a_range_of_another_version_is_dropped_and_fetched_whole(self) -> None:
+        self.dav.honour_if_range = False
+        partial = nextcloud.partial_path(self.target)
+        partial.parent.mkdir(parents=True)
+        partial.write_bytes(b"stale" * 1000)
+        nextcloud.partial_etag_path(self.target).write_text('"old"', encoding="utf-8")
+
+        self.assertEqual(self.client.download_file(self.VIDEO, self.target), self.target)
+        self.assertEqual(self.target.read_bytes(), self.content)
+        self.assertEqual(self.dav.count("GET"), 2)
+
+    def test_a_part_without_etag_or_size_is_started_again(self) -> None:
+        partial = nextcloud.partial_path(self.target)
+        partial.parent.mkdir(parents=True)
+        partial.write_bytes(b"unknown")
+        self.assertEqual(self.client.download_file(self.VIDEO, self.target), self.target)
+        self.assertEqual(self.target.read_bytes(), self.content)
+
+
+class ChunkedUploadTests(unittest.TestCase):
+    VIDEO = "Power-Ladys-Scores/Team-Event/S62/627.mp4"
+    CHUNK = 64 * 1024
+
+    def setUp(self) -> None:
+        self.dav = WebDavStandIn().start()
+        self.addCleanup(self.dav.stop)
+        self.client = nextcloud.WebDavClient(
+            url_template=self.dav.url_template,
+            auth=self.dav.auth,
+            backoff=0,
+            chunk_threshold=2 * self.CHUNK,
+            chunk_size=self.CHUNK,
+            upload_workers=3,
+        )
+        self.addCleanup(self.client.close)
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.local = Path(tempdir.name) / "627.mp4"
+        self.content = os.urandom(4 * self.CHUNK + 1000)
+        self.local.write_bytes(self.content)
+
+    def test_a_large_file_is_sent_in_chunks_and_assembled(self) -> None:
+        url, created = self.client.upload_file(self.local, self.VIDEO)
+        self.assertTrue(created)
+        self.assertEqual(url, self.client.url(self.VIDEO))
+        self.assertEqual(self.dav.files[self.VIDEO], self.content)
+        self.assertEqual(self.dav.count("PUT"), 5)
+        self.assertEqual(self.dav.count("MOVE"), 1)
+        self.assertEqual(self.dav.uploads, {})
+
+    def test_a_small_file_keeps_the_single_put(self) -> None:
+        self.local.write_bytes(b"sheet")
+        self.client.upload_file(self.local, self.VIDEO)
+        self.assertEqual(self.dav.files[self.VIDEO], b"sheet")
+        self.assertEqual(self.dav.count("MOVE"), 0)
+
+    def test_a_failed_upload_resumes_after_the_confirmed_chunks(self) -> None:
+        self.dav.reject = lambda method, path: 500 if method == "PUT" and path.endswith("/00003") else None
+        with mock.patch("sys.stderr"):
+            self.assertEqual(self.client.upload_file(self.local, self.VIDEO), (None, False))
+        self.assertNotIn(self.VIDEO, self.dav.files)
+        (pending,) = self.dav.uploads.values()
+        self.assertEqual(sorted(pending), ["00001", "00002", "00004", "00005"])
+
+        self.dav.reject = None
+        self.dav.requests.clear()
+        url, created = self.client.upload_file(self.local, self.VIDEO)
+        self.assertTrue(created)
+        self.assertEqual(self.dav.files[self.VIDEO], self.content)
+        self.assertEqual([path for method, path in self.dav.requests if method == "PUT"][0][-6:], "/00003")
+        self.assertEqual(self.dav.count("PUT"), 1)
+        self.assertEqual(self.client.stats.saved["PUT"], 4)
+
+    def test_a_changed_file_starts_a_new_transfer(self) -> None:
+        first = nextcloud.transfer_id(self.local, self.VIDEO)
+        self.local.write_bytes(self.content + b"more")
+        os.utime(self.local, ns=(0, 12345))
+        self.assertNotEqual(nextcloud.transfer_id(self.local, self.VIDEO), first)
+
+
+class ContentCacheTests(unittest.TestCase):
+    SHEET = "Power-Ladys-Scores/Ladys/Ladys.xlsx"
+
+    def setUp(self) -> None:
+        self.dav = WebDavStandIn().start()
+        self.addCleanup(self.dav.stop)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.cache = ContentCache(Path(self.tempdir.name) / "cache")
+        self.client = nextcloud.WebDavClient(
+            url_template=self.dav.url_template, auth=self.dav.auth, backoff=0, content_cache=self.cache
+        )
+        self.addCleanup(self.client.close)
+        self.target = Path(self.tempdir.name) / "Ladys.xlsx"
+        self.dav.add_file(self.SHEET, b"roster v1")
+
+    def test_an_unchanged_file_costs_one_304_and_no_transfer(self) -> None:
+        self.client.download_file(self.SHEET, self.target)
+        self.target.unlink()
+
+        self.assertEqual(self.client.download_file(self.SHEET, self.target), self.target)
+        self.assertEqual(self.target.read_bytes(), b"roster v1")
+        self.assertEqual(self.client.stats.bytes_not_transferred, len(b"roster v1"))
+        self.assertEqual(self.cache.etag_for(self.SHEET), self.dav.etag(self.SHEET))
+
+    def test_a_changed_file_is_downloaded_again(self) -> None:
+        self.client.download_file(self.SHEET, self.target)
+        self.dav.files[self.SHEET] = b"roster v2"
+        self.client.download_file(self.SHEET, self.target)
+        self.assertEqual(self.target.read_bytes(), b"roster v2")
+        self.assertEqual(self.cache.etag_for(self.SHEET), self.dav.etag(self.SHEET))
+        self.assertEqual(self.client.stats.bytes_not_transferred, 0)
+
+    def test_saving_over_the_working_copy_leaves_the_cached_blob_alone(self) -> None:
+        self.client.download_file(self.SHEET, self.target)
+        # openpyxl and the workbook savers write the file in place.
+        with open(self.target, "r+b") as f:
+            f.write(b"edited!!")
+
+        self.assertEqual(self.client.download_file(self.SHEET, self.target), self.target)
+        self.assertEqual(self.target.read_bytes(), b"roster v1")
+        self.assertEqual(self.client.stats.bytes_not_transferred, len(b"roster v1"))
+
+    def test_a_damaged_blob_is_dropped_and_fetched_again(self) -> None:
+        self.client.download_file(self.SHEET, self.target)
+        self.cache.lookup(self.SHEET).blob.write_bytes(b"bit rot")
+
+        self.assertEqual(self.client.download_file(self.SHEET, self.target), self.target)
+        self.assertEqual(self.target.read_bytes(), b"roster v1")
+        self.assertEqual(self.client.stats.bytes_not_transferred, 0)
+        self.assertEqual(self.dav.count("GET"), 3)
+        self.assertEqual(self.cache.lookup(self.SHEET).blob.read_bytes(), b"roster v1")
+
+    def test_the_listing_carries_the_etag(self) -> None:
+        entry = self.client.list_directory("Power-Ladys-Scores/Ladys")[0]
+        self.assertTrue(nextcloud.etags_match(entry.etag, self.dav.etag(self.SHEET)))
+        self.assertTrue(nextcloud.etags_match('W/"abc"', '"abc"'))
+
+    def test_least_recently_used_blobs_are_evicted_by_total_size(self) -> None:
+        now = [0.0]
+        cache = ContentCache(Path(self.tempdir.name) / "lru", max_bytes=20, clock=lambda: now[0])
+        source = Path(self.tempdir.name) / "blob"
+        for name, content in (("a", b"0123456789"), ("b", b"abcdefghij"), ("a-copy", b"0123456789")):
+            now[0] += 1
+            source.write_bytes(content)
+            cache.store(name, f'"{name}"', source, hashlib.sha256(content).hexdigest())
+        # Same content is stored once: 20 bytes, nothing evicted yet.
+        self.assertEqual(cache.total_bytes(), 20)
+
+        now[0] += 1
+        source.write_bytes(b"ABCDEFGHIJ")
+        cache.store("c", '"c"', source, hashlib.sha256(b"ABCDEFGHIJ").hexdigest())
+        self.assertIsNone(cache.lookup("b"))
+        self.assertIsNotNone(cache.lookup("a"))
+        self.assertEqual(cache.total_bytes(), 20)
+
+
+class ListingCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dav = WebDavStandIn().start()
+        self.addCleanup(self.dav.stop)
+        for path in (
+            "Power-Ladys-Scores/Team-Event/S61/600.mp4",
+            "Power-Ladys-Scores/Team-Event/S62/627.mp4",
+            "Power-Ladys-Scores/Team-Event/S62/627_Cup_Rivals.xlsx",
+            "Power-Ladys-Scores/Ladys/Ladys.mp4",
+            "Power-Ladys-Scores/Wochen-Truhe/2026/w34.mp4",
+        ):
+            self.dav.add_file(path, b"data")
+        self.now = [1000.0]
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def client(self, **cache_options) -> nextcloud.WebDavClient:
+        listings = ListingCache(clock=lambda: self.now[0], **cache_options)
+        client = nextcloud.WebDavClient(
+            url_template=self.dav.url_template, auth=self.dav.auth, backoff=0, listing_cache=listings
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def names(self, entries) -> list[str]:
+        return sorted(entry.name for entry in entries)
+
+    def test_one_recursive_propfind_answers_every_folder(self) -> None:
+        client = self.client()
+        self.assertEqual(
+            self.names(client.list_directory("Power-Ladys-Scores/Team-Event/S62")),
+            ["627.mp4", "627_Cup_Rivals.xlsx"],
+        )
+        self.assertEqual(self.names(client.list_directory("Power-Ladys-Scores/Ladys")), ["Ladys.mp4"])
+        self.assertEqual(self.names(client.list_directory("Power-Ladys-Scores/Wochen-Truhe/2026")), ["w34.mp4"])
+        self.assertEqual(self.names(client.list_directory("Power-Ladys-Scores/Team-Event")), ["S61", "S62"])
+
+        self.assertEqual(self.dav.count("PROPFIND"), 1)
+        self.assertEqual(client.stats.saved["PROPFIND"], 3)
+
+    def test_a_server_without_depth_infinity_costs_one_request_per_folder(self) -> None:
+        self.dav.allow_infinity = False
+        client = self.client()
+        self.assertEqual(self.names(client.list_directory("Power-Ladys-Scores/Team-Event/S61")), ["600.mp4"])
+        self.assertEqual(self.dav.count("PROPFIND"), 2)
+        self.assertTrue(client.depth_infinity_refused)
+
+        self.assertEqual(self.names(client.list_directory("Power-Ladys-Scores/Wochen-Truhe/2026")), ["w34.mp4"])
+        self.assertEqual(self.dav.count("PROPFIND"), 3)
+        client.list_directory("Power-Ladys-Scores/Team-Event/S61")
+        self.assertEqual(self.dav.count("PROPFIND"), 3)
+
+        self.now[0] += nextcloud_cache.LISTING_TTL
+        client.list_directory("Power-Ladys-Scores/Team-Event/S61")
+        self.assertEqual(self.dav.count("PROPFIND"), 4)
+
+    def test_refresh_ttl_and_uploads_bypass_the_cache(self) -> None:
+        client = self.client()
+        folder = "Power-Ladys-Scores/Team-Event/S62"
+        client.list_directory(folder)
+        self.dav.add_file(f"{folder}/628.mp4", b"new")
+        self.assertNotIn("628.mp4", self.names(client.list_directory(folder)))
+        self.assertIn("628.mp4", self.names(client.list_directory(folder, refresh=True)))
+
+        self.dav.add_file(f"{folder}/629.mp4", b"newer")
+        self.now[0] += nextcloud_cache.LISTING_TTL
+        self.assertIn("629.mp4", self.names(client.list_directory(folder)))
+
+        local = Path(self.tempdir.name) / "630.mp4"
+        local.write_bytes(b"x")
+        client.upload_file(local, f"{folder}/630.mp4")
+        self.assertIn("630.mp4", self.names(client.list_directory(folder)))
+
+    def test_the_listing_file_is_shared_between_processes(self) -> None:
+        path = Path(self.tempdir.name) / "listings.json"
+        self.client(path=path).list_directory("Power-Ladys-Scores/Team-Event/S62")
+        entries = self.client(path=path).list_directory("Power-Ladys-Scores/Team-Event/S62")
+        self.assertEqual(self.names(entries), ["627.mp4", "627_Cup_Rivals.xlsx"])
+        self.assertIsNotNone(entries[0].etag)
+        self.assertEqual(self.dav.count("PROPFIND"), 1)
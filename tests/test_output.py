@@ -499,6 +499,27 @@ class OutputFormattingTests(unittest.TestCase):
         self.assertEqual([ws["A4"].value, ws["B4"].value, ws["C4"].value, ws["F4"].value], [7, 1, "Alice", "false"])
         self.assertEqual([ws["A5"].value, ws["B5"].value, ws["C5"].value, ws["F5"].value], [7, 2, "Betty", "true"])
 
+    def test_excel_exporter_fills_the_match_sheet_template_without_reformatting_values(self) -> None:
+        match = (7, "2021-06-05", 62, "Team {odd}", "Team Cup!")
+        players = [(1, "Alice", None, None), (2, "Betty", None, None)]
+
+        wb = excel_exporter.build_match_sheet_workbook(match, players, is_absent_on=lambda *_args: False)
+
+        ws = wb.active
+        self.assertEqual(ws.max_row, 5)
+        self.assertEqual(ws["D1"].value, "Opponent: Team {odd}")
+        self.assertEqual(ws["E2"].value, "<-- Team {odd}")
+        self.assertEqual([ws["C2"].value, ws["D2"].value], ["", ""])
+        self.assertTrue(ws["H3"].value.startswith("H1: Did not drive"))
+        self.assertTrue(ws["H3"].alignment.wrap_text)
+        self.assertEqual([ws["A5"].alignment.horizontal, ws["B5"].alignment.horizontal], ["center", "center"])
+        self.assertIsNone(ws["C5"].alignment.horizontal)
+        self.assertEqual(ws["G3"].alignment.horizontal, "center")
+        self.assertEqual(
+            {key: ws.column_dimensions[key].width for key in "ABCDEFGH"},
+            {"A": 15, "B": 20, "C": 26, "D": 20, "E": 20, "F": 8, "G": 9, "H": 130},
+        )
+
     def test_excel_exporter_saves_and_deletes_workbook(self) -> None:
         wb = excel_exporter.build_players_workbook(["id", "name"], [(1, "Alice")])
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -736,6 +757,27 @@ class OutputFormattingTests(unittest.TestCase):
         self.assertIn("✅ players import: 1 updated, 2 inserted, 3 skipped, 4 errors (deleted in Nextcloud)", output)
         self.assertIn("✅ donations import: 5 added, 6 errors (delete failed in Nextcloud)", output)
 
+    def test_sheet_output_prints_season_summary_per_file(self) -> None:
+        outcome = sheet_service.SeasonSheetsExportOutcome(
+            status="EXPORTED",
+            season=62,
+            web_url="https://example.test/S62",
+            files=[
+                sheet_service.SeasonSheetFile(match_id=7, filename="7_Event_Opp.xlsx", status="CREATED"),
+                sheet_service.SeasonSheetFile(match_id=8, filename="8_Event_Opp.xlsx", status="EXISTS"),
+                sheet_service.SeasonSheetFile(match_id=9, filename="9_Event_Opp.xlsx", status="UPLOAD_FAILED"),
+            ],
+        )
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            sheet_output.print_season_sheets_result(outcome)
+
+        output = buffer.getvalue()
+        self.assertIn("✅ [7_Event_Opp.xlsx](https://example.test/S62) (Created)", output)
+        self.assertIn("✅ [8_Event_Opp.xlsx](https://example.test/S62) (Already existed)", output)
+        self.assertIn("❌ [9_Event_Opp.xlsx](https://example.test/S62) (Upload failed)", output)
+        self.assertIn("Season 62: 3 sheet(s), 1 created, 1 already existed, 1 failed", output)
+
     def test_sheet_output_prints_match_import_renames(self) -> None:
         buffer = io.StringIO()
         with contextlib.redirect_stdout(buffer):
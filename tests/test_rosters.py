@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+import random
 import sqlite3
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
 
 from hcr2.models.roster import RosterReading, RosterVideo
@@ -31,6 +33,64 @@ class CandidateScoreTests(unittest.TestCase):
         self.assertLess(roster_service.candidate_score("Leo", "Leonardo"), roster_service.CONTAINMENT_SCORE)
 
 
+class NameIndexTests(unittest.TestCase):
+    """The index may only skip players the full comparison would have dropped."""
+
+    def setUp(self) -> None:
+        rng = random.Random(47)
+        pieces = ["ka", "Lo", "mi", "RA", "zu", "bel", "fox", "ny", "star", "lady", "ß", "é", "1", "07", "|", " "]
+        names = sorted({"".join(rng.choice(pieces) for _ in range(rng.randint(1, 5))) for _ in range(400)})
+        self.players = [
+            SimpleNamespace(id=pid, name=name, team="PLTE", active=pid % 9 == 0, garage_power=rng.randint(9000, 11000))
+            for pid, name in enumerate(names, start=1)
+        ]
+        self.readings = [
+            roster_service.RosterReading(name=name, garage_power=rng.choice([0, rng.randint(9000, 11000)]))
+            for name in [player.name for player in rng.sample(self.players, 20)]
+            + ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 5))) for _ in range(40)]
+            + ["", "🦊"]
+        ]
+
+    def test_candidates_are_those_of_scoring_everyone(self) -> None:
+        index = roster_service.NameIndex(self.players)
+        leaving = self.players[:3]
+        for reading in self.readings:
+            scored = []
+            for player in self.players[3:]:
+                similarity = roster_service.candidate_score(reading.name, player.name)
+                close_gp = reading.garage_power > 0 and abs(player.garage_power - reading.garage_power) <= (
+                    reading.garage_power * roster_service.GP_CANDIDATE_WINDOW
+                )
+                if similarity >= roster_service.CANDIDATE_MIN_SIMILARITY or close_gp:
+                    scored.append((similarity, player))
+            scored.sort(key=lambda pair: (-pair[0], abs(pair[1].garage_power - reading.garage_power)))
+            expected = [(player.id, similarity) for similarity, player in scored[:roster_service.CANDIDATE_LIMIT]]
+
+            found = roster_service.find_candidates(reading, leaving, index=index)
+            with self.subTest(reading=reading.name):
+                self.assertEqual({c.player_id for c in found[:3]}, {player.id for player in leaving})
+                self.assertEqual([(c.player_id, c.similarity) for c in found[3:]], expected)
+
+    def test_matches_are_those_of_scoring_everyone(self) -> None:
+        active = self.players[::7]
+        index = roster_service.NameIndex(active)
+        for reading in self.readings:
+            scored = [(roster_service._similarity(reading.name, player.name), player) for player in active]
+            exact = [player for score, player in scored if score == 1.0]
+            close = [player for score, player in scored if score >= roster_service.NAME_MATCH_SIMILARITY]
+            if len(exact) == 1:
+                expected = (exact[0], "EXACT")
+            elif exact or len(close) > 1:
+                expected = (None, "AMBIGUOUS")
+            elif close:
+                expected = (close[0], "FUZZY")
+            else:
+                expected = (None, "NONE")
+            with self.subTest(reading=reading.name):
+                self.assertEqual(roster_service.match_reading(reading, index), expected)
+                self.assertEqual(roster_service.match_reading(reading, active), expected)
+
+
 class RosterFileTests(unittest.TestCase):
     def test_broken_json_is_reported(self) -> None:
         with mock.patch.object(Path, "read_text", return_value="{nope"):
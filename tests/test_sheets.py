@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import io
 import sqlite3
 from pathlib import Path
 from unittest import mock
@@ -217,6 +218,113 @@ class SheetTests(TemporaryDatabaseTestCase):
             overwrite=False,
         )
 
+    def test_sheet_service_exports_a_whole_season_with_one_ranking(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT INTO match (id, teamevent_id, season_number, start, opponent, score_ladys, score_opponent)
+                VALUES (2, 1, 2, '2021-06-12', 'Other Team', 0, 0)
+                """
+            )
+        output_path = Path(self.tempdir.name) / "scores"
+        results = {
+            "1_Teamcup_Rivals.xlsx": ("url", True),
+            "2_Teamcup_Other_Team.xlsx": (None, False),
+        }
+
+        with mock.patch.object(
+            sheet_service,
+            "upload_match_sheet",
+            side_effect=lambda _local, _season, filename: results[filename],
+        ) as upload, mock.patch.object(
+            sheet_service,
+            "_rank_active_plte_for_season",
+            wraps=sheet_service._rank_active_plte_for_season,
+        ) as rank:
+            outcome = sheet_service.export_season_match_sheets(
+                self.db_path,
+                2,
+                output_path=output_path,
+                workbook_builder=excel_exporter.build_match_sheet_workbook,
+                workbook_saver=excel_exporter.save_workbook,
+                absent_checker=lambda _day, _frm, _until: False,
+                max_workers=2,
+            )
+
+        self.assertEqual(outcome.status, "EXPORTED")
+        self.assertEqual(
+            [(item.match_id, item.filename, item.status) for item in outcome.files],
+            [
+                (1, "1_Teamcup_Rivals.xlsx", "CREATED"),
+                (2, "2_Teamcup_Other_Team.xlsx", "UPLOAD_FAILED"),
+            ],
+        )
+        self.assertEqual(rank.call_count, 1)
+        self.assertEqual(upload.call_count, 2)
+        self.assertEqual(list((output_path / "Team-Event" / "S2").glob("*.xlsx")), [])
+
+    def test_season_export_removes_its_workbooks_when_a_build_or_an_upload_fails(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT INTO match (id, teamevent_id, season_number, start, opponent, score_ladys, score_opponent)
+                VALUES (2, 1, 2, '2021-06-12', 'Other Team', 0, 0)
+                """
+            )
+        output_path = Path(self.tempdir.name) / "scores"
+        sheet_dir = output_path / "Team-Event" / "S2"
+        built = []
+
+        def builder(match, players, *, is_absent_on):
+            if built:
+                raise ValueError("broken template")
+            built.append(match[0])
+            return excel_exporter.build_match_sheet_workbook(match, players, is_absent_on=is_absent_on)
+
+        def export(workbook_builder):
+            return sheet_service.export_season_match_sheets(
+                self.db_path,
+                2,
+                output_path=output_path,
+                workbook_builder=workbook_builder,
+                workbook_saver=excel_exporter.save_workbook,
+                absent_checker=lambda _day, _frm, _until: False,
+            )
+
+        with mock.patch.object(sheet_service, "upload_match_sheet") as upload:
+            with self.assertRaises(ValueError):
+                export(builder)
+        upload.assert_not_called()
+        self.assertEqual(list(sheet_dir.glob("*.xlsx")), [])
+
+        def flaky_upload(_local, _season, filename):
+            if filename.startswith("2_"):
+                raise RuntimeError("proxy hiccup")
+            return "url", False
+
+        with mock.patch.object(sheet_service, "upload_match_sheet", side_effect=flaky_upload), \
+                mock.patch("sys.stderr", io.StringIO()):
+            outcome = export(excel_exporter.build_match_sheet_workbook)
+        self.assertEqual(
+            [(item.match_id, item.status, item.error) for item in outcome.files],
+            [(1, "EXISTS", None), (2, "UPLOAD_FAILED", "RuntimeError")],
+        )
+        self.assertEqual(list(sheet_dir.glob("*.xlsx")), [])
+
+    def test_sheet_service_reports_a_season_without_matches(self) -> None:
+        with mock.patch.object(sheet_service, "upload_match_sheet") as upload:
+            outcome = sheet_service.export_season_match_sheets(
+                self.db_path,
+                99,
+                output_path=Path(self.tempdir.name),
+                workbook_builder=excel_exporter.build_match_sheet_workbook,
+                workbook_saver=excel_exporter.save_workbook,
+                absent_checker=lambda _day, _frm, _until: False,
+            )
+
+        self.assertEqual(outcome.status, "NO_MATCHES")
+        upload.assert_not_called()
+
     def test_sheet_service_imports_match_sheet_workflow(self) -> None:
         workbook = excel_exporter.Workbook()
         ws = workbook.active
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+import struct
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+from hcr2.exporters import png as png_exporter
+from hcr2.models.video import VideoFrame
+from hcr2.services import stitching
+
+WIDTH, WINDOW = 60, 150
+
+
+def standings_page(entries: int = 20) -> list[bytes]:
+    """RGB rows of a list: 30 px entries of 24 px 'text' blocks and a 6 px separator."""
+    rows = []
+    for y in range(entries * 30):
+        rnd = random.Random(y // 30 * 1000 + y % 30 // 6)
+        if y % 30 < 24:
+            rows.append(bytes(value for _ in range(WIDTH // 6) for value in [rnd.choice([20, 230])] * 18))
+        else:
+            rows.append(bytes([128]) * WIDTH * 3)
+    return rows
+
+
+def window(page: list[bytes], top: int, index: int = 0) -> VideoFrame:
+    return VideoFrame(index=index, width=WIDTH, height=WINDOW, channels=3, pixels=b"".join(page[top:top + WINDOW]))
+
+
+class ScrollEstimateTests(unittest.TestCase):
+    def test_the_offset_between_overlapping_frames_is_found_to_the_row(self) -> None:
+        page = standings_page()
+        before = stitching.row_profile(window(page, 40))
+        for moved in (0, 1, 29, 63, 110):
+            with self.subTest(moved=moved):
+                shift, cost = stitching.estimate_scroll(before, stitching.row_profile(window(page, 40 + moved)), WINDOW)
+                self.assertEqual((shift, cost), (moved, 0.0))
+
+    def test_frames_without_enough_overlap_do_not_match(self) -> None:
+        page = standings_page()
+        first = stitching.row_profile(window(page, 0))
+        self.assertIsNone(stitching.estimate_scroll(first, stitching.row_profile(window(page, 400)), WINDOW))
+
+
+class StitcherTests(unittest.TestCase):
+    def test_every_row_of_the_list_is_written_once_across_tiles(self) -> None:
+        page = standings_page()
+        tiles = []
+        stitcher = stitching.Stitcher(lambda number, width, rows: tiles.append((number, width, list(rows))), tile_height=200)
+        for index, top in enumerate([0, 0, 37, 90, 90, 151, 260, 333, 400, 450]):
+            stitcher.add(window(page, top, index))
+        stitcher.finish()
+
+        self.assertEqual([(number, len(rows)) for number, _, rows in tiles], [(1, 200), (2, 200), (3, 200)])
+        self.assertEqual([row for _, _, rows in tiles for row in rows], page)
+        self.assertEqual((stitcher.frames, stitcher.skipped, stitcher.breaks, stitcher.height), (10, 2, 0, 600))
+
+    def test_a_frame_that_does_not_line_up_is_added_whole(self) -> None:
+        page = standings_page()
+        tiles = []
+        stitcher = stitching.Stitcher(lambda number, width, rows: tiles.append(list(rows)))
+        stitcher.add(window(page, 0))
+        stitcher.add(window(page, 400))
+        stitcher.finish()
+        self.assertEqual((stitcher.breaks, stitcher.height), (1, 2 * WINDOW))
+
+
+class PngTests(unittest.TestCase):
+    def test_rows_are_written_as_an_rgb_png(self) -> None:
+        rows = [bytes([y, 0, 255 - y]) * 4 for y in range(3)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data = png_exporter.write_png(Path(tmpdir) / "tile.png", 4, rows).read_bytes()
+
+        self.assertEqual(data[:8], png_exporter.SIGNATURE)
+        chunks, offset = {}, 8
+        while offset < len(data):
+            (length,) = struct.unpack(">I", data[offset:offset + 4])
+            kind, payload = data[offset + 4:offset + 8], data[offset + 8:offset + 8 + length]
+            self.assertEqual(struct.unpack(">I", data[offset + 8 + length:offset + 12 + length])[0], zlib.crc32(kind + payload))
+            chunks[kind] = payload
+            offset += 12 + length
+        self.assertEqual(struct.unpack(">IIBBBBB", chunks[b"IHDR"]), (4, 3, 8, 2, 0, 0, 0))
+        self.assertEqual(zlib.decompress(chunks[b"IDAT"]), b"".join(b"\x00" + row for row in rows))
+
+    def test_a_row_of_the_wrong_length_is_refused(self) -> None:
+        with self.assertRaises(ValueError):
+            png_exporter.png_bytes(4, [bytes(12), bytes(11)])
+
+
+if __name__ == "__main__":
+    unittest.main()
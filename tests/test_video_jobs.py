@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import io
+import sqlite3
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from hcr2.integrations import nextcloud
+from hcr2.output import videos as video_output
+from hcr2.repositories import video_jobs as video_job_repo
+from hcr2.services import distances as distance_service
+from hcr2.services import rosters as roster_service
+from hcr2.services import video_jobs as video_job_service
+from hcr2.services import videos as video_service
+from tests.support import TemporaryDatabaseTestCase
+from tests.test_videos import FALLING, RISING, FakeFfmpeg
+
+TODAY = date(2026, 8, 20)
+
+
+def entry(folder: str, name: str, *, size: int = 10, etag: str | None = None) -> nextcloud.RemoteEntry:
+    return nextcloud.RemoteEntry(
+        name=name, path=f"{folder}/{name}", size=size, last_modified=None, is_dir=False, etag=etag
+    )
+
+
+def spawner(cmd):
+    """A decoder that yields two different frames, and an encoder that writes them."""
+    if cmd[-1] != "-":
+        return FakeFfmpeg(stdin=io.BytesIO(), pattern=Path(cmd[-1]))
+    return FakeFfmpeg(stdout=io.BytesIO(b"".join(b"P6\n24 3\n255\n" + pixels for pixels in (RISING, FALLING))))
+
+
+class VideoJobTests(TemporaryDatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        root = Path(self.tempdir.name) / "video"
+        for module, name, value in (
+            (video_service, "LOCAL_VIDEO_ROOT", root),
+            (video_service, "CHEST_LOCAL_ROOT", root / "chest"),
+            (video_service, "TEAM_LOCAL_DIR", root / "team"),
+            (roster_service, "ROSTER_FILE", root / "team" / "roster.json"),
+        ):
+            patch = mock.patch.object(module, name, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.season = video_service.season_folder(2)
+        self.chest = video_service.chest_folder(2026)
+        self.listing = {
+            self.season: [entry(self.season, "1_Teamcup_Rivals.mp4"), entry(self.season, "99.mp4")],
+            self.chest: [entry(self.chest, "w34.mp4"), entry(self.chest, "notes.mp4")],
+            video_service.team_folder(): [entry(video_service.team_folder(), "Ladys.mp4")],
+        }
+        self.downloads: list[str] = []
+
+    def lister(self, folder, refresh=False):
+        return list(self.listing.get(folder, []))
+
+    def downloader(self, remote_path, target, *, expected_size=None, progress=None):
+        self.downloads.append(remote_path)
+        target.write_bytes(b"x" * expected_size)
+        return target
+
+    def work(self, **options):
+        return video_job_service.run_worker(
+            lister=self.lister,
+            downloader=options.pop("downloader", self.downloader),
+            spawner=spawner,
+            ffmpeg_resolver=lambda: "/usr/bin/ffmpeg",
+            today=TODAY,
+            **options,
+        )
+
+    def stages(self) -> dict[str, str]:
+        return {job.key: job.stage for job in video_job_repo.list_jobs(include_applied=True)}
+
+    def test_discovery_queues_each_recording_once_and_requeues_a_replaced_one(self) -> None:
+        queued, unmatched = video_job_service.discover(lister=self.lister, today=TODAY)
+        self.assertEqual(queued, 3)
+        self.assertCountEqual(unmatched, ["99.mp4", "notes.mp4"])
+        jobs = {job.key: job for job in video_job_repo.list_jobs()}
+        self.assertEqual(
+            {key: (job.kind, job.match_id, job.year, job.week) for key, job in jobs.items()},
+            {
+                "1": ("standings", 1, None, None),
+                "2026-W34": ("chest", None, 2026, 34),
+                "team": ("team", None, None, None),
+            },
+        )
+
+        self.assertEqual(video_job_service.discover(lister=self.lister, today=TODAY)[0], 0)
+
+        video_job_repo.advance(jobs["2026-W34"].id, "extracted")
+        self.listing[self.chest] = [entry(self.chest, "w34.mp4", size=12)]
+        self.assertEqual(video_job_service.discover(lister=self.lister, today=TODAY)[0], 1)
+        self.assertEqual(self.stages()["2026-W34"], "queued")
+
+    def test_the_worker_pulls_and_extracts_every_job_and_a_restart_resumes(self) -> None:
+        outcome = self.work(workers=3)
+
+        self.assertEqual(outcome.status, "OK")
+        self.assertEqual([(run.status, run.stage, run.frames) for run in outcome.runs], [("OK", "extracted", 2)] * 3)
+        self.assertEqual(set(self.stages().values()), {"extracted"})
+        self.assertEqual(len(self.downloads), 3)
+        self.assertEqual(self.work().runs, [])
+
+        # A worker that died after the pull left its claim behind; once that is stale
+        # the job is picked up at the extraction, without downloading again.
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE video_job SET stage = 'pulled', claimed_at = datetime('now', '-2 hours') WHERE job_key = '1'"
+            )
+        resumed = self.work()
+        self.assertEqual([(run.job.key, run.status, run.stage) for run in resumed.runs], [("1", "OK", "extracted")])
+        self.assertEqual(len(self.downloads), 3)
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE video_job SET stage = 'pulled', claimed_at = CURRENT_TIMESTAMP WHERE job_key = '1'")
+        self.assertEqual(self.work().runs, [])
+
+    def test_a_failing_job_is_kept_with_its_error_until_retried(self) -> None:
+        del self.listing[self.chest], self.listing[video_service.team_folder()]
+
+        for _ in range(video_job_service.MAX_ATTEMPTS):
+            runs = self.work(downloader=lambda *args, **kwargs: None).runs
+            self.assertEqual([(run.status, run.stage, run.detail) for run in runs], [("FAILED", "queued", "pull: DOWNLOAD_FAILED")])
+        self.assertEqual(self.work().runs, [])
+        [job] = video_job_repo.list_jobs()
+        self.assertEqual((job.error, job.attempts), ("pull: DOWNLOAD_FAILED", video_job_service.MAX_ATTEMPTS))
+
+        retried = self.work(retry=True)
+        self.assertEqual([(run.status, run.stage) for run in retried.runs], [("OK", "extracted")])
+        [job] = video_job_repo.list_jobs()
+        self.assertEqual((job.error, job.attempts), (None, 0))
+
+    def test_readings_and_apply_move_the_job_on(self) -> None:
+        self.work()
+        path = video_service.results_path(1)
+        path.write_text("{}", encoding="utf-8")
+
+        buffer = io.StringIO()
+        with mock.patch("sys.stdout", buffer):
+            video_output.print_jobs(video_job_service.list_queue())
+        self.assertEqual(self.stages()["1"], "read")
+        self.assertIn("video apply --match 1", buffer.getvalue())
+        self.assertIn("read the frames", buffer.getvalue())
+
+        result = distance_service.import_week(year=2026, week=34, entries=[{"pid": 1, "km": 120}])
+        self.assertEqual(result.status, "IMPORTED")
+        self.assertEqual(self.stages()["2026-W34"], "applied")
+        self.assertNotIn("2026-W34", [job.key for job in video_job_service.list_queue()])
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import io
 import json
-import subprocess
+import random
+import tempfile
 import unittest
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest import mock
 
+from hcr2.db import connection
 from hcr2.integrations import nextcloud
 from hcr2.models.video import VideoCandidate, VideoEntry, VideoResults
 from hcr2.output import videos as video_output
+from hcr2.services import frames as frame_service
 from hcr2.services import videos as video_service
 from hcr2.services.videos import compare_opponent
 from tests.support import TemporaryDatabaseTestCase
@@ -41,6 +45,38 @@ PROPFIND_XML = b"""<?xml version="1.0"?>
 """
 
 
+# 24x3 RGB frames whose brightness runs left to right and right to left.
+RISING = bytes(value for value in range(0, 216, 3) for _ in range(3))
+FALLING = bytes(reversed(RISING))
+
+
+# A 40x100 phone screen: fixed bars above and below a list that scrolls by `shift` rows.
+SCREEN = (40, 100)
+
+
+def scrolled_screen(shift: int) -> bytes:
+    width, height = SCREEN
+    return bytes(
+        (200 if (y + shift) // 6 % 2 else 30) if 20 <= y < 80 else (90 if y < 20 else 60)
+        for y in range(height)
+        for _ in range(width)
+    )
+
+
+class FakeFfmpeg:
+    def __init__(self, *, stdin=None, stdout=None, code: int = 0, stderr: str = "", pattern: Path | None = None) -> None:
+        self.stdin, self.stdout, self.code, self.stderr = stdin, stdout, code, stderr
+        self.pattern, self.written = pattern, len(stdin.getvalue()) if stdin is not None else 0
+
+    def finish(self) -> tuple[int, str]:
+        if self.pattern is not None:
+            # An encoder: one file per image piped in since it started.
+            count = self.stdin.getvalue()[self.written:].count(b"P6\n")
+            for number in range(1, count + 1):
+                Path(str(self.pattern) % number).write_bytes(b"jpeg")
+        return self.code, self.stderr
+
+
 def candidate(name: str, *, days: int = 0, size: int = 10) -> VideoCandidate:
     return VideoCandidate(
         name=name,
@@ -51,10 +87,15 @@ def candidate(name: str, *, days: int = 0, size: int = 10) -> VideoCandidate:
 
 
 class PropfindParsingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        # A client without listing cache: every call must reach the mocked session.
+        previous = nextcloud.set_client(nextcloud.WebDavClient())
+        self.addCleanup(nextcloud.set_client, previous)
+
     def test_list_directory_returns_files_without_the_collection_itself(self) -> None:
         response = mock.Mock(status_code=207, content=PROPFIND_XML)
         with mock.patch.object(nextcloud, "NEXTCLOUD_AUTH", ("user", "secret")), \
-                mock.patch.object(nextcloud.requests, "request", return_value=response) as request:
+                mock.patch.object(nextcloud.requests.Session, "request", return_value=response) as request:
             entries = nextcloud.list_directory("Power-Ladys-Scores/Team-Event/S2")
 
         self.assertEqual(request.call_args.args[0], "PROPFIND")
@@ -67,7 +108,7 @@ class PropfindParsingTests(unittest.TestCase):
     def test_list_directory_reports_failures_as_an_empty_list(self) -> None:
         response = mock.Mock(status_code=404, content=b"")
         with mock.patch.object(nextcloud, "NEXTCLOUD_AUTH", ("user", "secret")), \
-                mock.patch.object(nextcloud.requests, "request", return_value=response):
+                mock.patch.object(nextcloud.requests.Session, "request", return_value=response):
             self.assertEqual(nextcloud.list_directory("Power-Ladys-Scores/Team-Event/S2"), [])
 
 
@@ -114,6 +155,14 @@ class CandidateSelectionTests(unittest.TestCase):
 
 
 class FrameExtractionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.root = Path(tempdir.name)
+        self.video = self.root / "1" / "a.mp4"
+        self.video.parent.mkdir()
+        self.video.write_bytes(b"mp4")
+
     def test_ffmpeg_command_carries_fps_crop_and_scale(self) -> None:
         command = video_service.build_ffmpeg_command(
             Path("tmp/video/1/a.mp4"), Path("tmp/video/1/frames"), fps=2, width=1200, crop="1000:800:100:200"
@@ -122,6 +171,246 @@ class FrameExtractionTests(unittest.TestCase):
         self.assertEqual(command[command.index("-vf") + 1], "fps=2,crop=1000:800:100:200,scale=1200:-2")
         self.assertTrue(command[-1].endswith(video_service.FRAME_PATTERN))
 
+    def test_scene_mode_selects_on_change_with_a_minimum_interval(self) -> None:
+        command = video_service.build_ffmpeg_command(
+            Path("a.mp4"), Path("frames"), mode="scene", threshold=0.12, min_interval=0.75, width=800
+        )
+        self.assertEqual(
+            command[command.index("-vf") + 1],
+            "select='eq(n,0)+gt(scene,0.12)*gte(t-prev_selected_t,0.75)',"
+            "metadata=print:file='frames/scene.log',scale=800:-2",
+        )
+        self.assertEqual(command[command.index("-vsync") + 1], "vfr")
+        self.assertNotIn("-vsync", video_service.build_ffmpeg_command(Path("a.mp4"), Path("frames")))
+
+    def test_streaming_ends_the_command_in_uncompressed_frames_on_stdout(self) -> None:
+        command = video_service.build_ffmpeg_command(Path("a.mp4"), Path("frames"), pix_fmt="gray")
+        self.assertEqual(command[-7:], ["-pix_fmt", "gray", "-f", "image2pipe", "-c:v", "pgm", "-"])
+        self.assertFalse(any(video_service.FRAME_PATTERN in part for part in command))
+
+    def _extract(self, frames, *, decoder_code: int = 0, stderr: str = "", video_seconds: int = 0, **options):
+        """extract_frames against a fake ffmpeg that decodes into the 24x3 RGB `frames`,
+        or, split into segments, into `frames[start]` for the segment from -ss start."""
+        commands, encoded = [], io.BytesIO()
+
+        def spawner(cmd):
+            commands.append(cmd)
+            if "-f" not in cmd:
+                return FakeFfmpeg(stderr=(
+                    f"  Duration: 00:00:{video_seconds:02d}.00, start: 0.000000, bitrate: 900 kb/s\n"
+                    f"  Stream #0:0: Video: h264, yuv420p, {SCREEN[0]}x{SCREEN[1]}, 30 fps\n"
+                ))
+            if cmd[-1] != "-":
+                return FakeFfmpeg(stdin=encoded, pattern=Path(cmd[-1]))
+            if "gray" in cmd:
+                return FakeFfmpeg(stdout=io.BytesIO(b"".join(
+                    b"P5\n%d %d\n255\n" % SCREEN + scrolled_screen(shift) for shift in range(0, 60, 5)
+                )))
+            piece = frames[cmd[cmd.index("-ss") + 1]] if isinstance(frames, dict) else frames
+            if "-vsync" in cmd:
+                log = Path(cmd[cmd.index("-vf") + 1].split("file='")[1].split("'")[0])
+                log.write_text(
+                    "".join(f"frame:{i} pts:{i} pts_time:{i * 2.5}\nlavfi.scene_score=0.2\n" for i in range(len(piece)))
+                )
+            stream = b"".join(b"P6\n24 3\n255\n" + pixels for pixels in piece)
+            return FakeFfmpeg(stdout=io.BytesIO(stream), code=decoder_code, stderr=stderr)
+
+        with mock.patch.object(video_service, "LOCAL_VIDEO_ROOT", self.root), \
+                mock.patch.object(video_service, "pull_video") as pull:
+            pull.return_value = mock.Mock(status="OK", local_path=self.video, candidate=None)
+            outcome = video_service.extract_frames(
+                1, ffmpeg_resolver=lambda: "/usr/bin/ffmpeg", spawner=spawner, **options
+            )
+        return outcome, commands, encoded.getvalue()
+
+    def test_scene_mode_reaches_ffmpeg_and_the_manifest(self) -> None:
+        outcome, commands, _ = self._extract([RISING, RISING], mode="scene", threshold=0.2, dedupe=None)
+        self.assertEqual((outcome.status, outcome.mode, outcome.frame_count), ("OK", "scene", 2))
+        self.assertIn("gt(scene,0.2)", commands[0][commands[0].index("-vf") + 1])
+        manifest = frame_service.load_manifest(outcome.frame_dir)
+        self.assertEqual([frame["time"] for frame in manifest["frames"]], [0.0, 2.5])
+
+    def test_near_duplicates_are_dropped_before_anything_is_encoded(self) -> None:
+        outcome, commands, encoded = self._extract(
+            [RISING, RISING, FALLING, FALLING], fps=0.5, start="00:00:10", keep_images=True
+        )
+
+        self.assertEqual((outcome.frame_count, outcome.dropped), (2, 2))
+        self.assertEqual(commands[0][commands[0].index("-pix_fmt") + 1], "rgb24")
+        self.assertEqual(commands[1][commands[1].index("-i") + 1], "-")
+        self.assertEqual(encoded.count(b"P6\n24 3\n255\n"), 2)
+        manifest = frame_service.load_manifest(outcome.frame_dir)
+        self.assertEqual([(f["file"], f["time"]) for f in manifest["frames"]], [("frame_0001.jpg", 10.0), ("frame_0002.jpg", 14.0)])
+        self.assertEqual(manifest["dropped"], 2)
+
+    def test_without_dedupe_every_frame_is_kept(self) -> None:
+        outcome, _, encoded = self._extract([RISING] * 3, dedupe=None, keep_images=True)
+        self.assertEqual((outcome.frame_count, outcome.dropped), (3, 0))
+        self.assertEqual(encoded.count(b"P6"), 3)
+
+    def test_a_second_run_with_the_same_settings_reuses_the_frames(self) -> None:
+        first, _, _ = self._extract([RISING, FALLING], fps=1)
+        again, commands, _ = self._extract([RISING, FALLING], fps=1, jobs=2)
+        self.assertEqual((first.status, again.status, again.frame_count), ("OK", "CACHED", 2))
+        self.assertEqual(commands, [])
+
+        wider, commands, _ = self._extract([RISING, FALLING], fps=1, width=1200)
+        self.assertEqual(wider.status, "OK")
+        self.assertIn("scale=1200:-2", commands[0][commands[0].index("-vf") + 1])
+
+    def test_a_replaced_recording_or_a_missing_frame_is_extracted_again(self) -> None:
+        first, _, _ = self._extract([RISING, FALLING], keep_images=True)
+        (first.frame_dir / "frame_0002.jpg").unlink()
+        self.assertEqual(self._extract([RISING, FALLING], keep_images=True)[0].status, "OK")
+
+        self.video.write_bytes(b"a longer mp4")
+        self.assertEqual(self._extract([RISING, FALLING], keep_images=True)[0].status, "OK")
+
+    def test_without_jpeg_only_the_manifest_is_written(self) -> None:
+        outcome, commands, encoded = self._extract([RISING, FALLING], fps=1)
+
+        self.assertEqual((outcome.status, outcome.frame_count, outcome.images), ("OK", 2, False))
+        self.assertEqual(len(commands), 1)
+        self.assertEqual(encoded, b"")
+        self.assertEqual([path.name for path in outcome.frame_dir.iterdir()], ["frames.json"])
+        manifest = frame_service.load_manifest(outcome.frame_dir)
+        self.assertEqual([(f["file"], f["time"]) for f in manifest["frames"]], [(None, 0.0), (None, 1.0)])
+
+        again, commands, _ = self._extract([RISING, FALLING], fps=1)
+        self.assertEqual((again.status, commands), ("CACHED", []))
+        images, commands, _ = self._extract([RISING, FALLING], fps=1, keep_images=True)
+        self.assertEqual((images.status, images.images), ("OK", True))
+        self.assertEqual(commands[1][commands[1].index("-i") + 1], "-")
+
+    def test_segments_are_cut_on_the_sampling_grid_and_merged_in_order(self) -> None:
+        outcome, commands, _ = self._extract(
+            {"0.000": [RISING, FALLING], "12.000": [FALLING, RISING], "24.000": [FALLING]},
+            video_seconds=33, fps=0.25, jobs=3, keep_images=True,
+        )
+
+        self.assertEqual((outcome.status, outcome.jobs), ("OK", 3))
+        # The segments start in threads, so the decoders come in any order.
+        decoders = [cmd for cmd in commands if cmd[-1] == "-"]
+        self.assertEqual(
+            sorted(
+                ((cmd[cmd.index("-ss") + 1], cmd[cmd.index("-t") + 1] if "-t" in cmd else None) for cmd in decoders),
+                key=lambda cut: float(cut[0]),
+            ),
+            [("0.000", "12.000"), ("12.000", "12.000"), ("24.000", None)],
+        )
+        # The first frame of the second segment repeats the last one before the cut.
+        self.assertEqual((outcome.frame_count, outcome.dropped), (4, 1))
+        names = sorted(path.name for path in outcome.frame_dir.iterdir())
+        self.assertEqual(names, ["frame_0001.jpg", "frame_0002.jpg", "frame_0003.jpg", "frame_0004.jpg", "frames.json"])
+        manifest = frame_service.load_manifest(outcome.frame_dir)
+        self.assertEqual([f["time"] for f in manifest["frames"]], [0.0, 4.0, 16.0, 24.0])
+
+    def test_pieces_rounded_up_at_a_low_rate_never_run_past_the_end(self) -> None:
+        # 32 s in three pieces at 0.1 fps: 20 s each on the grid, so only two fit.
+        frames = {"0.000": [RISING, FALLING], "20.000": [RISING]}
+        for duration, cuts in ((None, [("0.000", "20.000"), ("20.000", None)]),
+                               ("32", [("0.000", "20.000"), ("20.000", "12.000")])):
+            with self.subTest(duration=duration):
+                outcome, commands, _ = self._extract(frames, video_seconds=32, fps=0.1, jobs=3, duration=duration)
+                self.assertEqual((outcome.status, outcome.jobs), ("OK", 2))
+                decoders = [cmd for cmd in commands if cmd[-1] == "-"]
+                self.assertEqual(
+                    sorted(
+                        ((cmd[cmd.index("-ss") + 1], cmd[cmd.index("-t") + 1] if "-t" in cmd else None) for cmd in decoders),
+                        key=lambda cut: float(cut[0]),
+                    ),
+                    cuts,
+                )
+
+    def test_a_video_too_short_to_split_is_decoded_in_one_piece(self) -> None:
+        outcome, commands, _ = self._extract([RISING], video_seconds=15, jobs=4)
+        self.assertEqual((outcome.status, outcome.jobs), ("OK", 1))
+        self.assertNotIn("-ss", commands[1])
+
+    def test_duration_and_size_are_read_from_ffmpegs_banner(self) -> None:
+        run = mock.Mock()
+        run.finish.return_value = (1, (
+            "Input #0, mov,mp4\n  Duration: 00:03:25.48, start: 0.000000\n"
+            "  Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), yuv420p(tv, bt709), 2400x1080, 60 fps\n"
+            "    Side data:\n      displaymatrix: rotation of -90.00 degrees\nAt least one output"
+        ))
+        info = video_service.probe_video(Path("a.mp4"), executable="ffmpeg", spawner=lambda _: run)
+        self.assertEqual((info.duration, info.width, info.height), (205.48, 1080, 2400))
+        run.finish.return_value = (1, "a.mp4: No such file or directory")
+        info = video_service.probe_video(Path("a.mp4"), executable="ffmpeg", spawner=lambda _: run)
+        self.assertEqual((info.duration, info.width, info.height), (None, None, None))
+
+    def test_a_detected_crop_is_saved_for_the_next_video_of_the_same_kind(self) -> None:
+        outcome, commands, _ = self._extract([RISING], crop="auto")
+        # Status bar rows 0-19 and button rows 80-99 stand still; the list in 20-79 moves.
+        self.assertEqual((outcome.crop, outcome.crop_note), ("40:68:0:16", "detected"))
+        sampling = next(cmd for cmd in commands if "gray" in cmd)
+        self.assertLess(sampling.index("-skip_frame"), sampling.index("-i"))
+        extraction = next(cmd for cmd in commands if "rgb24" in cmd)
+        self.assertIn("crop=40:68:0:16", extraction[extraction.index("-vf") + 1])
+        saved = json.loads((self.root / video_service.CROPS_NAME).read_text(encoding="utf-8"))
+        self.assertEqual((saved["standings"]["crop"], saved["standings"]["source"]), ("40:68:0:16", list(SCREEN)))
+
+        self.video.write_bytes(b"the next recording")
+        outcome, commands, _ = self._extract([RISING])
+        self.assertEqual((outcome.crop, outcome.crop_note), ("40:68:0:16", "saved"))
+        self.assertFalse(any("gray" in cmd for cmd in commands))
+
+        outcome, commands, _ = self._extract([RISING], crop="none")
+        self.assertEqual((outcome.crop, outcome.crop_note), (None, ""))
+        self.assertNotIn("crop=", commands[0][commands[0].index("-vf") + 1])
+
+    def test_an_unchanged_extraction_starts_no_ffmpeg_even_to_find_the_crop(self) -> None:
+        first, commands, _ = self._extract([RISING], crop="auto")
+        self.assertEqual(first.status, "OK")
+        self.assertTrue(any("gray" in cmd for cmd in commands))
+        again, commands, _ = self._extract([RISING], crop="auto")
+        self.assertEqual((again.status, again.crop, again.crop_note), ("CACHED", "40:68:0:16", "detected"))
+        self.assertEqual(commands, [])
+
+        # Without --crop the saved region counts: probed once, then answered from frames.json.
+        self.assertEqual(self._extract([RISING])[0].crop_note, "saved")
+        again, commands, _ = self._extract([RISING])
+        self.assertEqual((again.status, again.crop), ("CACHED", "40:68:0:16"))
+        self.assertEqual(commands, [])
+
+        with mock.patch.object(video_service, "LOCAL_VIDEO_ROOT", self.root):
+            video_service.save_crop("standings", "40:60:0:20", SCREEN)
+        self.assertEqual(self._extract([RISING])[0].status, "OK")
+
+    def test_stitching_streams_the_video_into_tiles_of_the_whole_list(self) -> None:
+        noise = random.Random(7)
+        page = [bytes(noise.randrange(256) for _ in range(24)) for _ in range(300)]
+        frames = b"".join(b"P6\n8 100\n255\n" + b"".join(page[top:top + 100]) for top in (0, 0, 60, 130, 200))
+        commands, tiles = [], []
+
+        def spawner(cmd):
+            commands.append(cmd)
+            return FakeFfmpeg(stdout=io.BytesIO(frames))
+
+        def tile_writer(path, width, rows):
+            tiles.append((path.name, width, list(rows)))
+            return path
+
+        with mock.patch.object(video_service, "LOCAL_VIDEO_ROOT", self.root), \
+                mock.patch.object(video_service, "pull_video") as pull:
+            pull.return_value = mock.Mock(status="OK", local_path=self.video, candidate=None)
+            outcome = video_service.stitch_video(
+                1, tile_writer=tile_writer, tile_height=256, ffmpeg_resolver=lambda: "ffmpeg", spawner=spawner
+            )
+
+        self.assertEqual((outcome.status, outcome.height, outcome.frames, outcome.skipped), ("OK", 300, 5, 1))
+        self.assertEqual([(name, width, len(rows)) for name, width, rows in tiles], [
+            ("standings_01.png", 8, 256), ("standings_02.png", 8, 44),
+        ])
+        self.assertEqual([row for _, _, rows in tiles for row in rows], page)
+        self.assertEqual(commands[0][commands[0].index("-vf") + 1], f"fps={video_service.STITCH_FPS},scale=1600:-2")
+
+    def test_an_empty_stream_encodes_nothing(self) -> None:
+        outcome, commands, _ = self._extract([])
+        self.assertEqual(outcome.status, "NO_FRAMES")
+        self.assertEqual(len(commands), 1)
+
     def test_missing_ffmpeg_is_reported_before_anything_is_downloaded(self) -> None:
         downloader = mock.Mock()
         outcome = video_service.extract_frames(
@@ -138,14 +427,7 @@ class FrameExtractionTests(unittest.TestCase):
             self.assertEqual(video_service.resolve_ffmpeg(), "/usr/bin/ffmpeg")
 
     def test_ffmpeg_failure_keeps_the_stderr_reason(self) -> None:
-        with mock.patch.object(video_service, "pull_video") as pull:
-            pull.return_value = mock.Mock(status="OK", local_path=Path("tmp/video/1/a.mp4"))
-            with mock.patch.object(Path, "mkdir"), mock.patch.object(Path, "glob", return_value=[]):
-                outcome = video_service.extract_frames(
-                    1,
-                    ffmpeg_resolver=lambda: "/usr/bin/ffmpeg",
-                    runner=lambda cmd: subprocess.CompletedProcess(cmd, 1, "", "Invalid data found"),
-                )
+        outcome, _, _ = self._extract([], decoder_code=1, stderr="Invalid data found\n")
         self.assertEqual(outcome.status, "FFMPEG_FAILED")
         self.assertEqual(outcome.detail, "Invalid data found")
 
@@ -209,6 +491,50 @@ class ResultsFileTests(unittest.TestCase):
         self.assertIn("entries must be a non-empty list", errors)
 
 
+class PullVideoTests(TemporaryDatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        root_patch = mock.patch.object(video_service, "LOCAL_VIDEO_ROOT", Path(self.tempdir.name) / "video")
+        root_patch.start()
+        self.addCleanup(root_patch.stop)
+        self.entry = nextcloud.RemoteEntry(
+            name="1.mp4", path="Power-Ladys-Scores/Team-Event/S2/1.mp4", size=10, last_modified=None, is_dir=False
+        )
+
+    def test_the_remote_size_and_progress_reach_the_downloader(self) -> None:
+        def downloader(remote_path, target, *, expected_size=None, progress=None):
+            target.write_bytes(b"x" * expected_size)
+            progress(expected_size, expected_size)
+            return target
+
+        seen = []
+        outcome = video_service.pull_video(
+            1, lister=lambda _: [self.entry], downloader=downloader, progress=lambda d, t: seen.append((d, t))
+        )
+        self.assertEqual(outcome.status, "OK")
+        self.assertEqual(seen, [(10, 10)])
+
+        again = video_service.pull_video(1, lister=lambda _: [self.entry], downloader=mock.Mock())
+        self.assertEqual(again.status, "CACHED")
+
+    def test_a_replaced_recording_of_the_same_size_is_downloaded_again(self) -> None:
+        target = video_service.local_dir(1) / "1.mp4"
+        target.parent.mkdir(parents=True)
+        target.write_bytes(b"x" * 10)
+        entry = nextcloud.RemoteEntry(
+            name="1.mp4", path=self.entry.path, size=10, last_modified=None, is_dir=False, etag='"new"'
+        )
+        downloader = mock.Mock(return_value=target)
+        with mock.patch.object(nextcloud, "cached_etag", return_value='"old"'):
+            outcome = video_service.pull_video(1, lister=lambda _: [entry], downloader=downloader)
+        self.assertEqual(outcome.status, "OK")
+        downloader.assert_called_once()
+
+        with mock.patch.object(nextcloud, "cached_etag", return_value="new"):
+            outcome = video_service.pull_video(1, lister=lambda _: [entry], downloader=downloader)
+        self.assertEqual(outcome.status, "CACHED")
+
+
 class ApplyResultsTests(TemporaryDatabaseTestCase):
     """Match 1 exists with player 1 (active PLTE) scored 50000/200."""
 
@@ -406,6 +732,48 @@ class ReviewNoteTests(TemporaryDatabaseTestCase):
         self.assertIn("missing", notes)
         self.assertIn("Alice", notes["missing"].message)
 
+    def test_the_review_reads_the_database_a_fixed_number_of_times_however_big_the_roster(self) -> None:
+        """20 more PLTE players, each with five earlier results and half of them away."""
+        import sqlite3
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT INTO players (id, name, alias, garage_power, active, team) VALUES (?, ?, ?, 3000, 1, 'PLTE')",
+                [(pid, f"Player {pid}", f"p{pid}") for pid in range(10, 30)],
+            )
+            conn.executemany(
+                "INSERT INTO away_period (player_id, away_from, away_until) VALUES (?, '2021-06-01', '2021-06-30')",
+                [(pid,) for pid in range(11, 30, 2)],
+            )
+            for number in range(2, 7):
+                conn.execute(
+                    "INSERT INTO match (id, teamevent_id, season_number, start, opponent) VALUES (?, 1, 1, ?, 'Old')",
+                    (number, f"2021-05-0{number}"),
+                )
+                conn.executemany(
+                    "INSERT INTO matchscore (match_id, player_id, score, points, absent, checkin) VALUES (?, ?, ?, 10, 0, 1)",
+                    [(number, pid, 40000 + pid * 10 + number) for pid in range(10, 30)],
+                )
+
+        statements = []
+        connect = connection.connect_path
+
+        def traced(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            conn.set_trace_callback(lambda sql: statements.append(sql) if not sql.startswith("PRAGMA") else None)
+            return conn
+
+        entries = [VideoEntry(pid=1, score=44000, points=200)] + [
+            VideoEntry(pid=pid, score=40000, points=1) for pid in range(10, 20)
+        ]
+        with mock.patch.object(connection, "connect_path", traced):
+            notes = self.notes_for(entries)
+
+        self.assertIn("absent", notes)
+        self.assertIn("missing", notes)
+        self.assertIn("last scored 40", notes["missing"].message)
+        self.assertLessEqual(len(statements), 10, "\n".join(statements))
+
     def test_a_close_opponent_spelling_is_offered_as_a_match_edit(self) -> None:
         notes = self.notes_for(
             [VideoEntry(pid=1, score=44000, points=210)], opponent="Rivalz"
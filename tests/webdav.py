@@ -0,0 +1,374 @@
+"""A small in-process WebDAV server standing in for Nextcloud.
+
+Enough of the protocol for `hcr2.integrations.nextcloud` on an in-memory tree under
+the same URL layout as the real server (`/remote.php/dav/files/<user>/...`):
+PROPFIND with Depth 0, 1 and infinity, GET with open-ended Range, If-Range and If-None-Match,
+HEAD, PUT, MKCOL and DELETE, plus the chunked-upload namespace
+(`/remote.php/dav/uploads/<user>/<id>/`: MKCOL, chunk PUTs, PROPFIND, MOVE of `.file`). It counts requests and TCP connections, so tests can
+see keep-alive and saved round trips, and it can answer with queued failures to
+exercise the retry path.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+
+DAV_PREFIX = "/remote.php/dav/files/"
+UPLOADS_PREFIX = "/remote.php/dav/uploads/"
+
+
+class WebDavStandIn:
+    def __init__(self, *, user: str = "user", password: str = "secret", latency: float = 0.0) -> None:
+        self.user = user
+        self.password = password
+        self.latency = latency
+        self.files: dict[str, bytes] = {}
+        self.dirs: set[str] = {""}
+        # Chunked uploads in progress: upload folder -> chunk name -> content.
+        self.uploads: dict[str, dict[str, bytes]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        # Statuses answered (in order) before the next requests are handled normally.
+        self.failures: list[int] = []
+        # Drop the connection after this many body bytes of the next GET.
+        self.cut_after: int | None = None
+        # Off: a Range is served even when If-Range names another version.
+        self.honour_if_range = True
+        # sabre/dav answers Depth infinity like Depth 1 unless it is enabled.
+        self.allow_infinity = True
+        # Called with (method, path) before a request is handled; a status answers it.
+        self.reject: Callable[[str, str], int | None] | None = None
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    # -------------------- lifecycle --------------------
+
+    def start(self) -> "WebDavStandIn":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "WebDavStandIn":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def url_template(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{DAV_PREFIX}{{user}}/{{path}}"
+
+    @property
+    def auth(self) -> tuple[str, str]:
+        return self.user, self.password
+
+    # -------------------- tree helpers --------------------
+
+    def add_file(self, path: str, content: bytes) -> None:
+        path = path.strip("/")
+        parts = path.split("/")[:-1]
+        for depth in range(1, len(parts) + 1):
+            self.dirs.add("/".join(parts[:depth]))
+        self.files[path] = content
+
+    def etag(self, path: str) -> str:
+        return '"' + hashlib.md5(self.files[path.strip("/")]).hexdigest() + '"'
+
+    def count(self, method: str) -> int:
+        return sum(1 for seen, _ in self.requests if seen == method)
+
+    def descendants(self, path: str) -> list[str]:
+        prefix = f"{path}/" if path else ""
+        return sorted(p for p in (*self.dirs, *self.files) if p.startswith(prefix) and p != path)
+
+    def children(self, path: str) -> list[str]:
+        prefix = f"{path}/" if path else ""
+        names = [p for p in (*self.dirs, *self.files) if p.startswith(prefix) and p != path]
+        return sorted(p for p in names if "/" not in p[len(prefix):])
+
+
+def _make_handler(dav: WebDavStandIn):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            with dav._lock:
+                dav.connections += 1
+
+        def log_message(self, format, *args) -> None:  # noqa: A002 - BaseHTTPRequestHandler API
+            pass
+
+        # -------------------- plumbing --------------------
+
+        def _begin(self) -> str | None:
+            """Common prelude: record, delay, authenticate, consume the body."""
+            path = unquote(urlsplit(self.path).path)
+            self.body = self._read_body()
+            with dav._lock:
+                dav.requests.append((self.command, path))
+                failure = dav.failures.pop(0) if dav.failures else None
+            if dav.latency:
+                time.sleep(dav.latency)
+            if failure is not None:
+                self._reply(failure)
+                return None
+            if not self._authorized():
+                self._reply(401)
+                return None
+            status = dav.reject(self.command, path) if dav.reject is not None else None
+            if status is not None:
+                self._reply(status)
+                return None
+            for namespace, root in (("files", DAV_PREFIX), ("uploads", UPLOADS_PREFIX)):
+                prefix = f"{root}{dav.user}"
+                if path.startswith(prefix):
+                    self.namespace = namespace
+                    return path[len(prefix):].strip("/")
+            self._reply(404)
+            return None
+
+        def _read_body(self) -> bytes:
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return b"".join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def _authorized(self) -> bool:
+            expected = base64.b64encode(f"{dav.user}:{dav.password}".encode()).decode()
+            return self.headers.get("Authorization") == f"Basic {expected}"
+
+        def _reply(self, status: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body and self.command != "HEAD":
+                self.wfile.write(body)
+
+        @staticmethod
+        def _parent(path: str) -> str:
+            return path.rsplit("/", 1)[0] if "/" in path else ""
+
+        # -------------------- methods --------------------
+
+        def do_HEAD(self) -> None:
+            path = self._begin()
+            if path is None:
+                return
+            if path in dav.files:
+                self._reply(200, dav.files[path], {"ETag": dav.etag(path)})
+            else:
+                self._reply(200 if path in dav.dirs else 404)
+
+        def do_GET(self) -> None:
+            path = self._begin()
+            if path is None:
+                return
+            if path not in dav.files:
+                self._reply(404)
+                return
+            content = dav.files[path]
+            etag = dav.etag(path)
+            if self.headers.get("If-None-Match") == etag:
+                self._reply(304, headers={"ETag": etag})
+                return
+            status, headers = 200, {"ETag": etag}
+            requested = self.headers.get("Range", "")
+            if dav.honour_if_range and self.headers.get("If-Range", etag) != etag:
+                # The file changed since the client's copy: the whole file, not a range.
+                requested = ""
+            if requested.startswith("bytes=") and requested.endswith("-"):
+                start = int(requested[len("bytes="):-1])
+                if start >= len(content):
+                    self._reply(416, headers={"Content-Range": f"bytes */{len(content)}"})
+                    return
+                headers["Content-Range"] = f"bytes {start}-{len(content) - 1}/{len(content)}"
+                status = 206
+                content = content[start:]
+            with dav._lock:
+                cut, dav.cut_after = dav.cut_after, None
+            if cut is None:
+                self._reply(status, content, headers)
+                return
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content[:cut])
+            self.wfile.flush()
+            self.close_connection = True
+
+        def do_PUT(self) -> None:
+            path = self._begin()
+            if path is None:
+                return
+            if self.namespace == "uploads":
+                transfer, _, chunk = path.partition("/")
+                if transfer not in dav.uploads or not chunk.isdigit():
+                    self._reply(404 if transfer not in dav.uploads else 400)
+                    return
+                existed = chunk in dav.uploads[transfer]
+                dav.uploads[transfer][chunk] = self.body
+                self._reply(204 if existed else 201)
+                return
+            if self._parent(path) not in dav.dirs:
+                self._reply(409)
+                return
+            existed = path in dav.files
+            dav.files[path] = self.body
+            self._reply(204 if existed else 201)
+
+        def do_MKCOL(self) -> None:
+            path = self._begin()
+            if path is None:
+                return
+            if self.namespace == "uploads":
+                if path in dav.uploads:
+                    self._reply(405)
+                else:
+                    dav.uploads[path] = {}
+                    self._reply(201)
+                return
+            if path in dav.dirs or path in dav.files:
+                self._reply(405)
+            elif self._parent(path) not in dav.dirs:
+                self._reply(409)
+            else:
+                dav.dirs.add(path)
+                self._reply(201)
+
+        def do_MOVE(self) -> None:
+            path = self._begin()
+            if path is None:
+                return
+            transfer, _, name = path.partition("/")
+            if self.namespace != "uploads" or name != ".file" or transfer not in dav.uploads:
+                self._reply(404)
+                return
+            destination = unquote(urlsplit(self.headers.get("Destination", "")).path)
+            prefix = f"{DAV_PREFIX}{dav.user}/"
+            if not destination.startswith(prefix):
+                self._reply(400)
+                return
+            target = destination[len(prefix):].strip("/")
+            if self._parent(target) not in dav.dirs:
+                self._reply(409)
+                return
+            chunks = dav.uploads[transfer]
+            content = b"".join(chunks[key] for key in sorted(chunks, key=int))
+            total = self.headers.get("OC-Total-Length")
+            if total is not None and int(total) != len(content):
+                self._reply(400)
+                return
+            existed = target in dav.files
+            dav.files[target] = content
+            del dav.uploads[transfer]
+            self._reply(204 if existed else 201)
+
+        def do_DELETE(self) -> None:
+            path = self._begin()
+            if path is None:
+                return
+            if path in dav.files:
+                del dav.files[path]
+                self._reply(204)
+            elif path in dav.dirs and path:
+                for child in [p for p in dav.files if p.startswith(f"{path}/")]:
+                    del dav.files[child]
+                dav.dirs.difference_update({d for d in dav.dirs if d == path or d.startswith(f"{path}/")})
+                self._reply(204)
+            else:
+                self._reply(404)
+
+        def do_PROPFIND(self) -> None:
+            path = self._begin()
+            if path is None:
+                return
+            if self.namespace == "uploads":
+                if path not in dav.uploads:
+                    self._reply(404)
+                    return
+                body = _upload_multistatus(dav, path)
+                self._reply(207, body, {"Content-Type": "application/xml; charset=utf-8"})
+                return
+            if path not in dav.dirs and path not in dav.files:
+                self._reply(404)
+                return
+            depth = self.headers.get("Depth", "1")
+            listed = [path]
+            if path in dav.dirs and depth == "infinity" and dav.allow_infinity:
+                listed += dav.descendants(path)
+            elif path in dav.dirs and depth != "0":
+                listed += dav.children(path)
+            body = _multistatus(dav, listed)
+            self._reply(207, body, {"Content-Type": "application/xml; charset=utf-8"})
+
+    return Handler
+
+
+def _multistatus(dav: WebDavStandIn, paths: list[str]) -> bytes:
+    modified = formatdate(usegmt=True)
+    parts = ['<?xml version="1.0" encoding="utf-8"?><d:multistatus xmlns:d="DAV:">']
+    for path in paths:
+        is_dir = path in dav.dirs
+        href = quote(f"{DAV_PREFIX}{dav.user}/{path}" + ("/" if is_dir and path else ""))
+        props = [f"<d:getlastmodified>{modified}</d:getlastmodified>"]
+        if is_dir:
+            props.append("<d:resourcetype><d:collection/></d:resourcetype>")
+        else:
+            props.append(f"<d:getcontentlength>{len(dav.files[path])}</d:getcontentlength>")
+            props.append(f"<d:getetag>{escape(dav.etag(path))}</d:getetag>")
+            props.append("<d:resourcetype/>")
+        parts.append(
+            f"<d:response><d:href>{escape(href)}</d:href>"
+            f"<d:propstat><d:prop>{''.join(props)}</d:prop>"
+            "<d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        )
+    parts.append("</d:multistatus>")
+    return "".join(parts).encode("utf-8")
+
+
+def _upload_multistatus(dav: WebDavStandIn, transfer: str) -> bytes:
+    base = f"{UPLOADS_PREFIX}{dav.user}/{transfer}"
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?><d:multistatus xmlns:d="DAV:">',
+        f"<d:response><d:href>{escape(quote(base + '/'))}</d:href><d:propstat><d:prop>"
+        "<d:resourcetype><d:collection/></d:resourcetype></d:prop>"
+        "<d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>",
+    ]
+    for name, content in sorted(dav.uploads[transfer].items()):
+        parts.append(
+            f"<d:response><d:href>{escape(quote(f'{base}/{name}'))}</d:href><d:propstat><d:prop>"
+            f"<d:getcontentlength>{len(content)}</d:getcontentlength><d:resourcetype/></d:prop>"
+            "<d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        )
+    parts.append("</d:multistatus>")
+    return "".join(parts).encode("utf-8")